@@ -0,0 +1,189 @@
+"""
+camera_caps.py
+캡처보드 모드 탐색 + 캐시 (해상도 / FOURCC / 실측 FPS)
+
+캡처보드는 같은 해상도라도 FOURCC 에 따라 속도가 크게 다르다.
+(예: 1920x1080 YUY2 는 5fps, MJPG 는 30fps)
+카메라 인덱스별로 지원 모드를 한 번 실측해서 data/camera_caps.json 에 저장하고,
+VideoThread 는 표시 크기를 덮는 가장 가벼운 모드를 골라 연다.
+
+사용법:
+    from camera_caps import open_capture, get_camera_caps, pick_mode, apply_mode
+
+    modes = get_camera_caps(1)                  # 캐시 없으면 실측
+    mode = pick_mode(modes, 1280, 720)
+    cap = open_capture(1)
+    apply_mode(cap, mode)
+"""
+
+import os
+import json
+import time
+import platform
+from datetime import datetime
+import cv2
+
+CAPS_FILE = os.path.join("data", "camera_caps.json")
+
+PROBE_RESOLUTIONS = [
+    (640, 480),
+    (1280, 720),
+    (1920, 1080),
+    (2560, 1440),
+    (3840, 2160),
+]
+PROBE_FOURCCS = ("MJPG", "YUY2")
+
+# 실측 FPS 프레임 수 (앞의 WARMUP_FRAMES 장은 제외)
+WARMUP_FRAMES = 3
+SAMPLE_FRAMES = 15
+
+# 이 FPS 이상이면 충분히 부드러운 모드로 취급
+MIN_SMOOTH_FPS = 24
+
+
+def _backend():
+    system = platform.system()
+    if system == 'Darwin':
+        return cv2.CAP_AVFOUNDATION
+    if system == 'Windows':
+        return cv2.CAP_DSHOW
+    return None
+
+
+def open_capture(camera_index):
+    """플랫폼별 백엔드로 VideoCapture 열기"""
+    backend = _backend()
+    if backend is None:
+        return cv2.VideoCapture(camera_index)
+    return cv2.VideoCapture(camera_index, backend)
+
+
+def _fourcc_str(value):
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00") or "?"
+
+
+def apply_mode(cap, mode):
+    """모드 적용 (FOURCC 를 해상도보다 먼저 지정해야 DirectShow 가 반영함)"""
+    if mode.get('fourcc') and mode['fourcc'] != "?":
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode['fourcc']))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode['width'])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode['height'])
+    if mode.get('fps'):
+        cap.set(cv2.CAP_PROP_FPS, round(mode['fps']))
+
+
+def _measure_fps(cap):
+    for _ in range(WARMUP_FRAMES):
+        cap.read()
+    start = time.perf_counter()
+    frames = 0
+    for _ in range(SAMPLE_FRAMES):
+        ret, _ = cap.read()
+        if not ret:
+            break
+        frames += 1
+    elapsed = time.perf_counter() - start
+    return frames / elapsed if frames and elapsed > 0 else 0.0
+
+
+def probe_camera(camera_index, resolutions=PROBE_RESOLUTIONS, fourccs=PROBE_FOURCCS):
+    """
+    해상도 x FOURCC 조합을 실제로 열어 보고 실측 FPS 기록
+    장치가 무시한 요청은 실제 적용된 모드로 기록된다 (중복 제거).
+    """
+    cap = open_capture(camera_index)
+    if not cap.isOpened():
+        print(f"[camera_caps] ❌ 카메라 #{camera_index} 열기 실패")
+        return []
+
+    modes = {}
+    try:
+        for fourcc in fourccs:
+            for w, h in resolutions:
+                apply_mode(cap, {'width': w, 'height': h, 'fourcc': fourcc})
+                actual = (
+                    int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                    int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                    _fourcc_str(cap.get(cv2.CAP_PROP_FOURCC)),
+                )
+                if actual in modes:
+                    continue
+                fps = _measure_fps(cap)
+                if fps <= 0:
+                    continue
+                modes[actual] = {
+                    'width': actual[0],
+                    'height': actual[1],
+                    'fourcc': actual[2],
+                    'fps': round(fps, 1),
+                    'reported_fps': round(cap.get(cv2.CAP_PROP_FPS), 1),
+                }
+                print(f"[camera_caps] #{camera_index} {actual[0]}x{actual[1]} {actual[2]}: {fps:.1f}fps")
+    finally:
+        cap.release()
+
+    return sorted(modes.values(), key=lambda m: (m['width'] * m['height'], -m['fps']))
+
+
+def _load_cache():
+    if not os.path.exists(CAPS_FILE):
+        return {}
+    try:
+        with open(CAPS_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[camera_caps] 캐시 로드 실패: {e}")
+        return {}
+
+
+def _save_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(CAPS_FILE), exist_ok=True)
+        with open(CAPS_FILE, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        print(f"[camera_caps] 캐시 저장 실패: {e}")
+
+
+def _cache_key(camera_index):
+    return f"{platform.system()}:{camera_index}"
+
+
+def get_camera_caps(camera_index, refresh=False, probe=True):
+    """
+    카메라 지원 모드 목록 (캐시 우선, 없거나 refresh 면 실측 후 저장)
+    probe=False 면 실측하지 않고 캐시만 본다 (없으면 빈 목록).
+    """
+    cache = _load_cache()
+    key = _cache_key(camera_index)
+    entry = cache.get(key)
+    if entry and entry.get('modes') and not refresh:
+        return entry['modes']
+    if not probe:
+        return []
+
+    print(f"[camera_caps] 카메라 #{camera_index} 모드 탐색 중...")
+    modes = probe_camera(camera_index)
+    if modes:
+        cache[key] = {'probed_at': datetime.now().isoformat(timespec="seconds"), 'modes': modes}
+        _save_cache(cache)
+    return modes
+
+
+def pick_mode(modes, min_width, min_height, min_fps=MIN_SMOOTH_FPS):
+    """
+    표시 크기(min_width x min_height)를 덮으면서 min_fps 이상인 가장 작은 모드
+    - 덮는 모드 중 min_fps 를 만족하는 게 없으면 가장 빠른 모드
+    - 덮는 모드가 없으면 가장 큰 모드 중 가장 빠른 것
+    """
+    if not modes:
+        return None
+    covering = [m for m in modes if m['width'] >= min_width and m['height'] >= min_height]
+    if covering:
+        smooth = [m for m in covering if m['fps'] >= min_fps]
+        if smooth:
+            return min(smooth, key=lambda m: (m['width'] * m['height'], -m['fps']))
+        return max(covering, key=lambda m: (m['fps'], -m['width'] * m['height']))
+    return max(modes, key=lambda m: (m['width'] * m['height'], m['fps']))
@@ -25,8 +25,9 @@ import logging
 from pathlib import Path
 from PyQt6.QtCore import QObject, pyqtSignal
 from camera_thread import VideoThread
-from shutter_trigger import EOSRemoteShutter
-from tether_service import WATCH_DIR, _list_media_files, SUPPORTED_EXT
+from shutter_trigger import create_shutter
+from tether_service import WATCH_DIR, SUPPORTED_EXT, get_ingest
+from file_handoff import handoff
 
 # 🔥 로그 파일 설정
 logging.basicConfig(
@@ -57,7 +58,8 @@ class CameraManager(QObject):
         preview_camera_index=1,
         preview_width=640,
         preview_height=480,
-        capture_timeout=10
+        capture_timeout=10,
+        shutter_backend="eos"
     ):
         super().__init__()
         
@@ -71,7 +73,7 @@ class CameraManager(QObject):
         self.preview_thread = None
         
         # 촬영 컨트롤러
-        self.shutter = EOSRemoteShutter()
+        self.shutter = create_shutter(shutter_backend)
         
         # 세션 관리
         self.session_dir = None
@@ -81,6 +83,7 @@ class CameraManager(QObject):
         logger.info("[CameraManager] 초기화 완료")
         logger.info(f"  - 프리뷰 카메라: #{preview_camera_index}")
         logger.info(f"  - 프리뷰 해상도: {preview_width}x{preview_height}")
+        logger.info(f"  - 셔터 백엔드: {self.shutter.name}")
         logger.info("=" * 60)
     
     def start_preview(self):
@@ -100,8 +103,8 @@ class CameraManager(QObject):
             target_height=self.preview_height
         )
         
-        # 시그널 연결
-        self.preview_thread.change_pixmap_signal.connect(
+        # 시그널 연결 (최신 프레임 우편함 방식)
+        self.preview_thread.frame_available.connect(
             self._on_preview_frame
         )
         self.preview_thread.error_signal.connect(
@@ -128,11 +131,17 @@ class CameraManager(QObject):
         
         print("[CameraManager] ✅ 프리뷰 중지됨")
     
-    def _on_preview_frame(self, qimage):
+    def _on_preview_frame(self):
         """
-        프리뷰 프레임 수신 (내부용)
+        프리뷰 프레임 수신 (내부용) - 밀린 프레임은 건너뛰고 최신 프레임만 전달
         """
-        self.preview_frame_ready.emit(qimage)
+        mailbox = self.preview_thread.mailbox if self.preview_thread else None
+        item = mailbox.take() if mailbox is not None else None
+        if item is not None:
+            # 링 버퍼를 감싼 QImage 이므로 다른 스레드로 넘기기 전에 사본으로 만들고 칸 반환
+            frame = item[0].copy()
+            mailbox.release(item)
+            self.preview_frame_ready.emit(frame)
     
     def _on_preview_error(self, error_msg):
         """
@@ -153,10 +162,11 @@ class CameraManager(QObject):
         
         # 1. 촬영 전 파일 목록 스냅샷
         WATCH_DIR.mkdir(exist_ok=True)
-        before_files = {f.name for f in _list_media_files(WATCH_DIR)}
-        logger.info(f"[CameraManager] 촬영 전 파일 수: {len(before_files)}개")
+        ingest = get_ingest()
+        before_files = ingest.snapshot()
+        logger.info(f"[CameraManager] 촬영 전 파일 수: {ingest.known_count()}개")
         logger.info(f"[CameraManager] 감시 폴더: {WATCH_DIR.resolve()}")
-        logger.info(f"[CameraManager] 촬영 전 파일 목록: {before_files}")
+        logger.info(f"[CameraManager] 촬영 전 기준점: #{before_files}")
         
         # 2. 셔터 트리거
         logger.info("[CameraManager] 셔터 트리거 호출...")
@@ -178,13 +188,8 @@ class CameraManager(QObject):
             error_msg = f"촬영 타임아웃 ({self.capture_timeout}초)"
             logger.error(f"[CameraManager] ❌ {error_msg}")
             
-            # 디버깅: 현재 파일 목록 출력
-            current_files = _list_media_files(WATCH_DIR)
-            logger.info(f"[CameraManager] 타임아웃 후 파일 수: {len(current_files)}개")
-            if current_files:
-                logger.info("[CameraManager] 발견된 파일들:")
-                for f in current_files:
-                    logger.info(f"  - {f.name}")
+            # 디버깅: 색인 기준 현재 파일 수 (폴더 재조회 없음)
+            logger.info(f"[CameraManager] 타임아웃 후 파일 수: {ingest.known_count()}개 ({ingest.backend})")
             
             self.capture_failed.emit(error_msg)
             return None
@@ -193,8 +198,7 @@ class CameraManager(QObject):
         if self.session_dir is None:
             self._create_session()
         
-        dest_path = self.session_dir / new_file.name
-        dest_path.write_bytes(new_file.read_bytes())
+        dest_path = Path(handoff(new_file, self.session_dir / new_file.name))
         
         self.captured_files.append(str(dest_path))
         
@@ -204,70 +208,28 @@ class CameraManager(QObject):
         
         return str(dest_path)
     
-    def _wait_for_new_file(self, before_files: set, timeout: float) -> Path | None:
+    def _wait_for_new_file(self, before_files: int | set, timeout: float) -> Path | None:
         """
         새 파일이 생성될 때까지 대기
         
         Args:
-            before_files: 촬영 전 파일명 세트
+            before_files: 촬영 전 기준점 (ingest.snapshot() 토큰 또는 파일명 세트)
             timeout: 대기 시간(초)
         
         Returns:
             새 파일 경로 또는 None
         """
-        end_time = time.time() + timeout
-        check_count = 0
-        
-        logger.info(f"[CameraManager] 파일 감지 시작 (타임아웃: {timeout}초)")
+        ingest = get_ingest()
+        logger.info(f"[CameraManager] 파일 감지 시작 (타임아웃: {timeout}초, {ingest.backend})")
         
-        while time.time() < end_time:
-            check_count += 1
-            current_files = _list_media_files(WATCH_DIR)
-            
-            # 현재 파일 목록 출력 (10회마다)
-            if check_count % 10 == 0:
-                current_names = {f.name for f in current_files}
-                logger.info(f"[CameraManager] 체크 #{check_count}: 현재 파일 {len(current_names)}개")
-                new_files = current_names - before_files
-                if new_files:
-                    logger.info(f"[CameraManager] 새 파일 후보: {new_files}")
-            
-            for f in current_files:
-                if f.name in before_files:
-                    continue
-                
-                logger.info(f"[CameraManager] 🔍 새 파일 감지: {f.name}")
-                
-                # 파일 쓰기 완료 확인
-                try:
-                    size1 = f.stat().st_size
-                except FileNotFoundError:
-                    logger.warning(f"[CameraManager] 파일 사라짐: {f.name}")
-                    continue
-                
-                if size1 <= 0:
-                    logger.warning(f"[CameraManager] 파일 크기 0: {f.name}")
-                    continue
-                
-                logger.info(f"[CameraManager] 파일 크기 확인: {size1} bytes, 0.3초 대기...")
-                time.sleep(0.3)
-                
-                try:
-                    size2 = f.stat().st_size
-                except FileNotFoundError:
-                    logger.warning(f"[CameraManager] 파일 사라짐 (2차): {f.name}")
-                    continue
-                
-                # 파일 크기가 안정적이면 완료
-                if size2 == size1 and size2 > 0:
-                    logger.info(f"[CameraManager] ✅ 파일 안정화 완료: {f.name} ({size2} bytes)")
-                    return f
-                else:
-                    logger.info(f"[CameraManager] 파일 쓰기 중: {size1} → {size2} bytes")
-            
-            time.sleep(0.2)
+        # 수신 서비스의 '쓰기 완료' 이벤트 대기 (폴더 재조회 없음)
+        new_files = ingest.wait_for_files(since=before_files, count=1, timeout=timeout)
+        if new_files:
+            f = new_files[0]
+            logger.info(f"[CameraManager] ✅ 파일 안정화 완료: {f.name} ({f.stat().st_size} bytes)")
+            return f
         
-        logger.error(f"[CameraManager] ❌ 타임아웃! 총 {check_count}회 체크")
+        logger.error(f"[CameraManager] ❌ 타임아웃! ({timeout}초)")
         return None
     
     def _create_session(self):
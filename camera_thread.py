@@ -1,51 +1,345 @@
 import cv2
+import time
+import threading
 import numpy as np
-import platform
 from PyQt6.QtCore import QThread, pyqtSignal, Qt
 from PyQt6.QtGui import QImage
+from camera_caps import open_capture, get_camera_caps, pick_mode, apply_mode
+
+
+class FrameMailbox:
+    """
+    최신 프레임 1장만 보관하는 우편함 (latest-frame-wins)
+
+    생산자는 put() 으로 덮어쓰고, 소비자는 take() 로 가장 최근 프레임만 가져간다.
+    소비자가 가져가기 전에 덮어써진 프레임은 버려지고 dropped 로 집계된다.
+    put() 이 True 를 반환할 때(비어 있던 우편함)만 소비자에게 알리면
+    큐에 시그널이 쌓이지 않는다.
+
+    recycle 콜백을 주면 덮어써지거나 clear() 로 비워진 항목, 그리고 소비자가 release() 로
+    돌려준 항목을 넘겨받는다 (생산자가 항목의 버퍼를 다시 쓸 수 있게 됨).
+    """
+
+    def __init__(self, recycle=None):
+        self._lock = threading.Lock()
+        self._item = None
+        self._recycle = recycle
+        self.dropped = 0
+        self.delivered = 0
+
+    def put(self, item) -> bool:
+        with self._lock:
+            old = self._item
+            if old is not None:
+                self.dropped += 1
+            self._item = item
+        if old is not None:
+            self.release(old)
+        return old is None
+
+    def take(self):
+        with self._lock:
+            item = self._item
+            self._item = None
+            if item is not None:
+                self.delivered += 1
+            return item
+
+    def release(self, item):
+        """take() 로 가져간 항목을 다 썼을 때 (recycle 이 없으면 아무것도 안 함)"""
+        if self._recycle is not None and item is not None:
+            self._recycle(item)
+
+    def clear(self):
+        with self._lock:
+            old = self._item
+            self._item = None
+        self.release(old)
+
+
+class CameraSupervisor:
+    """
+    캡처보드 재연결 정책 + 상태 지표
+
+    - 연속 FAIL_THRESHOLD 회 읽기 실패 시 장치를 닫고 다시 연다
+    - 재시도 간격은 INITIAL_BACKOFF 부터 2배씩 MAX_BACKOFF 까지 (짧은 HDMI 끊김은 수십 ms 안에 복구)
+    - 재시도할 때마다 VideoCapture 를 새로 만들어 장치를 다시 찾고,
+      같은 인덱스에서 FAILOVER_AFTER 회 실패하면 예비 인덱스(failover_index)로 넘어간다
+    - MAX_DOWNTIME 초 동안 복구되지 않으면 포기
+    """
+
+    FAIL_THRESHOLD = 3
+    INITIAL_BACKOFF = 0.05
+    MAX_BACKOFF = 2.0
+    FAILOVER_AFTER = 3
+    MAX_DOWNTIME = 60.0
+
+    def __init__(self, primary_index, failover_index=None):
+        self.indices = [primary_index]
+        if failover_index is not None and failover_index != primary_index:
+            self.indices.append(failover_index)
+        self.current_index = primary_index
+        self._consecutive = 0
+        self._backoff = self.INITIAL_BACKOFF
+        self._attempts_on_index = 0
+        self._first_failure_at = None   # 연속 실패 첫 시각
+        self._down_since = None         # 재연결을 시작한 연속 실패의 첫 시각
+        self.metrics = {
+            'frames': 0,
+            'read_failures': 0,
+            'reconnects': 0,
+            'failovers': 0,
+            'downtime_total_ms': 0.0,
+            'last_recovery_ms': None,
+            'max_recovery_ms': 0.0,
+        }
+
+    @property
+    def recovering(self):
+        return self._down_since is not None
+
+    def on_frame(self) -> bool:
+        """정상 프레임 수신 - 복구가 끝난 순간이면 True"""
+        self.metrics['frames'] += 1
+        self._consecutive = 0
+        self._first_failure_at = None
+        if self._down_since is None:
+            return False   # 일시적인 실패는 재연결/복구로 치지 않음
+        recovery_ms = (time.monotonic() - self._down_since) * 1000
+        self.metrics['last_recovery_ms'] = round(recovery_ms, 1)
+        self.metrics['max_recovery_ms'] = round(max(self.metrics['max_recovery_ms'], recovery_ms), 1)
+        self.metrics['downtime_total_ms'] = round(self.metrics['downtime_total_ms'] + recovery_ms, 1)
+        self._down_since = None
+        self._backoff = self.INITIAL_BACKOFF
+        self._attempts_on_index = 0
+        return True
+
+    def on_read_failure(self) -> bool:
+        """읽기 실패 기록 - 장치를 다시 열어야 하면 True"""
+        self.metrics['read_failures'] += 1
+        self._consecutive += 1
+        if self._first_failure_at is None:
+            self._first_failure_at = time.monotonic()
+        if self._consecutive < self.FAIL_THRESHOLD:
+            return False
+        if self._down_since is None:
+            self._down_since = self._first_failure_at
+        return True
+
+    def next_attempt(self):
+        """(다음에 열 인덱스, 열기 전 대기 시간) - 호출할 때마다 간격 증가"""
+        self.metrics['reconnects'] += 1
+        if self._attempts_on_index >= self.FAILOVER_AFTER and len(self.indices) > 1:
+            pos = self.indices.index(self.current_index)
+            self.current_index = self.indices[(pos + 1) % len(self.indices)]
+            self._attempts_on_index = 0
+            self.metrics['failovers'] += 1
+            print(f"[Camera] 🔀 예비 캡처 인덱스로 전환: #{self.current_index}")
+        self._attempts_on_index += 1
+        delay = self._backoff
+        self._backoff = min(self.MAX_BACKOFF, self._backoff * 2)
+        return self.current_index, delay
+
+    def should_give_up(self) -> bool:
+        return self._down_since is not None and time.monotonic() - self._down_since > self.MAX_DOWNTIME
+
+    def health(self) -> dict:
+        snapshot = dict(self.metrics)
+        snapshot['index'] = self.current_index
+        snapshot['state'] = "recovering" if self.recovering else "ok"
+        return snapshot
+
 
 class VideoThread(QThread):
     """
     카메라 영상을 메인 화면으로 보내는 스레드
     Canon R100 등 외부 카메라 지원
+
+    프레임은 mailbox 에 (QImage, 캡처 시각, numpy 버퍼, 칸 번호) 로 넣고, 우편함이 비어
+    있었을 때만 frame_available 을 보낸다. 소비자는 mailbox.take() 로 최신 프레임을 가져가고,
+    다 쓰면 mailbox.release(item) 으로 돌려준다.
+    change_pixmap_signal 은 연결된 곳이 있을 때만 매 프레임 사본을 보낸다 (이전 방식 호환).
+
+    프레임 메모리는 미리 할당한 링 버퍼(RING_SIZE 칸)를 돌려 쓰고, OpenCV 의 BGR
+    데이터를 Format_BGR888 QImage 로 복사 없이 감싸서 넘긴다. 칸마다 사용 중 횟수를 세어
+    (우편함 항목, 소비자가 가져간 항목, grab_full_frame 용 마지막 원본) 모두 놓인 칸에만
+    다음 프레임을 쓴다. 빈 칸이 없으면 그 프레임은 전달하지 않는다 (starved).
+    항목을 돌려준 뒤에도 쓰거나 다른 스레드로 넘기려면 소비자가 복사해야 한다.
+    표시 크기/해상도가 바뀌면 빈 칸의 버퍼만 그 자리에서 새로 할당한다.
+    set_output_size() 로 표시 크기를 알려 주면 캡처 스레드에서 미리 축소해서 넘긴다.
+    set_active(False) 면 장치는 연 채로 디코딩 없이 버퍼만 비우고 IDLE_FPS 로만 전달한다.
     """
     change_pixmap_signal = pyqtSignal(QImage)
+    frame_available = pyqtSignal()
     error_signal = pyqtSignal(str)
     reconnect_signal = pyqtSignal(str)  # 재연결 상태 알림용
+    health_signal = pyqtSignal(dict)    # CameraSupervisor.health() (복구 시작/완료, 통계 주기)
 
-    # 재연결 설정
-    MAX_FAIL_COUNT = 5        # 연속 실패 허용 횟수
-    RECONNECT_INTERVAL = 10   # 재연결 시도 간격 (초)
-    MAX_RECONNECT_TRY = 10    # 최대 재연결 시도 횟수 (0 = 무한)
+    STATS_INTERVAL = 10       # 프레임 통계 출력 간격 (초)
+    RING_SIZE = 4             # 프레임 링 버퍼 칸 수
+    IDLE_FPS = 2              # 대기 모드 전달 속도 (세션 사이)
 
-    def __init__(self, camera_index=0, target_width=1920, target_height=1080):
+    def __init__(self, camera_index=0, target_width=1920, target_height=1080, max_fps=30, failover_index=None):
         super().__init__()
         self.camera_index = camera_index
+        self.supervisor = CameraSupervisor(camera_index, failover_index)
         self.target_width = target_width
         self.target_height = target_height
+        self.max_fps = max_fps
+        self.mailbox = FrameMailbox(recycle=self._release_item)
+        self._modes = {}          # 인덱스별 camera_caps 선택 모드 (재연결 시 재사용, None 은 저장 안 함)
+        self._probe_pending = set()   # 모드 캐시 없이 연 인덱스 (대기 모드에서 탐색)
+        self.paced_skips = 0      # max_fps 초과로 건너뛴 프레임
         self._run_flag = True
-
-    def _open_camera(self):
-        """카메라 열기 (플랫폼별)"""
-        if platform.system() == 'Darwin':
-            cap = cv2.VideoCapture(self.camera_index, cv2.CAP_AVFOUNDATION)
-        elif platform.system() == 'Windows':
-            cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
+        self._active = True       # False 면 대기 모드 (IDLE_FPS)
+
+        self._out_size = None     # (w, h) 표시 크기 (None 이면 원본 크기로 전달)
+        self._size_lock = threading.Lock()
+        self._slot_lock = threading.Lock()
+        self._full = [None] * self.RING_SIZE    # 칸별 카메라 원본 프레임 버퍼
+        self._out = [None] * self.RING_SIZE     # 칸별 축소 프레임 버퍼
+        self._holds = [0] * self.RING_SIZE      # 칸별 사용 중 횟수 (0 이어야 덮어씀)
+        self._last_slot = None    # 마지막으로 전달한 원본 프레임 칸 (폴백 저장용)
+        self.starved = 0          # 빈 칸이 없어 전달하지 못한 프레임
+        self.frame_sink = None    # (표시용 BGR, 캡처 시각, 원본 BGR) 콜백 - 별도 프로세스 모드 (shm_frames)
+
+    def set_active(self, active):
+        """전체 속도 전달(True) / 대기 모드(False) 전환 (어느 스레드에서든 호출 가능)"""
+        self._active = bool(active)
+
+    @property
+    def active(self):
+        return self._active
+
+    def set_output_size(self, width, height):
+        """표시 크기 지정 (어느 스레드에서든 호출 가능, 0 이하이면 축소 안 함)"""
+        with self._size_lock:
+            self._out_size = (int(width), int(height)) if width > 0 and height > 0 else None
+
+    def _free_slot(self, start):
+        """start 부터 돌면서 아무도 들고 있지 않은 칸 번호 (없으면 None)"""
+        with self._slot_lock:
+            for i in range(self.RING_SIZE):
+                slot = (start + i) % self.RING_SIZE
+                if self._holds[slot] == 0:
+                    return slot
+        return None
+
+    def _release_item(self, item):
+        """우편함 recycle 콜백 - 항목의 칸 사용 횟수 반환"""
+        with self._slot_lock:
+            self._holds[item[3]] -= 1
+
+    @staticmethod
+    def _slot_buffer(bufs, slot, shape):
+        """빈 칸의 버퍼 (shape 가 바뀌었을 때만 재할당)"""
+        buf = bufs[slot]
+        if buf is None or buf.shape != shape:
+            buf = bufs[slot] = np.empty(shape, dtype=np.uint8)
+        return buf
+
+    def _scaled_size(self, fw, fh):
+        """
+        표시 크기를 덮는 최소 축소 크기 (원본보다 크면 None)
+        라이브뷰가 16:9 로 크롭하므로 크롭 후 높이 기준도 만족시킨다.
+        """
+        with self._size_lock:
+            out = self._out_size
+        if out is None:
+            return None
+        tw, th = out
+        cropped_h = min(fh, fw * 9 / 16)
+        scale = max(tw / fw, th / cropped_h)
+        if scale >= 1.0:
+            return None
+        return max(1, round(fw * scale)), max(1, round(fh * scale))
+
+    @staticmethod
+    def _wrap(buf):
+        """BGR numpy 버퍼 → QImage (복사 없음)"""
+        h, w = buf.shape[:2]
+        return QImage(buf.data, w, h, buf.strides[0], QImage.Format.Format_BGR888)
+
+    def grab_full_frame(self):
+        """마지막 원본 해상도 프레임 사본 (RGB QImage, 없으면 None)"""
+        with self._slot_lock:
+            # _last_slot 칸은 사용 중으로 잡혀 있어 변환하는 동안 덮어써지지 않음
+            if self._last_slot is None:
+                return None
+            return self._wrap(self._full[self._last_slot]).convertToFormat(QImage.Format.Format_RGB888)
+
+    def _required_size(self):
+        """모드 선택 기준 크기: 표시 크기(16:9 크롭 감안) 또는 요청 해상도"""
+        with self._size_lock:
+            out = self._out_size
+        if out is None:
+            return self.target_width, self.target_height
+        tw, th = out
+        return tw, max(th, int(tw * 9 / 16))
+
+    def _cached_mode(self, index):
+        """캐시된 모드 중 표시 크기를 덮는 가장 가벼운 모드 (실측은 하지 않음, 없으면 None)"""
+        mode = self._modes.get(index)
+        if mode is None:
+            need_w, need_h = self._required_size()
+            mode = pick_mode(get_camera_caps(index, probe=False), need_w, need_h)
+            if mode is not None:
+                self._modes[index] = mode
+        return mode
+
+    def _open_camera(self, index=None):
+        """
+        카메라 열기 (캐시된 모드 중 표시 크기를 덮는 가장 가벼운 모드)
+        모드 캐시가 없으면 요청 해상도로 바로 열고, 탐색은 대기 모드로 미룬다
+        (첫 실행/재연결 중에 수십 초 걸리는 탐색으로 화면을 멈추지 않도록).
+        """
+        if index is None:
+            index = self.supervisor.current_index
+        cap = open_capture(index)
+        if not cap.isOpened():
+            return cap
+
+        need_w, need_h = self._required_size()
+        mode = self._cached_mode(index)
+        if mode is not None:
+            apply_mode(cap, mode)
+            print(f"[Camera] #{index} 선택 모드: {mode['width']}x{mode['height']} "
+                  f"{mode['fourcc']} ({mode['fps']}fps 실측, 필요 {need_w}x{need_h})")
         else:
-            cap = cv2.VideoCapture(self.camera_index)
-
-        if cap.isOpened():
+            self._probe_pending.add(index)
             cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.target_width)
             cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.target_height)
-            actual_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            actual_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            print(f"[Camera] 요청 해상도: {self.target_width}x{self.target_height}")
-            print(f"[Camera] 실제 해상도: {actual_w}x{actual_h}")
+            print(f"[Camera] 요청 해상도: {self.target_width}x{self.target_height} (모드 탐색은 대기 모드에서)")
 
+        actual_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        actual_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        print(f"[Camera] 실제 해상도: {actual_w}x{actual_h}")
         return cap
 
+    def _probe_in_idle(self, cap):
+        """대기 모드에서 현재 장치 모드 탐색 후 선택 모드로 다시 열기 (장치를 닫아야 탐색 가능)"""
+        index = self.supervisor.current_index
+        self._probe_pending.discard(index)
+        cap.release()
+        if not get_camera_caps(index):
+            print(f"[Camera] #{index} 모드 탐색 실패 - 요청 해상도 유지")
+        return self._open_camera(index)
+
+    def _probe_spares(self):
+        """예비 인덱스 모드를 미리 탐색 (쓰지 않는 장치라 프리뷰와 겹치지 않음)"""
+        for index in self.supervisor.indices:
+            if index != self.supervisor.current_index and not get_camera_caps(index, probe=False):
+                print(f"[Camera] 예비 #{index} 모드 미리 탐색")
+                get_camera_caps(index)
+
     def run(self):
+        sup = self.supervisor
         cap = self._open_camera()
+        if not cap.isOpened() and len(sup.indices) > 1:
+            # 시작 시 기본 장치가 없으면 예비 장치로
+            cap.release()
+            sup.current_index = sup.indices[1]
+            cap = self._open_camera()
 
         if not cap.isOpened():
             error_msg = f"❌ 카메라 #{self.camera_index} 열기 실패!\n\n"
@@ -56,70 +350,131 @@ class VideoThread(QThread):
             self.error_signal.emit(error_msg)
             return
 
+        if len(sup.indices) > 1:
+            threading.Thread(target=self._probe_spares, name="CameraProbe", daemon=True).start()
+
         frame_count = 0
-        fail_count = 0          # 연속 실패 횟수
-        reconnect_count = 0     # 재연결 시도 횟수
+
+        # 캡처 시각 기준 페이싱 (cap.read() 가 장치 속도로 블로킹하므로 고정 sleep 없음)
+        min_interval = 1.0 / self.max_fps if self.max_fps else 0.0
+        last_publish = 0.0
+        stats_at = time.monotonic()
+        next_slot = 0
 
         while self._run_flag:
-            ret, cv_img = cap.read()
+            if not self._active and sup.current_index in self._probe_pending:
+                # 실패하면 아래 grab() 이 실패해서 일반 재연결 경로로 감
+                cap = self._probe_in_idle(cap)
+
+            # 아무도 들고 있지 않은 칸에 바로 읽기 (첫 프레임에서 크기를 알고 나서 할당)
+            slot = self._free_slot(next_slot)
+            dst = self._full[slot] if slot is not None else None
+            idle_skip = False
+            if self._active:
+                if dst is not None:
+                    ret, cv_img = cap.read(dst)
+                else:
+                    ret, cv_img = cap.read()
+            else:
+                # 대기 모드: grab() 으로 드라이버 버퍼만 비우고 IDLE_FPS 간격으로만 디코딩
+                ret = cap.grab()
+                idle_skip = ret and time.monotonic() - last_publish < 1.0 / self.IDLE_FPS
+                if ret and not idle_skip:
+                    if dst is not None:
+                        ret, cv_img = cap.retrieve(dst)
+                    else:
+                        ret, cv_img = cap.retrieve()
+            captured_at = time.monotonic()
 
             if not ret:
-                fail_count += 1
-                print(f"⚠️ 프레임 읽기 실패 ({fail_count}/{self.MAX_FAIL_COUNT}) - frame #{frame_count}")
-
-                # 연속 실패가 임계값 초과 시 재연결 시도
-                if fail_count >= self.MAX_FAIL_COUNT:
-                    reconnect_count += 1
-                    print(f"[Camera] 🔄 재연결 시도 #{reconnect_count}...")
-                    self.reconnect_signal.emit(f"카메라 재연결 중... ({reconnect_count}회)")
-
-                    cap.release()
-                    self.msleep(self.RECONNECT_INTERVAL * 1000)
-
-                    cap = self._open_camera()
-
+                was_recovering = sup.recovering
+                if not sup.on_read_failure():
+                    self.msleep(10)
+                    continue
+                if not was_recovering:
+                    print(f"⚠️ 프레임 읽기 실패 - frame #{frame_count}, 재연결 시작")
+                    self.reconnect_signal.emit("카메라 재연결 중...")
+                    self.health_signal.emit(sup.health())
+
+                # 마지막 정상 프레임은 화면에 그대로 두고 (우편함에 새 프레임을 넣지 않음)
+                # 짧은 간격부터 점점 늘려 가며 다시 열기
+                cap.release()
+                while self._run_flag:
+                    if sup.should_give_up():
+                        print("[Camera] ❌ 복구 시간 초과 - 종료")
+                        self.error_signal.emit("카메라 연결 실패\n캡처보드와 카메라 연결을 확인해주세요.")
+                        self._run_flag = False
+                        break
+                    index, delay = sup.next_attempt()
+                    self.msleep(int(delay * 1000))
+                    cap = self._open_camera(index)
                     if cap.isOpened():
-                        print(f"[Camera] ✅ 재연결 성공! (시도 #{reconnect_count})")
-                        self.reconnect_signal.emit("카메라 연결 복구됨")
-                        fail_count = 0
-                    else:
-                        print(f"[Camera] ❌ 재연결 실패 (시도 #{reconnect_count})")
-                        # MAX_RECONNECT_TRY가 0이면 무한 재시도
-                        if self.MAX_RECONNECT_TRY > 0 and reconnect_count >= self.MAX_RECONNECT_TRY:
-                            print(f"[Camera] ❌ 최대 재연결 시도 초과 - 종료")
-                            self.error_signal.emit("카메라 연결 실패\n캡처보드와 카메라 연결을 확인해주세요.")
-                            break
-                else:
-                    # 임계값 미달 시 짧게 대기 후 재시도
-                    self.msleep(500)
+                        print(f"[Camera] 🔄 #{index} 다시 열림 (대기 {delay*1000:.0f}ms)")
+                        break
+                    cap.release()
+                continue
 
+            # 프레임 읽기 성공 - 복구 완료 여부 확인
+            if sup.on_frame():
+                health = sup.health()
+                print(f"[Camera] ✅ 복구 완료: {health['last_recovery_ms']:.0f}ms (#{health['index']})")
+                self.reconnect_signal.emit("카메라 연결 복구됨")
+                self.health_signal.emit(health)
+            if idle_skip:
                 continue
 
-            # 프레임 읽기 성공 시 fail_count 초기화
-            if fail_count > 0:
-                print(f"[Camera] ✅ 프레임 복구됨 (실패 {fail_count}회 후)")
-                fail_count = 0
-                reconnect_count = 0
-
-            # BGR -> RGB 변환
-            rgb_img = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-
-            # PyQt용 QImage로 변환
-            h, w, ch = rgb_img.shape
-            bytes_per_line = ch * w
-            convert_to_qt_format = QImage(
-                rgb_img.data,
-                w,
-                h,
-                bytes_per_line,
-                QImage.Format.Format_RGB888
-            )
-
-            # 메인 스레드로 이미지 전송
-            self.change_pixmap_signal.emit(convert_to_qt_format.copy())
+            # 장치가 max_fps 보다 빠르면 변환 전에 건너뜀 (드라이버 버퍼는 계속 비움)
+            if captured_at - last_publish < min_interval * 0.9:
+                self.paced_skips += 1
+                continue
+            if slot is None:
+                # 소비자가 모든 칸을 들고 있음 - 덮어쓰지 않고 이번 프레임은 버림
+                self.starved += 1
+                continue
+            last_publish = captured_at
+
+            # 원본 프레임을 칸 버퍼에 보관 (첫 프레임/해상도 변경 시 할당 후 복사)
+            full = self._slot_buffer(self._full, slot, cv_img.shape)
+            if cv_img is not full:
+                np.copyto(full, cv_img)
+
+            # 표시 크기로 축소 (GUI 스레드에는 1080p 를 보내지 않음)
+            fh, fw = full.shape[:2]
+            scaled = self._scaled_size(fw, fh)
+            if scaled is not None:
+                sw, sh = scaled
+                out = self._slot_buffer(self._out, slot, (sh, sw, 3))
+                cv2.resize(full, (sw, sh), dst=out, interpolation=cv2.INTER_AREA)
+            else:
+                out = full
+            if self.frame_sink is not None:
+                self.frame_sink(out, captured_at, full)
+
+            # BGR 그대로 QImage 로 감싸서 전달 (색 변환/복사 없음)
+            frame = self._wrap(out)
+            next_slot = (slot + 1) % self.RING_SIZE
+
+            # 칸 사용 중 표시: 우편함 항목 1 + 마지막 원본(grab_full_frame) 1
+            with self._slot_lock:
+                self._holds[slot] += 2
+                if self._last_slot is not None:
+                    self._holds[self._last_slot] -= 1
+                self._last_slot = slot
+
+            # 최신 프레임만 우편함에 (소비자가 밀려 있으면 이전 프레임은 버려지고 칸이 반환됨)
+            # numpy 버퍼를 같이 넣어 소비자가 항목을 들고 있는 동안 메모리를 유지
+            if self.mailbox.put((frame, captured_at, out, slot)):
+                self.frame_available.emit()
+            if self.receivers(self.change_pixmap_signal) > 0:
+                # 큐 연결 수신자는 우편함 규칙 밖이므로 사본으로
+                self.change_pixmap_signal.emit(frame.copy())
 
             frame_count += 1
-            self.msleep(33)  # 약 30fps
+            if captured_at - stats_at >= self.STATS_INTERVAL:
+                print(f"[Camera] 프레임 {frame_count} / 전달 {self.mailbox.delivered} / "
+                      f"버림 {self.mailbox.dropped} / 페이싱 {self.paced_skips} / 칸 부족 {self.starved}")
+                self.health_signal.emit(sup.health())
+                stats_at = captured_at
 
         print(f"[Camera] 총 {frame_count}프레임 처리 완료")
         cap.release()
@@ -133,35 +488,17 @@ class VideoThread(QThread):
 
 
 # 카메라 지원 해상도 확인 함수
-def get_supported_resolutions(camera_index=0):
-    cap = cv2.VideoCapture(camera_index)
-
-    if not cap.isOpened():
+def get_supported_resolutions(camera_index=0, refresh=False):
+    modes = get_camera_caps(camera_index, refresh=refresh)
+    if not modes:
         print(f"❌ 카메라 #{camera_index} 열기 실패")
         return []
 
-    test_resolutions = [
-        (640, 480),
-        (1280, 720),
-        (1920, 1080),
-        (2560, 1440),
-        (3840, 2160),
-    ]
-
     supported = []
-
-    for w, h in test_resolutions:
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
-        actual_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        actual_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        if (actual_w, actual_h) not in supported:
-            supported.append((actual_w, actual_h))
-
-    cap.release()
-
-    print(f"\n카메라 #{camera_index} 지원 해상도:")
-    for w, h in supported:
-        print(f"  - {w} x {h}")
+    print(f"\n카메라 #{camera_index} 지원 모드:")
+    for m in modes:
+        print(f"  - {m['width']} x {m['height']} {m['fourcc']} ({m['fps']}fps)")
+        if (m['width'], m['height']) not in supported:
+            supported.append((m['width'], m['height']))
 
     return supported
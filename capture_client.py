@@ -0,0 +1,162 @@
+"""
+capture_client.py
+키오스크 쪽 capture_server 연결 스레드
+
+서버 이벤트를 받는 즉시 Qt 시그널로 넘긴다 (결과 파일 폴링 없음).
+서버가 떠 있지 않으면 capture_server.py 를 한 번 실행하고 접속될 때까지 짧게 재시도한다.
+접속하면 먼저 셔터 백엔드 설정을 보내고(이미 떠 있던 서버도 현재 설정을 따름),
+키오스크가 종료될 때 shutdown() 으로 서버도 함께 종료한다.
+진행 중인 세션이 있을 때 연결이 끊기면 저널에서 그 세션의 완료 컷을 읽어 connection_lost 로
+알려 준다 (이미 done 을 받은 세션은 복구하지 않음).
+
+사용법:
+    client = CaptureClient(base_path)
+    client.shot_ready.connect(on_shot)          # (path, shot_idx, latency_ms)
+    client.session_done.connect(on_done)        # (files, cancelled)
+    client.connection_lost.connect(on_lost)     # (저널에서 복구한 files)
+    client.start()
+    client.start_session(total=8)
+    client.shoot(1)                             # 컷마다 키오스크가 셔터 요청
+    ...
+    client.shutdown()                           # 프로그램 종료
+"""
+
+import os
+import sys
+import time
+import threading
+import subprocess
+from multiprocessing.connection import Client
+from PyQt6.QtCore import QThread, pyqtSignal
+from capture_server import ADDRESS, AUTHKEY, read_journal
+
+# 서버 자동 실행 후 접속 대기
+CONNECT_TIMEOUT = 10.0
+CONNECT_RETRY_SEC = 0.05
+
+
+class CaptureClient(QThread):
+    """capture_server 이벤트 수신 스레드"""
+
+    connected = pyqtSignal()
+    shot_ready = pyqtSignal(str, int, float)   # 파일 경로, 컷 번호, 셔터→파일 지연(ms)
+    shot_failed = pyqtSignal(int, str)         # 컷 번호, 실패 사유
+    session_done = pyqtSignal(list, bool)      # 파일 목록, 중단 여부
+    connection_lost = pyqtSignal(list)         # 저널에서 복구한 파일 목록
+
+    def __init__(self, base_path=".", shutter_backend="eos", parent=None):
+        super().__init__(parent)
+        self.base_path = base_path
+        self.shutter_backend = shutter_backend
+        self.session_id = None      # 진행 중인 세션 (done 을 받으면 None)
+        self._conn = None           # 대기 명령을 모두 보낸 뒤에 설정
+        self._pending = []          # 접속 전에 들어온 명령
+        self._lock = threading.Lock()   # _pending / _conn / conn.send 보호 (GUI 스레드 ↔ 수신 스레드)
+        self._closing = False
+
+    # --- GUI 스레드 API ---
+    def _send(self, msg):
+        with self._lock:
+            conn = self._conn
+            if conn is None:
+                self._pending.append(msg)
+                return
+            try:
+                conn.send(msg)
+            except (OSError, EOFError) as e:
+                print(f"[capture_client] 전송 실패: {e}")
+
+    def configure(self, shutter_backend):
+        self.shutter_backend = shutter_backend
+        self._send({'cmd': 'configure', 'shutter_backend': shutter_backend})
+
+    def start_session(self, total=8):
+        self._send({'cmd': 'session', 'total': total})
+
+    def shoot(self, shot_idx):
+        self._send({'cmd': 'shoot', 'shot': shot_idx})
+
+    def cancel(self):
+        self._send({'cmd': 'cancel'})
+
+    def shutdown(self):
+        """서버 종료 요청 후 연결 닫기 (키오스크 종료 시)"""
+        self._send({'cmd': 'shutdown'})
+        self.stop()
+
+    def stop(self):
+        """연결만 닫음 (서버는 계속 떠 있음)"""
+        self._closing = True
+        if self._conn is not None:
+            self._conn.close()
+        self.wait(2000)
+
+    # --- 수신 스레드 ---
+    def _connect(self):
+        try:
+            return Client(ADDRESS, authkey=AUTHKEY)
+        except ConnectionRefusedError:
+            pass
+
+        script_path = os.path.join(self.base_path, 'capture_server.py')
+        print(f"[capture_client] 촬영 서버 실행: {script_path}")
+        subprocess.Popen([sys.executable, script_path, self.shutter_backend], cwd=self.base_path)
+
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while time.monotonic() < deadline and not self._closing:
+            try:
+                return Client(ADDRESS, authkey=AUTHKEY)
+            except ConnectionRefusedError:
+                time.sleep(CONNECT_RETRY_SEC)
+        return None
+
+    def _dispatch(self, event):
+        kind = event.get('event')
+        if kind == 'session':
+            self.session_id = event['session']
+        elif kind == 'shot':
+            self.shot_ready.emit(event['path'], event['shot'], float(event['latency_ms']))
+        elif kind == 'failed':
+            self.shot_failed.emit(event['shot'], event['reason'])
+        elif kind == 'done':
+            self.session_id = None
+            self.session_done.emit(list(event['files']), bool(event['cancelled']))
+
+    def run(self):
+        conn = self._connect()
+        if conn is None:
+            with self._lock:
+                dropped, self._pending = self._pending, []
+            print("[capture_client] ❌ 촬영 서버 접속 실패")
+            if dropped:
+                cmds = ", ".join(msg['cmd'] for msg in dropped)
+                print(f"[capture_client] 보내지 못한 명령 {len(dropped)}개 버림: {cmds}")
+            self.connection_lost.emit([])
+            return
+
+        # 대기 명령을 잠금 안에서 모두 보낸 뒤 _conn 을 공개 → 그동안 들어온 _send 는 잠금을 기다렸다가 순서대로 전송
+        with self._lock:
+            try:
+                conn.send({'cmd': 'configure', 'shutter_backend': self.shutter_backend})
+                for msg in self._pending:
+                    conn.send(msg)
+            except (OSError, EOFError) as e:
+                print(f"[capture_client] 대기 명령 전송 실패 ({len(self._pending)}개): {e}")
+            self._pending = []
+            self._conn = conn
+        print("[capture_client] 촬영 서버 연결됨")
+        self.connected.emit()
+
+        try:
+            while not self._closing:
+                self._dispatch(conn.recv())
+        except (EOFError, OSError):
+            if not self._closing:
+                recovered = read_journal(self.session_id) if self.session_id else None
+                files = recovered['files'] if recovered and not recovered['done'] else []
+                print(f"[capture_client] ⚠️ 서버 연결 끊김 - 저널에서 {len(files)}컷 복구")
+                self.connection_lost.emit(files)
+        finally:
+            with self._lock:
+                self._conn = None
+            conn.close()
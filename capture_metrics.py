@@ -0,0 +1,148 @@
+"""
+capture_metrics.py
+촬영 구간별 지연 기록 (셔터 → 파일 → 원본 폴더 → 미리보기)
+
+컷마다 아래 시점을 time.monotonic() 기준으로 기록하고, 셔터 시점 대비 ms 로
+data/metrics/capture_YYYYMMDD.jsonl 에 한 줄씩 남긴다.
+  trigger_sent     셔터 명령 전송 완료
+  first_byte       감시 폴더에 파일이 처음 나타남
+  write_complete   파일 쓰기 완료 판정
+  copy_done        원본 폴더로 전달 완료
+  thumbnail_shown  촬영 화면 사이드바 미리보기 표시
+
+세션이 끝나면 구간별 p50/p95/p99 요약을 같은 파일에 남긴다.
+"카메라가 느리다"는 문의가 오면 셔터 / EOS Utility / 디스크 / UI 중 어디서
+시간이 걸리는지 이 파일로 확인한다.
+
+사용법:
+    from capture_metrics import capture_metrics
+
+    capture_metrics.start_session(session_id)
+    capture_metrics.begin_shot(shot_idx, backend="eos")
+    capture_metrics.mark(shot_idx, "trigger_sent")
+    ...
+    capture_metrics.end_shot(shot_idx)
+    capture_metrics.end_session()
+"""
+
+import os
+import json
+import math
+import time
+import threading
+from datetime import datetime
+
+METRICS_DIR = os.path.join("data", "metrics")
+
+SPANS = ("trigger_sent", "first_byte", "write_complete", "copy_done", "thumbnail_shown")
+
+
+def percentile(values, p):
+    """nearest-rank 백분위수"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+class CaptureMetrics:
+    """컷별 구간 기록 + 세션 요약 (스레드 안전)"""
+
+    def __init__(self, metrics_dir=METRICS_DIR):
+        self.metrics_dir = metrics_dir
+        self._lock = threading.Lock()
+        self.session_id = None
+        self._shots = {}        # shot_idx -> {'t0', 'backend', 'marks': {span: monotonic}}
+        self._finished = []     # 완료된 컷 기록 (세션 요약용)
+
+    def _write(self, record):
+        try:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            path = os.path.join(self.metrics_dir, f"capture_{datetime.now().strftime('%Y%m%d')}.jsonl")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        except Exception as e:
+            print(f"[capture_metrics] 기록 실패: {e}")
+
+    def start_session(self, session_id=None):
+        with self._lock:
+            self.session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+            self._shots.clear()
+            self._finished = []
+
+    def begin_shot(self, shot_idx, backend=None):
+        """셔터 직전 호출 (기준 시점)"""
+        with self._lock:
+            self._shots[shot_idx] = {'t0': time.monotonic(), 'backend': backend, 'marks': {}}
+
+    def mark(self, shot_idx, span, t=None):
+        """구간 시점 기록 (t 는 time.monotonic() 값, 생략 시 현재)"""
+        with self._lock:
+            shot = self._shots.get(shot_idx)
+            if shot is not None and span not in shot['marks']:
+                shot['marks'][span] = time.monotonic() if t is None else t
+
+    def end_shot(self, shot_idx, status="ok", **extra):
+        """컷 기록 확정 후 파일에 한 줄 저장"""
+        with self._lock:
+            shot = self._shots.pop(shot_idx, None)
+            if shot is None:
+                return None
+            spans = {k: round((v - shot['t0']) * 1000, 1) for k, v in shot['marks'].items()}
+            record = {
+                "type": "shot",
+                "ts": datetime.now().isoformat(timespec="milliseconds"),
+                "session": self.session_id,
+                "shot": shot_idx,
+                "backend": shot['backend'],
+                "status": status,
+                "ms": spans,
+            }
+            record.update(extra)
+            self._finished.append(record)
+        self._write(record)
+        return record
+
+    def summary(self):
+        """현재 세션 구간별 p50/p95/p99 (ms)"""
+        with self._lock:
+            shots = [r for r in self._finished if r['status'] == "ok"]
+            failed = len(self._finished) - len(shots)
+        result = {}
+        for span in SPANS:
+            values = [r['ms'][span] for r in shots if span in r['ms']]
+            if values:
+                result[span] = {
+                    "n": len(values),
+                    "p50": percentile(values, 50),
+                    "p95": percentile(values, 95),
+                    "p99": percentile(values, 99),
+                }
+        return {"shots": len(shots), "failed": failed, "spans": result}
+
+    def end_session(self):
+        """세션 요약 저장 + 콘솔 출력"""
+        if self.session_id is None:
+            return None
+        summary = self.summary()
+        record = {
+            "type": "session",
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "session": self.session_id,
+        }
+        record.update(summary)
+        self._write(record)
+
+        print(f"[capture_metrics] 세션 {self.session_id}: {summary['shots']}컷 (실패 {summary['failed']})")
+        for span, s in summary['spans'].items():
+            print(f"  {span:<16} p50 {s['p50']:>7.0f}ms  p95 {s['p95']:>7.0f}ms  p99 {s['p99']:>7.0f}ms")
+
+        with self._lock:
+            self.session_id = None
+            self._finished = []
+        return record
+
+
+# 프로세스 전역 공유 인스턴스
+capture_metrics = CaptureMetrics()
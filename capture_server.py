@@ -0,0 +1,297 @@
+"""
+capture_server.py
+상주 촬영 서버 (로컬 소켓으로 컷별 결과 스트리밍)
+
+camera_manager.py --standalone 을 촬영마다 새 프로세스로 띄우고 camera_result.json 을
+1초 간격으로 확인하던 방식 대신, 한 번 띄운 서버 프로세스가 셔터/감시 폴더를 계속
+열어 두고 multiprocessing.connection 소켓으로 컷이 끝날 때마다 바로 결과를 보낸다.
+모든 이벤트는 data/capture_journal.jsonl 에도 한 줄씩 (fsync 포함) 남기므로,
+서버나 키오스크가 중간에 죽어도 그때까지 찍은 컷은 read_journal() 로 복구할 수 있다.
+
+프로토콜 (dict 메시지):
+  키오스크 → 서버
+    {'cmd': 'configure', 'shutter_backend': 'eos'}   셔터 백엔드 지정 (다르면 교체)
+    {'cmd': 'session', 'total': 8}                   세션 시작 (컷은 키오스크가 shoot 으로 하나씩)
+    {'cmd': 'session', 'total': 8, 'auto': True, 'interval': 5.0}
+                                                     서버가 interval 간격으로 자동 연속 촬영
+    {'cmd': 'shoot', 'shot': 3}                      1컷 촬영 (세션 안에서, total 컷을 채우면 done)
+    {'cmd': 'cancel'}                                진행 중인 세션 중단 (→ done, cancelled)
+    {'cmd': 'ping'}                                  → {'event': 'pong', 'shutter_backend': 이름}
+    {'cmd': 'shutdown'}                              서버 종료 (키오스크 종료 시)
+  서버 → 키오스크
+    {'event': 'session', 'session': id, 'session_dir': 경로, 'total': n}
+    {'event': 'shot', 'session': id, 'shot': n, 'path': 경로, 'latency_ms': ms}
+    {'event': 'failed', 'session': id, 'shot': n, 'reason': 사유}
+    {'event': 'done', 'session': id, 'files': [경로...], 'cancelled': bool}
+
+사용법:
+    python capture_server.py                     # 서버 실행 (키오스크가 없으면 자동 실행)
+
+    from multiprocessing.connection import Client
+    conn = Client(ADDRESS, authkey=AUTHKEY)
+    conn.send({'cmd': 'session', 'total': 8})
+    conn.send({'cmd': 'shoot', 'shot': 1})
+    while True:
+        event = conn.recv()
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from datetime import datetime
+from multiprocessing.connection import Listener
+
+ADDRESS = ('127.0.0.1', 6010)
+AUTHKEY = b'photokiosk-capture'
+JOURNAL_PATH = os.path.join("data", "capture_journal.jsonl")
+
+# 자동 연속 촬영(auto 세션) 기본 간격
+DEFAULT_INTERVAL = 5.0
+CAPTURE_WINDOW_SEC = 15
+# 실패 컷 재시도 포함 최대 셔터 횟수 = total * MAX_ATTEMPT_FACTOR
+MAX_ATTEMPT_FACTOR = 2
+
+
+def _journal(event):
+    """이벤트 1줄 기록 (프로세스가 죽어도 남도록 fsync)"""
+    record = dict(event)
+    record['ts'] = datetime.now().isoformat(timespec="milliseconds")
+    try:
+        os.makedirs(os.path.dirname(JOURNAL_PATH), exist_ok=True)
+        with open(JOURNAL_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+    except Exception as e:
+        print(f"[capture_server] 저널 기록 실패: {e}")
+
+
+def read_journal(session=None):
+    """
+    저널에서 세션 결과 복구 → {'session', 'session_dir', 'files', 'done'}
+    session 을 생략하면 마지막 세션. 기록이 없으면 None.
+    """
+    if not os.path.exists(JOURNAL_PATH):
+        return None
+    result = None
+    with open(JOURNAL_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # 쓰다 만 마지막 줄
+            kind = event.get('event')
+            if kind == 'session' and (session is None or event.get('session') == session):
+                result = {'session': event['session'], 'session_dir': event.get('session_dir'),
+                          'files': [], 'done': False}
+            elif result is not None and event.get('session') == result['session']:
+                if kind == 'shot':
+                    result['files'].append(event['path'])
+                elif kind == 'done':
+                    result['done'] = True
+    return result
+
+
+class CaptureServer:
+    """키오스크 1개 연결을 받아 촬영 명령을 처리하는 서버"""
+
+    def __init__(self, address=ADDRESS, authkey=AUTHKEY, shutter_backend="eos",
+                 capture_window_sec=CAPTURE_WINDOW_SEC):
+        self.address = address
+        self.authkey = authkey
+        self.shutter_backend = shutter_backend
+        self.capture_window_sec = capture_window_sec
+        self._shutter = None
+        self._conn = None
+        self._send_lock = threading.Lock()
+        self._shoot_lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._session_thread = None
+        self._running = True
+        self.session_id = None
+        self.session_path = None
+        self.session_total = 0
+        self._session_open = False   # done 을 아직 보내지 않은 세션
+        self._session_auto = False
+        self.files = []
+
+    # --- 이벤트 전송 ---
+    def _emit(self, event):
+        _journal(event)
+        with self._send_lock:
+            conn = self._conn
+            if conn is None:
+                return
+            try:
+                conn.send(event)
+            except (OSError, EOFError):
+                # 키오스크가 끊겨도 촬영 결과는 저널에 남아 있음
+                self._conn = None
+
+    def _emit_direct(self, event):
+        """저널에 남기지 않는 응답"""
+        with self._send_lock:
+            if self._conn is not None:
+                try:
+                    self._conn.send(event)
+                except (OSError, EOFError):
+                    self._conn = None
+
+    # --- 촬영 ---
+    def _get_shutter(self):
+        if self._shutter is None:
+            from shutter_trigger import create_shutter
+            self._shutter = create_shutter(self.shutter_backend)
+            print(f"[capture_server] 셔터 백엔드: {self._shutter.name}")
+        return self._shutter
+
+    def _configure(self, shutter_backend):
+        if shutter_backend and shutter_backend != self.shutter_backend:
+            print(f"[capture_server] 셔터 백엔드 변경: {self.shutter_backend} → {shutter_backend}")
+            with self._shoot_lock:
+                self.shutter_backend = shutter_backend
+                self._shutter = None   # 다음 촬영 때 새 백엔드로 생성
+
+    def _start_session(self, total, auto=False):
+        from tether_service import SESSIONS_DIR
+        SESSIONS_DIR.mkdir(exist_ok=True)
+        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.session_path = SESSIONS_DIR / f"session_{self.session_id}"
+        self.session_path.mkdir(parents=True, exist_ok=True)
+        self.session_total = total
+        self._session_open = True
+        self._session_auto = auto
+        self.files = []
+        self._emit({'event': 'session', 'session': self.session_id,
+                    'session_dir': str(self.session_path), 'total': total})
+
+    def _finish(self, cancelled):
+        """세션 종료 이벤트 (세션마다 1번만)"""
+        if not self._session_open:
+            return
+        self._session_open = False
+        self._emit({'event': 'done', 'session': self.session_id, 'files': list(self.files),
+                    'cancelled': cancelled})
+
+    def _shoot(self, shot_idx):
+        """1컷 촬영 → 성공 시 경로, 실패 시 None (결과 이벤트 전송 포함)"""
+        from tether_service import capture_one_photo_blocking, get_ingest
+
+        with self._shoot_lock:
+            pre_snapshot = get_ingest().snapshot()
+            t0 = time.perf_counter()
+            try:
+                shutter = self._get_shutter()
+                ok = shutter.trigger(wait_after=0)
+            except Exception as e:
+                ok = False
+                print(f"[capture_server] 셔터 오류: {e}")
+            if not ok:
+                self._emit({'event': 'failed', 'session': self.session_id, 'shot': shot_idx,
+                            'reason': "셔터 실패"})
+                return None
+
+            dest = self.session_path / f"{shot_idx:02d}_{datetime.now().strftime('%H%M%S')}.jpg"
+            result = capture_one_photo_blocking(
+                capture_window_sec=self.capture_window_sec,
+                pre_snapshot=pre_snapshot,
+                dest_path=dest,
+                session_path=self.session_path,
+            )
+            if result is None:
+                self._emit({'event': 'failed', 'session': self.session_id, 'shot': shot_idx,
+                            'reason': "파일 감지 실패"})
+                return None
+
+            latency_ms = round((time.perf_counter() - t0) * 1000, 1)
+            self.files.append(str(result))
+            self._emit({'event': 'shot', 'session': self.session_id, 'shot': shot_idx,
+                        'path': str(result), 'latency_ms': latency_ms})
+            # 키오스크 주도 세션은 total 컷을 채우면 종료
+            if not self._session_auto and self.session_total and len(self.files) >= self.session_total:
+                self._finish(cancelled=False)
+            return result
+
+    def _run_session(self, total, interval):
+        """자동 연속 촬영 (실패 컷은 재시도, 최대 total * MAX_ATTEMPT_FACTOR 회)"""
+        shot_idx = 1
+        attempts = 0
+        while shot_idx <= total and attempts < total * MAX_ATTEMPT_FACTOR:
+            if self._cancel.wait(interval if attempts else 0):
+                break
+            attempts += 1
+            if self._shoot(shot_idx) is not None:
+                shot_idx += 1
+        self._finish(cancelled=self._cancel.is_set())
+
+    # --- 명령 처리 ---
+    def _handle(self, msg):
+        cmd = msg.get('cmd')
+        if cmd == 'ping':
+            self._emit_direct({'event': 'pong', 'shutter_backend': self.shutter_backend})
+        elif cmd == 'configure':
+            self._configure(msg.get('shutter_backend'))
+        elif cmd == 'session':
+            if self._session_thread is not None and self._session_thread.is_alive():
+                self._cancel.set()
+                self._session_thread.join()
+            self._finish(cancelled=True)   # 이전 세션이 열려 있으면 닫음
+            self._cancel.clear()
+            total = int(msg.get('total', 8))
+            auto = bool(msg.get('auto', False))
+            self._start_session(total, auto=auto)
+            if auto:
+                self._session_thread = threading.Thread(
+                    target=self._run_session,
+                    args=(total, float(msg.get('interval', DEFAULT_INTERVAL))),
+                    name="CaptureSession", daemon=True,
+                )
+                self._session_thread.start()
+        elif cmd == 'shoot':
+            if self.session_path is None:
+                self._start_session(0)
+            threading.Thread(target=self._shoot, args=(int(msg.get('shot', len(self.files) + 1)),),
+                             daemon=True).start()
+        elif cmd == 'cancel':
+            self._cancel.set()
+            if not self._session_auto:
+                self._finish(cancelled=True)
+        elif cmd == 'shutdown':
+            self._cancel.set()
+            self._running = False
+        else:
+            print(f"[capture_server] 알 수 없는 명령: {msg}")
+
+    def serve_forever(self):
+        # 감시 폴더 수신은 서버 시작 시 미리 준비 (첫 셔터 전에)
+        from tether_service import get_ingest
+        get_ingest()
+
+        with Listener(self.address, authkey=self.authkey) as listener:
+            print(f"[capture_server] 대기 중: {self.address[0]}:{self.address[1]}")
+            while self._running:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"[capture_server] 연결 수락 실패: {e}")
+                    continue
+                print("[capture_server] 키오스크 연결됨")
+                with self._send_lock:
+                    self._conn = conn
+                try:
+                    while self._running:
+                        self._handle(conn.recv())
+                except (EOFError, OSError):
+                    print("[capture_server] 키오스크 연결 끊김 (진행 중인 촬영은 계속, 저널에 기록)")
+                finally:
+                    with self._send_lock:
+                        self._conn = None
+                    conn.close()
+        print("[capture_server] 종료")
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else "eos"
+    CaptureServer(shutter_backend=backend).serve_forever()
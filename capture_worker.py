@@ -0,0 +1,138 @@
+"""
+capture_worker.py
+상주 촬영 워커 (셔터 트리거 → 파일 수신 → 원본 폴더 전달)
+
+촬영마다 스레드/셔터 객체를 새로 만들지 않고, 프로그램 시작 시 만든 워커 하나가
+명령 큐로 촬영 요청을 받아 처리한다. 셔터 객체(EOS 창 핸들 포함)는 캐시되고,
+세션 폴더는 세션 시작 시 한 번만 만든다.
+컷마다 셔터→파일 완료 지연을 측정해서 함께 보고한다.
+
+사용법:
+    worker = CaptureWorker(shutter_backend="eos")   # "gphoto2" / "simulated"
+    worker.shot_ready.connect(on_saved)        # (path, shot_idx, latency_ms)
+    worker.shot_failed.connect(on_failed)      # (shot_idx, reason)
+    worker.start()
+
+    worker.start_session()
+    worker.shoot(shot_idx)
+"""
+
+import os
+import queue
+import time
+from datetime import datetime
+from PyQt6.QtCore import QThread, pyqtSignal
+from tether_service import SESSIONS_DIR, capture_one_photo_blocking, get_ingest
+from file_handoff import source_path
+from capture_metrics import capture_metrics
+
+ORIGINAL_DIR = os.path.join("data", "original")
+
+
+class CaptureWorker(QThread):
+    """촬영 명령 큐를 처리하는 상주 스레드"""
+
+    shot_ready = pyqtSignal(str, int, float)   # 파일 경로, 컷 번호, 셔터→파일 지연(ms)
+    shot_failed = pyqtSignal(int, str)         # 컷 번호, 실패 사유
+
+    def __init__(self, capture_window_sec=10, shutter_backend="eos", parent=None):
+        super().__init__(parent)
+        self.capture_window_sec = capture_window_sec
+        self.shutter_backend = shutter_backend
+        self._commands = queue.Queue()
+        self._shutter = None
+        self.session_path = None
+        self.latencies = []          # 현재 세션 컷별 지연(ms)
+
+    # --- GUI 스레드 API ---
+    def start_session(self):
+        """새 촬영 세션 (세션 폴더는 여기서 1회 생성)"""
+        self._commands.put(("session", None))
+
+    def shoot(self, shot_idx):
+        self._commands.put(("shoot", shot_idx))
+
+    def stop(self):
+        self._commands.put(None)
+        self.wait(3000)
+
+    # --- 워커 스레드 ---
+    def _get_shutter(self):
+        if self._shutter is None:
+            from shutter_trigger import create_shutter
+            self._shutter = create_shutter(self.shutter_backend)
+            print(f"[capture_worker] 셔터 백엔드: {self._shutter.name}")
+        return self._shutter
+
+    def _new_session(self):
+        SESSIONS_DIR.mkdir(exist_ok=True)
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.session_path = SESSIONS_DIR / f"session_{ts}"
+        self.session_path.mkdir(parents=True, exist_ok=True)
+        self.latencies = []
+        capture_metrics.start_session(self.session_path.name)
+        print(f"[capture_worker] 세션 시작: {self.session_path}")
+
+    def _shoot(self, shot_idx):
+        if self.session_path is None:
+            self._new_session()
+
+        # 0. 셔터 전 기준점 (O(1))
+        pre_snapshot = get_ingest().snapshot()
+
+        # 1. 셔터 트리거
+        try:
+            shutter = self._get_shutter()
+        except Exception as e:
+            self.shot_failed.emit(shot_idx, f"셔터 초기화 실패: {e}")
+            return
+        t0 = time.perf_counter()
+        capture_metrics.begin_shot(shot_idx, backend=shutter.name)
+        if not shutter.trigger(wait_after=0):
+            capture_metrics.end_shot(shot_idx, status="trigger_failed")
+            self.shot_failed.emit(shot_idx, f"{shutter.name} 셔터 실패")
+            return
+        capture_metrics.mark(shot_idx, "trigger_sent")
+
+        # 2. 카메라가 저장한 파일 감지 → data/original 로 바로 전달
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = os.path.join(ORIGINAL_DIR, f"shot_{timestamp}_{shot_idx}.jpg")
+        result = capture_one_photo_blocking(
+            capture_window_sec=self.capture_window_sec,
+            pre_snapshot=pre_snapshot,
+            dest_path=filepath,
+            session_path=self.session_path,
+        )
+        if result is None:
+            capture_metrics.end_shot(shot_idx, status="timeout")
+            self.shot_failed.emit(shot_idx, f"{shutter.name} 파일 감지 실패")
+            return
+        capture_metrics.mark(shot_idx, "copy_done")
+        src = source_path(result)
+        if src:
+            first_byte, write_complete = get_ingest().timing(os.path.basename(src))
+            if first_byte is not None:
+                capture_metrics.mark(shot_idx, "first_byte", first_byte)
+            if write_complete is not None:
+                capture_metrics.mark(shot_idx, "write_complete", write_complete)
+
+        latency_ms = (time.perf_counter() - t0) * 1000
+        self.latencies.append(latency_ms)
+        print(f"[capture_worker] {shot_idx}컷 셔터→파일 {latency_ms:.0f}ms: {result}")
+        self.shot_ready.emit(str(result), shot_idx, latency_ms)
+
+    def run(self):
+        while True:
+            cmd = self._commands.get()
+            if cmd is None:
+                break
+            kind, arg = cmd
+            try:
+                if kind == "session":
+                    self._new_session()
+                elif kind == "shoot":
+                    self._shoot(arg)
+            except Exception as e:
+                print(f"[capture_worker] 오류: {e}")
+                if kind == "shoot":
+                    self.shot_failed.emit(arg, str(e))
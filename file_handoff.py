@@ -0,0 +1,100 @@
+"""
+file_handoff.py
+촬영 파일 전달 (incoming_photos → 세션/원본 폴더)
+
+수신이 끝난 촬영 파일은 키오스크 소유이므로 촬영 경로는 move=True 로 넘긴다.
+같은 볼륨이면 원자적 rename 으로 데이터 복사 없이 옮기고, 다른 볼륨이면 고정 크기 버퍼로
+스트리밍 복사한 뒤 원본을 지운다. 파일 전체를 메모리에 올리지 않는다.
+원본을 남겨 두는 경우(move=False)에는 하드링크를 쓰지 않고 복사한다. 카메라 프로그램이
+같은 파일명을 다시 쓰면서 파일을 제자리에서 덮어쓰면, 링크된 이전 손님 사진까지 바뀌기 때문이다.
+
+넘겨준 결과 경로별 원본 경로를 기록해 두고 source_path() 로 조회할 수 있다 (수신 시각
+조회용). 기록은 최근 MAX_TRACKED 개까지만 유지하고, 파일을 지울 때 forget() 으로 뺄 수 있다.
+
+사용법:
+    from file_handoff import handoff, source_path
+
+    dest = handoff(src, "data/original/shot_01.jpg", move=True)
+    source_path(dest)     # -> src
+    forget(dest)          # dest 를 지운 뒤 기록 제거
+"""
+
+import os
+import shutil
+import threading
+
+# 스트리밍 복사 버퍼 크기
+COPY_BUFFER = 1024 * 1024
+# 원본↔결과 경로 기록 최대 개수 (오래된 것부터 제거)
+MAX_TRACKED = 512
+
+_sources = {}         # dest -> src (추가 순서)
+_lock = threading.Lock()
+
+
+def _same_volume(src, dest_dir):
+    try:
+        return os.stat(src).st_dev == os.stat(dest_dir).st_dev
+    except OSError:
+        return False
+
+
+def _stream_copy(src, dest):
+    """임시 파일에 스트리밍 복사 후 rename (중간에 실패해도 반쯤 쓴 파일이 남지 않음)"""
+    tmp = dest + ".part"
+    with open(src, "rb") as fsrc, open(tmp, "wb") as fdst:
+        shutil.copyfileobj(fsrc, fdst, COPY_BUFFER)
+    shutil.copystat(src, tmp)
+    os.replace(tmp, dest)
+
+
+def handoff(src, dest, move=False) -> str:
+    """
+    src 촬영 파일을 dest 로 전달하고 dest 경로(str) 반환
+
+    Args:
+        move: True 면 원본을 옮긴다 (같은 볼륨이면 rename, 아니면 복사 후 삭제)
+              False 면 원본은 그대로 두고 복사본을 만든다 (원본과 데이터를 공유하지 않음).
+    """
+    src = os.path.abspath(str(src))
+    dest = os.path.abspath(str(dest))
+    dest_dir = os.path.dirname(dest)
+    os.makedirs(dest_dir, exist_ok=True)
+
+    if src == dest:
+        return dest
+    if os.path.exists(dest):
+        os.remove(dest)
+
+    method = "copy"
+    if move and _same_volume(src, dest_dir):
+        try:
+            os.replace(src, dest)
+            method = "rename"
+        except OSError as e:
+            print(f"[file_handoff] rename 실패, 복사로 대체: {e}")
+
+    if method == "copy":
+        _stream_copy(src, dest)
+        if move:
+            os.remove(src)
+
+    with _lock:
+        _sources.pop(dest, None)
+        _sources[dest] = src
+        while len(_sources) > MAX_TRACKED:
+            del _sources[next(iter(_sources))]
+    print(f"[file_handoff] {method}: {os.path.basename(src)} -> {dest}")
+    return dest
+
+
+def source_path(path):
+    """전달된 파일의 원본(감시 폴더) 경로 (모르면 None)"""
+    with _lock:
+        return _sources.get(os.path.abspath(str(path)))
+
+
+def forget(path):
+    """전달된 파일(dest)을 지웠을 때 기록 제거"""
+    with _lock:
+        _sources.pop(os.path.abspath(str(path)), None)
@@ -0,0 +1,107 @@
+"""
+frame_assets.py
+프레임 PNG 에셋 캐시 (프로세스당 1회 로드)
+
+- 캔버스 크기(2400x3600 / 3600x2400)로 리사이즈된 RGBA 오버레이
+- 슬롯 영역만 잘라서 표시 크기로 맞춘 오버레이 (라이브뷰용)
+- 미리보기 라벨 크기로 맞춘 전체 오버레이 (사진 선택 페이지용)
+
+출력 합성(photo_utils)과 라이브뷰(update_image)가 같은 캐시를 사용한다.
+
+사용법:
+    from frame_assets import frame_assets
+
+    overlay = frame_assets.canvas_overlay(frame_path, (2400, 3600))
+    qimg = frame_assets.slot_overlay_qimage(frame_path, (2400, 3600), slot, (w, h))
+"""
+
+import os
+import threading
+from PIL import Image
+from image_cache import ImageCache
+
+# 캔버스 크기 RGBA 한 장 ≈ 34MB
+FRAME_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class FrameAssetCache:
+    """프레임 PNG를 디코딩/리사이즈한 결과를 키(경로, 크기, 슬롯)별로 보관"""
+
+    def __init__(self, max_bytes: int = FRAME_CACHE_BYTES):
+        self._cache = ImageCache(max_bytes)
+
+    @staticmethod
+    def _slot_box(slot):
+        return (slot['x'], slot['y'], slot['x'] + slot['w'], slot['y'] + slot['h'])
+
+    def source(self, frame_path):
+        """원본 프레임 PNG (RGBA)"""
+        key = ("frame_src", os.path.abspath(frame_path))
+        return self._cache.get_or_load(key, lambda: Image.open(frame_path).convert("RGBA"))
+
+    def canvas_overlay(self, frame_path, canvas_size):
+        """캔버스 크기로 리사이즈된 RGBA 오버레이 (수정 금지)"""
+        canvas_size = tuple(canvas_size)
+        key = ("frame_canvas", os.path.abspath(frame_path), canvas_size)
+
+        def _load():
+            src = self.source(frame_path)
+            if src.size == canvas_size:
+                return src
+            return src.resize(canvas_size, Image.Resampling.LANCZOS)
+
+        return self._cache.get_or_load(key, _load)
+
+    def slot_overlay(self, frame_path, canvas_size, slot, display_size):
+        """슬롯 영역만 잘라 display_size로 맞춘 RGBA 오버레이"""
+        box = self._slot_box(slot)
+        display_size = (max(1, int(display_size[0])), max(1, int(display_size[1])))
+        key = ("frame_slot", os.path.abspath(frame_path), tuple(canvas_size), box, display_size)
+
+        def _load():
+            part = self.canvas_overlay(frame_path, canvas_size).crop(box)
+            return part.resize(display_size, Image.Resampling.BILINEAR)
+
+        return self._cache.get_or_load(key, _load)
+
+    def slot_overlay_qimage(self, frame_path, canvas_size, slot, display_size):
+        """slot_overlay 의 QImage 버전 (QPainter.drawImage 로 바로 사용)"""
+        from photo_utils import pil_to_qimage
+        box = self._slot_box(slot)
+        display_size = (max(1, int(display_size[0])), max(1, int(display_size[1])))
+        key = ("frame_slot_q", os.path.abspath(frame_path), tuple(canvas_size), box, display_size)
+        return self._cache.get_or_load(
+            key, lambda: pil_to_qimage(self.slot_overlay(frame_path, canvas_size, slot, display_size))
+        )
+
+    def display_overlay_qimage(self, frame_path, canvas_size, display_size):
+        """전체 프레임을 display_size로 맞춘 QImage (사진 선택 미리보기용)"""
+        from photo_utils import pil_to_qimage
+        display_size = (max(1, int(display_size[0])), max(1, int(display_size[1])))
+        key = ("frame_display_q", os.path.abspath(frame_path), tuple(canvas_size), display_size)
+
+        def _load():
+            overlay = self.canvas_overlay(frame_path, canvas_size)
+            return pil_to_qimage(overlay.resize(display_size, Image.Resampling.BILINEAR))
+
+        return self._cache.get_or_load(key, _load)
+
+    def preload(self, frame_path, canvas_size):
+        """프레임 선택 직후 백그라운드에서 캔버스 오버레이 미리 준비"""
+        if not frame_path or not os.path.exists(frame_path):
+            return
+
+        def _work():
+            try:
+                self.canvas_overlay(frame_path, canvas_size)
+            except Exception as e:
+                print(f"[frame_assets] 프리로드 실패 ({frame_path}): {e}")
+
+        threading.Thread(target=_work, daemon=True).start()
+
+    def clear(self):
+        self._cache.clear()
+
+
+# 프로세스 전역 공유 인스턴스
+frame_assets = FrameAssetCache()
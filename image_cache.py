@@ -0,0 +1,129 @@
+"""
+image_cache.py
+세션 단위 디코딩 이미지 캐시 (메모리 상한 + LRU 제거)
+
+합성(photo_utils), 사진 선택 페이지, 필터 페이지가 같은 카메라 JPEG를
+매번 다시 열지 않도록 디코딩 결과를 공유한다.
+
+사용법:
+    from image_cache import photo_cache
+
+    img = photo_cache.get_or_load(("pil", path), lambda: _decode(path))
+    photo_cache.clear()  # 새 세션 시작 시
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+# 24MP RGB 한 장 ≈ 72MB → 약 7장 분량
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def estimate_nbytes(obj) -> int:
+    """PIL Image / QImage / QPixmap 의 대략적인 메모리 사용량(byte)"""
+    # PIL Image
+    if hasattr(obj, "getbands") and hasattr(obj, "size"):
+        w, h = obj.size
+        return w * h * len(obj.getbands())
+    # QImage
+    if hasattr(obj, "sizeInBytes"):
+        return int(obj.sizeInBytes())
+    # QPixmap
+    if hasattr(obj, "depth") and hasattr(obj, "width"):
+        return obj.width() * obj.height() * max(1, obj.depth() // 8)
+    return 0
+
+
+class ImageCache:
+    """
+    메모리 상한이 있는 LRU 캐시
+
+    키는 (종류, 파일경로, ...) 형태의 튜플을 사용한다.
+    파일경로는 절대경로 + 수정시각으로 정규화되어, 같은 이름으로 덮어쓴
+    파일은 자동으로 새로 디코딩된다.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()   # key -> (value, nbytes)
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def file_key(kind: str, path: str, *extra):
+        """파일 기반 캐시 키 생성 (경로 + mtime)"""
+        abs_path = os.path.abspath(path)
+        try:
+            mtime = os.stat(abs_path).st_mtime_ns
+        except OSError:
+            mtime = 0
+        return (kind, abs_path, mtime) + tuple(extra)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes: int | None = None):
+        if value is None:
+            return
+        if nbytes is None:
+            nbytes = estimate_nbytes(value)
+        # 상한보다 큰 항목은 캐시하지 않음
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._total -= old[1]
+            self._items[key] = (value, nbytes)
+            self._total += nbytes
+            self._evict_locked()
+
+    def get_or_load(self, key, loader, nbytes: int | None = None):
+        """캐시에 없으면 loader()로 디코딩 후 저장"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = loader()
+        self.put(key, value, nbytes)
+        return value
+
+    def _evict_locked(self):
+        while self._total > self.max_bytes and self._items:
+            _, (_, nbytes) = self._items.popitem(last=False)
+            self._total -= nbytes
+
+    def discard_path(self, path: str):
+        """특정 파일에 대한 모든 캐시 항목 제거"""
+        abs_path = os.path.abspath(path)
+        with self._lock:
+            for key in [k for k in self._items if len(k) > 1 and k[1] == abs_path]:
+                _, nbytes = self._items.pop(key)
+                self._total -= nbytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._total = 0
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def __len__(self):
+        return len(self._items)
+
+
+# 프로세스 전역 공유 인스턴스 (세션 시작 시 clear)
+photo_cache = ImageCache()
@@ -0,0 +1,156 @@
+"""
+layout_registry.py
+레이아웃별 좌표/비율 표 (FRAME_LAYOUTS + LAYOUT_SLOT_COUNT 에서 한 번만 계산)
+
+캔버스 크기와 방향, 슬롯 좌표, 슬롯 비율, 화면 크기별 축소 좌표를 레이아웃마다
+미리 계산해 둔다. 선택/촬영/합성 화면은 모두 여기서 꺼내 쓰고 직접 계산하지 않는다.
+가로형 판정은 여기 한 곳뿐이다 (키 끝이 HORIZONTAL_SUFFIXES 중 하나면 3600x2400).
+
+사용법:
+    from layout_registry import get_layout, crop_box
+
+    geom = get_layout("full_v4a")          # 없는 키면 None
+    geom.canvas_size                       # (2400, 3600)
+    geom.slot_count                        # 촬영/선택 컷수 (LAYOUT_SLOT_COUNT)
+    geom.slot_for_shot(3)                  # 3번째 컷 슬롯 {"x","y","w","h"}
+    view = geom.display(600, 600)          # 라벨 크기에 맞춘 배치 (캐시)
+    view.rects                             # [(x, y, w, h), ...] 라벨 좌표
+    geom.hit_test(600, 600, x, y)          # 클릭한 슬롯 번호 또는 None
+    crop_box(img_w, img_h, geom.hole_ratio)
+"""
+
+import threading
+from constants import LAYOUT_SLOT_COUNT
+
+VERTICAL_CANVAS = (2400, 3600)
+HORIZONTAL_CANVAS = (3600, 2400)
+HORIZONTAL_SUFFIXES = ('h2', 'h3', 'h4', 'h5', 'h10')
+
+
+def is_horizontal(layout_key):
+    return any(layout_key.endswith(h) for h in HORIZONTAL_SUFFIXES)
+
+
+def canvas_size_for(layout_key):
+    """레이아웃 키에 맞는 캔버스 크기 (가로형 3600x2400 / 세로형 2400x3600)"""
+    return HORIZONTAL_CANVAS if is_horizontal(layout_key) else VERTICAL_CANVAS
+
+
+def crop_box(img_w, img_h, ratio):
+    """img_w x img_h 이미지에서 ratio(w/h) 비율 중앙 크롭 영역 (x, y, w, h)"""
+    if img_w / img_h > ratio:
+        crop_w = int(img_h * ratio)
+        return (img_w - crop_w) // 2, 0, crop_w, img_h
+    crop_h = int(img_w / ratio)
+    return 0, (img_h - crop_h) // 2, img_w, crop_h
+
+
+class LayoutView:
+    """
+    특정 표시 영역(box_w x box_h)에 캔버스를 비율 유지로 맞춘 결과
+    offset 은 영역 가운데 정렬 시 캔버스 왼쪽 위 위치, rects 는 offset 을 뺀 캔버스 기준 좌표
+    """
+
+    __slots__ = ("draw_size", "offset", "scale", "rects")
+
+    def __init__(self, draw_size, offset, scale, rects):
+        self.draw_size = draw_size
+        self.offset = offset
+        self.scale = scale
+        self.rects = rects
+
+
+class LayoutGeometry:
+    """레이아웃 1개의 고정 좌표 + 표시 크기별 계산 캐시"""
+
+    def __init__(self, key, slots, slot_count=None):
+        self.key = key
+        self.horizontal = is_horizontal(key)
+        self.canvas_size = canvas_size_for(key)
+        self.slots = tuple(dict(s) for s in slots)
+        self.ratios = tuple(s['w'] / s['h'] for s in self.slots)
+        self.hole_ratio = self.ratios[0] if self.ratios else None
+        self.slot_count = slot_count   # 촬영/선택 컷수 (LAYOUT_SLOT_COUNT, 없으면 None → 호출한 쪽 기본값)
+        self._views = {}
+        self._scaled = {}
+        self._lock = threading.Lock()
+
+    def slot_for_shot(self, shot_idx):
+        """shot_idx(1부터) 번째 컷이 들어갈 슬롯 (슬롯 수보다 많으면 반복)"""
+        if not self.slots:
+            return None
+        return self.slots[(shot_idx - 1) % len(self.slots)]
+
+    def ratio_for_shot(self, shot_idx):
+        if not self.ratios:
+            return None
+        return self.ratios[(shot_idx - 1) % len(self.ratios)]
+
+    def scaled_slots(self, scale):
+        """배율 scale 로 축소한 슬롯 좌표 (PhotoCompositor 프록시 캔버스용, 캐시)"""
+        if scale == 1.0:
+            return [dict(s) for s in self.slots]
+        with self._lock:
+            slots = self._scaled.get(scale)
+            if slots is None:
+                slots = tuple({k: max(1, round(v * scale)) for k, v in s.items()} for s in self.slots)
+                self._scaled[scale] = slots
+        return [dict(s) for s in slots]
+
+    def display(self, box_w, box_h):
+        """box_w x box_h 영역에 맞춘 그리기 크기/위치/슬롯 좌표 (크기별 캐시)"""
+        key = (int(box_w), int(box_h))
+        with self._lock:
+            view = self._views.get(key)
+        if view is not None:
+            return view
+
+        canvas_w, canvas_h = self.canvas_size
+        frame_ratio = canvas_w / canvas_h
+        if box_w / box_h > frame_ratio:
+            draw_h = int(box_h)
+            draw_w = int(draw_h * frame_ratio)
+        else:
+            draw_w = int(box_w)
+            draw_h = int(draw_w / frame_ratio)
+        sx = draw_w / canvas_w
+        sy = draw_h / canvas_h
+        rects = tuple(
+            (int(s['x'] * sx), int(s['y'] * sy), int(s['w'] * sx), int(s['h'] * sy))
+            for s in self.slots
+        )
+        view = LayoutView((draw_w, draw_h), ((int(box_w) - draw_w) // 2, (int(box_h) - draw_h) // 2), sx, rects)
+        with self._lock:
+            self._views[key] = view
+        return view
+
+    def hit_test(self, box_w, box_h, x, y):
+        """box 안 (x, y) 클릭 위치의 슬롯 번호 (가운데 정렬 기준, 없으면 None)"""
+        view = self.display(box_w, box_h)
+        px, py = x - view.offset[0], y - view.offset[1]
+        for i, (rx, ry, rw, rh) in enumerate(view.rects):
+            if rx <= px <= rx + rw and ry <= py <= ry + rh:
+                return i
+        return None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def _compile():
+    from photo_utils import FRAME_LAYOUTS
+    registry = {}
+    for key, slots in FRAME_LAYOUTS.items():
+        registry[key] = LayoutGeometry(key, slots, LAYOUT_SLOT_COUNT.get(key))
+    return registry
+
+
+def get_layout(layout_key):
+    """컴파일된 레이아웃 (처음 호출 시 전체 1회 계산, 없는 키면 None)"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = _compile()
+    return _registry.get(layout_key)
@@ -0,0 +1,160 @@
+"""
+live_view.py
+라이브뷰 합성 워커 (GUI 스레드 밖에서 실행)
+
+VideoThread 프레임 → [거울모드 → 16:9 크롭 → 슬롯 비율 스케일 → 프레임 오버레이]
+→ video_label 크기의 QImage 완성본을 메인 스레드로 전달한다.
+메인 스레드는 QPixmap.fromImage + setPixmap 만 수행한다.
+
+입력/출력 모두 최신 프레임 우편함(FrameMailbox)을 거치므로, 합성이나 화면 갱신이
+밀려도 시그널이 쌓이지 않고 항상 가장 최근 프레임만 처리된다.
+
+사용법:
+    self.live_view = LiveViewWorker()
+    self.live_view.frame_ready.connect(on_ready)          # on_ready 에서 take_output()
+    self.live_view.set_source(self.cam_thread.mailbox)
+    self.cam_thread.frame_available.connect(self.live_view.on_frame_available)
+    self.live_view.configure(target_size=(w, h), slot=slot, ...)
+"""
+
+import os
+import threading
+from PyQt6.QtCore import QObject, QThread, QCoreApplication, Qt, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QImage, QPainter
+from frame_assets import frame_assets
+from camera_thread import FrameMailbox
+
+
+class LiveViewWorker(QObject):
+    """
+    라이브뷰 합성 전용 워커
+    자체 QThread로 이동해서 동작하므로 process_frame 은 큐 연결로 호출된다.
+    """
+
+    # 출력 우편함이 비어 있다가 새 결과가 들어왔을 때만 발생 → take_output()
+    frame_ready = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._config = {
+            'target_size': None,   # (w, h) video_label 크기
+            'slot': None,          # 현재 컷 슬롯 {"x","y","w","h"}
+            'canvas_size': (2400, 3600),
+            'frame_path': None,
+            'mirror': True,
+        }
+
+        self._source = None               # 입력 우편함 (VideoThread.mailbox)
+        self.output = FrameMailbox()      # (합성 완료 이미지, 거울모드 적용된 원본 프레임)
+
+        self._thread = QThread()
+        self._thread.setObjectName("LiveViewWorker")
+        self.moveToThread(self._thread)
+        self._thread.start()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def configure(self, **kwargs):
+        """합성 설정 변경 (어느 스레드에서든 호출 가능)"""
+        with self._lock:
+            for k, v in kwargs.items():
+                if k in self._config:
+                    self._config[k] = v
+
+    def set_source(self, mailbox):
+        """입력 프레임 우편함 지정 (카메라 스레드 교체 시 다시 호출)"""
+        self._source = mailbox
+
+    def take_output(self):
+        """최신 합성 결과 (composed, raw) 또는 None (메인 스레드)"""
+        return self.output.take()
+
+    @pyqtSlot()
+    def on_frame_available(self):
+        source = self._source
+        item = source.take() if source is not None else None
+        if item is not None:
+            try:
+                self.process_frame(item[0])
+            finally:
+                # 카메라 링 버퍼 칸 반환 (process_frame 이 먼저 사본을 만듦)
+                source.release(item)
+
+    def _publish(self, composed, raw):
+        if self.output.put((composed, raw)):
+            self.frame_ready.emit()
+
+    @pyqtSlot(QImage)
+    def process_frame(self, qt_img):
+        with self._lock:
+            cfg = dict(self._config)
+
+        # 1. 거울 모드 적용 (입력 프레임은 카메라 링 버퍼를 가리키므로 항상 사본으로)
+        if cfg['mirror']:
+            qt_img = qt_img.mirrored(True, False)
+        else:
+            qt_img = qt_img.copy()
+
+        target = cfg['target_size']
+        if not target or target[0] <= 0 or target[1] <= 0:
+            self._publish(QImage(), qt_img)
+            return
+        target_w, target_h = target
+
+        # 2. 현재 컷의 프레임 비율 계산
+        slot = cfg['slot']
+        slot_ratio = slot['w'] / slot['h'] if slot else 3 / 4
+
+        # 프레임 구멍 비율에 맞춰 라이브뷰 영역 계산 (중앙 배치)
+        if (target_w / target_h) > slot_ratio:
+            display_h = target_h
+            display_w = int(target_h * slot_ratio)
+        else:
+            display_w = target_w
+            display_h = int(target_w / slot_ratio)
+        display_x = (target_w - display_w) // 2
+        display_y = (target_h - display_h) // 2
+
+        # 3. 카메라 영상 4:3 → 16:9 크롭 (납작함 보정)
+        cam = qt_img
+        cam_w, cam_h = cam.width(), cam.height()
+        target_cam_h = int(cam_w * 9 / 16)
+        if target_cam_h < cam_h:
+            cam = cam.copy(0, (cam_h - target_cam_h) // 2, cam_w, target_cam_h)
+
+        scaled_cam = cam.scaled(
+            display_w, display_h,
+            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        crop_x = (scaled_cam.width() - display_w) // 2
+        crop_y = (scaled_cam.height() - display_h) // 2
+
+        # 4. 캔버스 합성
+        out = QImage(target_w, target_h, QImage.Format.Format_RGB32)
+        out.fill(Qt.GlobalColor.black)
+        painter = QPainter(out)
+        painter.drawImage(display_x, display_y, scaled_cam, crop_x, crop_y, display_w, display_h)
+
+        # 5. 프레임 오버레이 (현재 컷 영역만)
+        frame_path = cfg['frame_path']
+        if frame_path and slot and os.path.exists(frame_path):
+            try:
+                overlay = frame_assets.slot_overlay_qimage(
+                    frame_path, cfg['canvas_size'], slot, (display_w, display_h)
+                )
+                painter.drawImage(display_x, display_y, overlay)
+            except Exception as e:
+                print(f"프레임 오버레이 오류: {e}")
+        painter.end()
+
+        self._publish(out, qt_img)
+
+    def stop(self):
+        """워커 스레드 종료"""
+        if self._thread.isRunning():
+            self._thread.quit()
+            self._thread.wait(2000)
@@ -8,7 +8,7 @@ import platform
 import json
 import glob
 import random
-import subprocess
+import multiprocessing
 try:
     import win32print
     import win32ui
@@ -29,12 +29,19 @@ from payment_service import KSNETPayment
 
 # [모듈 import]
 # 같은 폴더에 camera_thread.py, photo_utils.py, widgets.py, constants.py 가 있어야 합니다.
-from camera_thread import VideoThread
-from photo_utils import merge_4cut_vertical, merge_half_cut, apply_filter, add_qr_to_image, FRAME_LAYOUTS
+from preview_service import PreviewService
+from live_view import LiveViewWorker
+from print_service import PrintPipeline
+from capture_worker import CaptureWorker
+from file_handoff import forget as forget_handoff
+from capture_metrics import capture_metrics
+from print_queue import PrintQueue, create_printer_backend
+from photo_utils import load_thumbnail, pil_to_qimage, PhotoCompositor, get_canvas_size
+from layout_registry import get_layout, crop_box
+from image_cache import photo_cache
+from frame_assets import frame_assets
 from widgets import ClickableLabel, BackArrowWidget, CircleButton, GradientButton, QRCheckWidget, GlobalTimerWidget, PaymentPopup
-from constants import LAYOUT_OPTIONS_MASTER, LAYOUT_SLOT_COUNT
-from tether_service import capture_one_photo_blocking
-from shutter_trigger import EOSRemoteShutter
+from constants import LAYOUT_OPTIONS_MASTER
 from tether_worker import TetherCaptureManyThread
 
 class PaymentApproveThread(QThread):
@@ -55,13 +62,18 @@ class KioskMain(QMainWindow):
 
     def get_admin_shoot_count(self) -> int:
         # 하프컷은 슬롯 수 기준, 풀컷은 어드민 설정 기준
-        layout_full_key = f"{self.session_data.get('paper_type', 'full')}_{self.session_data.get('layout_key', 'v2')}"
-        slot_count = LAYOUT_SLOT_COUNT.get(layout_full_key)
+        geom = self.current_layout()
+        slot_count = geom.slot_count if geom else None
         if slot_count:
             return slot_count
         n = int(self.admin_settings.get("total_shoot_count", 8))
         return max(1, min(12, n))
 
+    def current_layout(self):
+        """현재 세션 레이아웃 좌표표 (layout_registry, 없으면 None)"""
+        key = f"{self.session_data.get('paper_type', 'full')}_{self.session_data.get('layout_key', 'v2')}"
+        return get_layout(key)
+
     
     def set_tether_status(self, msg: str):
         self.tether_status_text = msg
@@ -109,7 +121,11 @@ class KioskMain(QMainWindow):
             'camera_index': 1,      # check_camera.py로 확인한 인덱스
             'camera_width': 1920,   # 해상도
             'camera_height': 1080,
-            'camera_source': 'capture'  # 'capture' 또는 'tether'
+            'camera_failover_index': None,  # 예비 캡처보드 인덱스 (None 이면 사용 안 함)
+            'preview_process': False,  # True: 캡처/디코딩을 별도 프로세스에서 (공유 메모리 전달)
+            'camera_source': 'capture',  # 'capture' 또는 'tether'
+            'print_backend': None,  # None(자동) / 'win32' / 'folder'(테스트용 가짜 프린터)
+            'shutter_backend': 'eos'  # 'eos' / 'gphoto2' / 'simulated'(가상 카메라)
         }
 
         self.event_config = self.load_event_config() 
@@ -149,6 +165,41 @@ class KioskMain(QMainWindow):
         self.update_ui_mode()
         
         self.cam_thread = None
+        self.camera_health = {}     # VideoThread.health_signal 마지막 값
+        self.capture_client = None  # 외부 촬영 서버 연결 (run_external_camera_manager)
+        self.external_session_active = False  # 외부 촬영 세션 진행 중 (done/끊김 전)
+        
+        # 상주 캡처보드 프리뷰 (세션 사이에는 대기 모드로 장치를 열어 둠)
+        self.preview = PreviewService()
+        QApplication.instance().aboutToQuit.connect(self.preview.stop)
+        QTimer.singleShot(1000, lambda: self._acquire_preview(active=False))
+        
+        # 라이브뷰 합성 워커 (GUI 스레드 밖에서 프레임 합성)
+        self.live_view = LiveViewWorker()
+        self._live_view_connected = False
+        self._set_live_view_connected(True)
+        
+        # 출력 이미지 사전 렌더링 워커 (필터 페이지에서 옵션 변경이 멈추면 미리 렌더링)
+        self.print_pipeline = PrintPipeline()
+        self.print_pipeline.start()
+        QApplication.instance().aboutToQuit.connect(self.print_pipeline.stop)
+        self.prerender_timer = QTimer(self)
+        self.prerender_timer.setSingleShot(True)
+        self.prerender_timer.setInterval(500)
+        self.prerender_timer.timeout.connect(lambda: self.print_pipeline.request(self._print_choice()))
+        
+        # 비동기 출력 큐 (스풀링 중에도 다음 세션 진행 가능)
+        self.print_queue = PrintQueue(create_printer_backend(self.admin_settings.get('print_backend')))
+        self.print_queue.job_changed.connect(self.on_print_job_changed)
+        self.print_queue.start()
+        QApplication.instance().aboutToQuit.connect(self.print_queue.stop)
+        
+        # 상주 촬영 워커 (셔터 객체/창 핸들/세션 폴더 재사용)
+        self.capture_worker = CaptureWorker(shutter_backend=self.admin_settings.get('shutter_backend', 'eos'))
+        self.capture_worker.shot_ready.connect(self._on_shot_ready)
+        self.capture_worker.shot_failed.connect(self._on_shot_failed)
+        self.capture_worker.start()
+        QApplication.instance().aboutToQuit.connect(self.capture_worker.stop)
         
         # 초기 리사이징 및 페이지 로드
         self.calculate_layout_geometry()
@@ -333,8 +384,8 @@ class KioskMain(QMainWindow):
         elif idx == 5:
             old = self.stack.widget(5); self.page_filter = self.create_filter_page()
             self.stack.removeWidget(old); self.stack.insertWidget(5, self.page_filter); self.stack.setCurrentIndex(5); 
-            if hasattr(self, 'final_print_path') and os.path.exists(self.final_print_path):
-                self.result_label.setPixmap(QPixmap(self.final_print_path).scaled(800,1200, Qt.AspectRatioMode.KeepAspectRatio))
+            if getattr(self, 'preview_compositor', None):
+                self._update_filter_result()
         elif idx == 6:
             old = self.stack.widget(6); self.page_print = self.create_printing_page()
             self.stack.removeWidget(old); self.stack.insertWidget(6, self.page_print); self.stack.setCurrentIndex(6)
@@ -911,15 +962,12 @@ class KioskMain(QMainWindow):
 
         print(f"[DEBUG] 그리드 생성 - paper: {paper}, layout: {layout}, key: {key}")
 
-        layout_list = FRAME_LAYOUTS.get(key, [])
+        geom = get_layout(key)
 
-        # 구멍 비율 계산
-        if layout_list:
-            first_slot = layout_list[0]
-            hole_w = first_slot['w']
-            hole_h = first_slot['h']
-            hole_ratio = hole_w / hole_h
-            print(f"[DEBUG] 첫 번째 구멍: {hole_w}x{hole_h}, 비율: {hole_ratio:.3f}")
+        # 구멍 비율
+        if geom and geom.slots:
+            hole_ratio = geom.hole_ratio
+            print(f"[DEBUG] 첫 번째 구멍: {geom.slots[0]['w']}x{geom.slots[0]['h']}, 비율: {hole_ratio:.3f}")
         else:
             hole_ratio = 1.0
             print(f"[DEBUG] 레이아웃 데이터 없음, 기본 비율 사용: {hole_ratio}")
@@ -1049,23 +1097,16 @@ class KioskMain(QMainWindow):
         if w <= 0 or h <= 0:
             return
         
-        k = f"{self.session_data.get('paper_type','full')}_{self.session_data.get('layout_key','v2')}"
-        ld = FRAME_LAYOUTS.get(k, [])
-        
-        if not ld:
+        geom = self.current_layout()
+        if not geom or not geom.slots:
             return
         
-        sx = w / 2400
-        sy = h / 3600
-        
-        for i, cd in enumerate(ld):
-            cx, cy, cw, ch = int(cd['x']*sx), int(cd['y']*sy), int(cd['w']*sx), int(cd['h']*sy)
-            if cx <= x <= cx + cw and cy <= y <= cy + ch:
-                # 🔥 안전한 인덱스 접근
-                if i < len(self.selected_indices):
-                    self.selected_indices[i] = None
-                    self.load_select_page()
-                break
+        # draw_select_preview 와 같은 배치 (가로형 캔버스 + 가운데 정렬 포함)
+        i = geom.hit_test(w, h, x, y)
+        # 🔥 안전한 인덱스 접근
+        if i is not None and i < len(self.selected_indices):
+            self.selected_indices[i] = None
+            self.load_select_page()
 
     def load_select_page(self):
         t = self.session_data.get('target_count', 4)
@@ -1081,22 +1122,13 @@ class KioskMain(QMainWindow):
             if idx is not None:
                 selection_count[idx] = selection_count.get(idx, 0) + 1
         
-        # 프레임 레이아웃 정보 가져오기
-        paper = self.session_data.get('paper_type', 'full')
-        layout = self.session_data.get('layout_key', 'v2')
-        key = f"{paper}_{layout}"
-        layout_list = FRAME_LAYOUTS.get(key, [])
-        
-        # 구멍 비율 계산
-        if layout_list:
-            first_slot = layout_list[0]
-            hole_ratio = first_slot['w'] / first_slot['h']
-        else:
-            hole_ratio = 3 / 4
+        # 프레임 구멍 비율
+        geom = self.current_layout()
+        hole_ratio = geom.hole_ratio if geom and geom.slots else 3 / 4
         
         for i, b in enumerate(self.photo_buttons):
             if i < len(self.captured_files):
-                original_pix = QPixmap(self.captured_files[i])
+                original_pix = self.load_thumb_pixmap(self.captured_files[i], self.s(250), self.s(250))
                 
                 if original_pix.isNull():
                     b.setIcon(QIcon())
@@ -1104,22 +1136,7 @@ class KioskMain(QMainWindow):
                     continue
                 
                 # 구멍 비율에 맞춰 이미지 크롭
-                img_w = original_pix.width()
-                img_h = original_pix.height()
-                img_ratio = img_w / img_h
-                
-                if img_ratio > hole_ratio:
-                    crop_h = img_h
-                    crop_w = int(crop_h * hole_ratio)
-                    crop_x = (img_w - crop_w) // 2
-                    crop_y = 0
-                else:
-                    crop_w = img_w
-                    crop_h = int(crop_w / hole_ratio)
-                    crop_x = 0
-                    crop_y = (img_h - crop_h) // 2
-                
-                cropped_pix = original_pix.copy(crop_x, crop_y, crop_w, crop_h)
+                cropped_pix = original_pix.copy(*crop_box(original_pix.width(), original_pix.height(), hole_ratio))
                 
                 # 선택 횟수 오버레이
                 if i in selection_count:
@@ -1143,28 +1160,12 @@ class KioskMain(QMainWindow):
 
     def draw_select_preview(self, photo_paths):
         try:
-            # 프레임 정보 가져오기
-            paper_type = self.session_data.get('paper_type', 'full')
-            layout_key = self.session_data.get('layout_key', 'v2')
-            k = f"{paper_type}_{layout_key}"
-            ld = FRAME_LAYOUTS.get(k, [])
-            
-            if not ld:
-                print(f"[ERROR] 레이아웃 데이터 없음: {k}")
+            # 프레임 정보 가져오기 (캔버스 크기/방향/슬롯 좌표는 layout_registry)
+            geom = self.current_layout()
+            if not geom or not geom.slots:
+                print(f"[ERROR] 레이아웃 데이터 없음: {self.session_data.get('paper_type', 'full')}_{self.session_data.get('layout_key', 'v2')}")
                 return
-            
-            # 🔥 프레임 원본 크기 및 방향 판단
-            # 레이아웃 키로 가로/세로 판단
-            if layout_key.startswith('h'):
-                # 가로형: 3600x2400
-                canvas_w, canvas_h = 3600, 2400
-                print(f"[DEBUG] 가로형 프레임 - 3600x2400")
-            else:
-                # 세로형: 2400x3600
-                canvas_w, canvas_h = 2400, 3600
-                print(f"[DEBUG] 세로형 프레임 - 2400x3600")
-            
-            frame_ratio = canvas_w / canvas_h
+            canvas_w, canvas_h = geom.canvas_size
             
             # 라벨 크기
             label_w = self.lbl_select_preview.width()
@@ -1173,24 +1174,14 @@ class KioskMain(QMainWindow):
             if label_w <= 0 or label_h <= 0:
                 label_w, label_h = self.s(600), self.s(600)
             
-            # 🔥 프레임 비율에 맞춰 그릴 크기 계산
-            label_ratio = label_w / label_h
-            
-            if label_ratio > frame_ratio:
-                # 라벨이 더 넓음 -> 높이 기준
-                draw_h = label_h
-                draw_w = int(draw_h * frame_ratio)
-            else:
-                # 라벨이 더 좁음 -> 너비 기준
-                draw_w = label_w
-                draw_h = int(draw_w / frame_ratio)
+            # 🔥 프레임 비율에 맞춘 그릴 크기 + 슬롯 좌표 (크기별 캐시)
+            view = geom.display(label_w, label_h)
+            draw_w, draw_h = view.draw_size
             
             if draw_w <= 0 or draw_h <= 0:
                 print("[ERROR] 잘못된 미리보기 크기")
                 return
             
-            print(f"[DEBUG] 그릴 크기: {draw_w}x{draw_h}, 비율: {frame_ratio:.3f}")
-            
             # 🔥 캔버스 생성
             pm = QPixmap(draw_w, draw_h)
             pm.fill(Qt.GlobalColor.white)
@@ -1200,20 +1191,15 @@ class KioskMain(QMainWindow):
             
             fp = self.session_data.get('frame_path')
             
-            # 🔥 스케일 비율
-            sx = draw_w / canvas_w
-            sy = draw_h / canvas_h
-            
             # 사진 배치
-            for i, cd in enumerate(ld):
-                x, y, cw, ch = int(cd['x']*sx), int(cd['y']*sy), int(cd['w']*sx), int(cd['h']*sy)
+            for i, (x, y, cw, ch) in enumerate(view.rects):
                 
                 if photo_paths and i < len(photo_paths) and photo_paths[i]:
                     if not os.path.exists(photo_paths[i]):
                         pt.fillRect(x, y, cw, ch, QColor(220, 220, 220))
                         continue
                     
-                    img = QPixmap(photo_paths[i])
+                    img = self.load_thumb_pixmap(photo_paths[i], cw, ch)
                     if img.isNull():
                         pt.fillRect(x, y, cw, ch, QColor(220, 220, 220))
                         continue
@@ -1229,15 +1215,11 @@ class KioskMain(QMainWindow):
                 else:
                     pt.fillRect(x, y, cw, ch, QColor(220, 220, 220))
             
-            # 프레임 오버레이
+            # 프레임 오버레이 (표시 크기로 미리 맞춘 캐시 사용)
             if fp and os.path.exists(fp):
-                frame_scaled = QPixmap(fp).scaled(
-                    draw_w, draw_h, 
-                    Qt.AspectRatioMode.IgnoreAspectRatio, 
-                    Qt.TransformationMode.SmoothTransformation
-                )
+                frame_scaled = frame_assets.display_overlay_qimage(fp, (canvas_w, canvas_h), (draw_w, draw_h))
                 if not frame_scaled.isNull():
-                    pt.drawPixmap(0, 0, frame_scaled)
+                    pt.drawImage(0, 0, frame_scaled)
             
             pt.end()
             
@@ -1470,38 +1452,9 @@ class KioskMain(QMainWindow):
         
         self.is_mirrored = is_on
         
-        # 원본 사진들을 좌우반전한 후 프레임 합성
-        sp = [self.captured_files[i] for i in self.selected_indices if i is not None]
-        fp = self.session_data.get('frame_path')
-        l_key = self.session_data.get('layout_key')
-        fk = f"{self.session_data['paper_type']}_{l_key}"
-        
-        # 좌우반전된 사진들 생성
-        if self.is_mirrored:
-            mirrored_photos = []
-            for photo_path in sp:
-                img = QPixmap(photo_path)
-                img = img.toImage().mirrored(True, False)
-                img = QPixmap.fromImage(img)
-                temp_path = photo_path.replace('.jpg', '_temp_mirror.jpg')
-                img.save(temp_path)
-                mirrored_photos.append(temp_path)
-            merged_path = merge_4cut_vertical(mirrored_photos, fp, fk)
-        else:
-            merged_path = merge_4cut_vertical(sp, fp, fk)
-        
-        # 현재 필터 적용
-        if hasattr(self, 'current_filter_mode'):
-            self.final_print_path = apply_filter(merged_path, self.current_filter_mode)
-        else:
-            self.final_print_path = merged_path
-        
-        # 미리보기 업데이트
-        self.result_label.setPixmap(QPixmap(self.final_print_path).scaled(
-            self.s(600), self.s(600),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        ))
+        # 미리보기 프록시 캔버스의 슬롯 타일만 반전 (출력용 합성은 인쇄 시)
+        self.preview_compositor.set_mirror(self.is_mirrored)
+        self._update_filter_result()
 
     def apply_filter_click(self, m, clicked_btn):
         """필터 적용 - 버튼 상태 업데이트"""
@@ -1512,35 +1465,38 @@ class KioskMain(QMainWindow):
         
         self.current_filter_mode = m
         
-        # 좌우반전 상태에 따라 원본 이미지 선택
-        sp = [self.captured_files[i] for i in self.selected_indices if i is not None]
-        fp = self.session_data.get('frame_path')
-        l_key = self.session_data.get('layout_key')
-        fk = f"{self.session_data['paper_type']}_{l_key}"
-        
-        # 좌우반전이 활성화되어 있으면
-        if self.is_mirrored:
-            mirrored_photos = []
-            for photo_path in sp:
-                img = QPixmap(photo_path)
-                img = img.toImage().mirrored(True, False)
-                img = QPixmap.fromImage(img)
-                temp_path = photo_path.replace('.jpg', '_temp_mirror.jpg')
-                img.save(temp_path)
-                mirrored_photos.append(temp_path)
-            merged_path = merge_4cut_vertical(mirrored_photos, fp, fk)
-        else:
-            merged_path = merge_4cut_vertical(sp, fp, fk)
+        # 미리보기 프록시 캔버스의 슬롯 타일만 다시 색보정 (출력용 합성은 인쇄 시)
+        self.preview_compositor.set_filter(m)
+        self._update_filter_result()
+
+    def _create_compositors(self, sp, fp, fk):
+        """세션 합성기 생성: 출력용(사전 렌더링 워커) + 필터 페이지 미리보기용(표시 크기)"""
+        self.print_pipeline.set_session(fk, fp, sp)
         
-        # 필터 적용
-        self.final_print_path = apply_filter(merged_path, m)
+        canvas_w, canvas_h = get_canvas_size(fk)
+        preview_scale = self.s(600) / max(canvas_w, canvas_h)
+        self.preview_compositor = PhotoCompositor(fk, fp, scale=preview_scale)
+        self.preview_compositor.set_photos(sp)
+
+    def _update_filter_result(self):
+        """현재 필터/좌우반전 상태로 미리보기 프록시 캔버스만 갱신"""
+        preview = self.preview_compositor.render()
+        self.result_label.setPixmap(QPixmap.fromImage(pil_to_qimage(preview)))
         
-        # 미리보기 업데이트
-        self.result_label.setPixmap(QPixmap(self.final_print_path).scaled(
-            self.s(600), self.s(600),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        ))
+        # 옵션 변경이 멈추면 출력용 비트맵 사전 렌더링 (디바운스)
+        self.prerender_timer.start()
+
+    def _print_choice(self):
+        """출력 결과를 결정하는 현재 선택 (필터/좌우반전/QR/프린터)"""
+        is_half = self.session_data.get('paper_type', 'full') == 'half'
+        # 하프컷은 DS-RX1_Cut, 풀컷은 DS-RX1
+        printer_name = 'DS-RX1_Cut' if is_half else self.admin_settings.get('printer_name', 'DS-RX1')
+        return (
+            bool(self.is_mirrored),
+            getattr(self, 'current_filter_mode', 'original'),
+            bool(self.session_data.get('use_qr', True)),
+            printer_name,
+        )
 
     def create_printing_page(self):
         page = QWidget(); self.apply_window_style(page, "print")
@@ -1832,6 +1788,7 @@ class KioskMain(QMainWindow):
             for f in glob.glob("data/original/*.jpg"): 
                 try: os.remove(f)
                 except: pass
+                forget_handoff(f)
 
     def auto_select_and_proceed(self):
         """타이머 만료 시 자동 선택 (on_timeout에서 처리)"""
@@ -1844,66 +1801,54 @@ class KioskMain(QMainWindow):
         l_key = self.session_data.get('layout_key')
         fk = f"{self.session_data['paper_type']}_{l_key}"
         
-        # 최종 이미지 생성
-        self.final_image_path = merge_4cut_vertical(sp, fp, fk)
+        # 세션 합성기 생성 (필터 페이지에서 바뀐 슬롯만 재합성)
+        self._create_compositors(sp, fp, fk)
         
         # 🔥 필터 페이지로 이동 (조건 없이 무조건)
         self.show_page(5)
 
     def start_printing(self):
-        paper_type = self.session_data.get('paper_type', 'full')
-        is_half = paper_type == 'half'
+        self.prerender_timer.stop()
         qty = self.session_data.get('print_qty', 1)
-
-        # 하프컷은 DS-RX1_Cut, 풀컷은 DS-RX1
-        printer_name = 'DS-RX1_Cut' if is_half else self.admin_settings.get('printer_name', 'DS-RX1')
-
-        if not hasattr(self, 'final_print_path'):
-            self.final_print_path = self.final_image_path
-        if self.session_data.get('use_qr', True):
-            add_qr_to_image(self.final_print_path)
-        self.last_printed_file = self.final_print_path
-
-        try:
-            import win32ui
-            from PIL import Image, ImageWin
-            import datetime as dt
-
-            print(f"[인쇄 시작] 파일: {self.final_print_path}")
-            print(f"[인쇄 시작] 프린터: {printer_name}, 수량: {qty}, 하프컷: {is_half}")
-
-            for i in range(qty):
-                img = Image.open(self.final_print_path)
-                print(f"[인쇄] {i+1}/{qty} / 이미지 크기: {img.width}x{img.height}")
-
-                pdc = win32ui.CreateDC()
-                pdc.CreatePrinterDC(printer_name)
-                pw = pdc.GetDeviceCaps(110)
-                ph = pdc.GetDeviceCaps(111)
-                print(f"[인쇄] 프린터 영역: {pw}x{ph}")
-
-                # 가로형 이미지는 90도 회전
-                if img.width > img.height:
-                    img = img.rotate(90, expand=True)
-                    print(f"[인쇄] 90도 회전 후: {img.width}x{img.height}")
-
-                img = img.resize((pw, ph), Image.Resampling.LANCZOS)
-
-                doc_name = f"Kiosk_{dt.datetime.now().strftime('%H%M%S')}_{i+1}"
-                pdc.StartDoc(doc_name)
-                pdc.StartPage()
-                dib = ImageWin.Dib(img)
-                dib.draw(pdc.GetHandleOutput(), (0, 0, pw, ph))
-                pdc.EndPage()
-                pdc.EndDoc()
-                pdc.DeleteDC()
-                print(f"[인쇄 완료] {i+1}/{qty}")
-
-        except Exception as e:
-            print(f"[인쇄 오류] {e}")
+        choice = self._print_choice()
+        printer_name = choice[3]
+
+        # 작업만 등록하고 바로 완료 화면으로 (렌더링 대기/스풀링은 출력 큐에서)
+        pipeline = self.print_pipeline
+        # 사전 렌더링이 실패하면 출력 큐 보조 스레드에서 바로 다시 렌더링
+        job_id = self.print_queue.submit(
+            printer_name, qty, render=lambda: pipeline.result_for(choice, fallback=True))
+        self.current_print_job = job_id
+        print(f"[인쇄 요청] 작업: {job_id}, 프린터: {printer_name}, 수량: {qty}")
+
+        # 사전 렌더링이 이미 끝났으면 완료 화면 미리보기에 바로 사용
+        self.final_print_path = None
+        ready = self.print_pipeline.result_for(choice, timeout=0)
+        if ready is not None:
+            self._set_final_print_path(ready['path'])
 
         self.show_page(6)
 
+    def _set_final_print_path(self, path):
+        """렌더링 완료된 최종 파일 경로 (QR 포함) 반영 + 완료 화면 미리보기 갱신"""
+        self.final_print_path = path
+        self.final_image_path = path
+        self.last_printed_file = path
+        if self.stack.currentIndex() == 6 and os.path.exists(path):
+            pix = QPixmap(path)
+            self.lbl_print_preview.setPixmap(pix.scaled(self.lbl_print_preview.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+
+    def on_print_job_changed(self, job_id, state, message):
+        """출력 큐 작업 상태 변경 (GUI 스레드)"""
+        if state == "queued":
+            job = next((j for j in self.print_queue.jobs() if j['id'] == job_id), None)
+            if job and job_id == getattr(self, 'current_print_job', None) and job['path'] != self.final_print_path:
+                self._set_final_print_path(job['path'])
+        elif state == "done":
+            print(f"[인쇄 완료] {job_id} ({message})")
+        elif state == "failed":
+            print(f"[인쇄 오류] {job_id}: {message}")
+
     def load_payment_page_logic(self):
         min_q = max(2, self.admin_settings.get('print_count_min', 2))
         self.session_data['print_qty'] = min_q
@@ -2004,9 +1949,10 @@ class KioskMain(QMainWindow):
     def select_frame_and_go(self, item):
         self.session_data.update({"paper_type": item['paper'], "layout_key": item['layout'], "frame_path": item['path']})
         
-        # LAYOUT_SLOT_COUNT에서 정확한 슬롯 수 가져오기
+        # 레이아웃 좌표표에서 정확한 슬롯 수 가져오기
         layout_full_key = f"{item['paper']}_{item['layout']}"
-        slot_count = LAYOUT_SLOT_COUNT.get(layout_full_key)
+        geom = self.current_layout()
+        slot_count = geom.slot_count if geom else None
         
         if slot_count:
             self.session_data['target_count'] = slot_count
@@ -2016,6 +1962,7 @@ class KioskMain(QMainWindow):
             self.session_data['target_count'] = int(nums[0]) if nums else 4
         
         print(f"[레이아웃] {layout_full_key} → 슬롯 수: {self.session_data['target_count']}")
+        frame_assets.preload(item['path'], geom.canvas_size if geom else get_canvas_size(layout_full_key))
         self.show_page(2)
     
     def load_frame_options(self):
@@ -2196,107 +2143,94 @@ class KioskMain(QMainWindow):
         """결제 페이지 로드 시 호출"""
         self.load_payment_page_logic()
 
-    def update_image(self, qt_img):
-        """카메라 영상 처리 및 화면 표시 (카운트다운 오버레이 추가됨)"""
-        # 1. 거울 모드 적용
-        if self.admin_settings.get('mirror_mode'): 
-            qt_img = qt_img.mirrored(True, False)
-        
-        self.current_frame_data = qt_img.copy()
+    def load_thumb_pixmap(self, path, min_w, min_h):
+        """미리보기용 저해상도 QPixmap (min_w x min_h 이상, DCT 축소 디코딩)"""
+        try:
+            thumb = load_thumbnail(path, (min_w, min_h))
+        except Exception as e:
+            print(f"[썸네일] 디코딩 실패 ({path}): {e}")
+            return QPixmap()
+        key = photo_cache.file_key("qthumb", path, thumb.width, thumb.height)
+        return photo_cache.get_or_load(key, lambda: QPixmap.fromImage(pil_to_qimage(thumb)))
+
+    def update_image(self, composed, qt_img):
+        """라이브뷰 워커가 합성한 프레임 표시 (메인 스레드는 blit 만 수행)"""
+        # 거울 모드 적용된 원본 프레임 (셔터 애니메이션/폴백 저장용)
+        self.current_frame_data = qt_img
         
-        # 2. 화면 표시를 위한 타겟 크기
         target_w = self.video_label.width()
         target_h = self.video_label.height()
         if target_w <= 0 or target_h <= 0: return
         
-        # 3. 프레임 레이아웃 정보 가져오기
-        paper = self.session_data.get('paper_type', 'full')
-        layout = self.session_data.get('layout_key', 'v2')
-        key = f"{paper}_{layout}"
-        layout_list = FRAME_LAYOUTS.get(key, [])
-        
-        slot_info = None
-        if layout_list:
-            idx = (self.current_shot_idx - 1) % len(layout_list) if hasattr(self, 'current_shot_idx') else 0
-            slot_info = layout_list[idx]
+        # 라벨 크기가 바뀌었으면 다음 프레임부터 새 크기로 합성
+        if composed.isNull() or composed.width() != target_w or composed.height() != target_h:
+            self._configure_live_view()
+            if composed.isNull():
+                return
         
-        # 🔥 4. 현재 컷의 프레임 비율 계산
-        if slot_info:
-            slot_ratio = slot_info['w'] / slot_info['h']  # 예: 1100/1600 = 0.6875
-        else:
-            slot_ratio = 3 / 4  # 기본 비율
+        self.video_label.setPixmap(QPixmap.fromImage(composed))
+
+    def _configure_live_view(self):
+        """현재 컷/레이아웃/라벨 크기를 라이브뷰 워커에 전달"""
+        geom = self.current_layout()
+        slot_info = geom.slot_for_shot(getattr(self, 'current_shot_idx', 1)) if geom else None
         
-       # 프레임 구멍 비율에 맞춰 라이브뷰 영역 계산 (중앙 배치)
-        if (target_w / target_h) > slot_ratio:
-            # 화면이 더 넓음 → 높이 기준
-            display_h = target_h
-            display_w = int(target_h * slot_ratio)
-        else:
-            # 화면이 더 높음 → 너비 기준
-            display_w = target_w
-            display_h = int(target_w / slot_ratio)
-        display_x = (target_w - display_w) // 2
-        display_y = (target_h - display_h) // 2
-        
-        # 🔥 6. 캔버스 생성 및 카메라 영상 배치
-        final_pixmap = QPixmap(target_w, target_h)
-        final_pixmap.fill(Qt.GlobalColor.black)
-        
-        painter = QPainter(final_pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # 카메라 영상 4:3 → 16:9 크롭 (납작함 보정)
-        cam_pixmap = QPixmap.fromImage(qt_img)
-        cam_w = cam_pixmap.width()
-        cam_h = cam_pixmap.height()
-        target_cam_h = int(cam_w * 9 / 16)
-        if target_cam_h < cam_h:
-            cam_crop_y = (cam_h - target_cam_h) // 2
-            cam_pixmap = cam_pixmap.copy(0, cam_crop_y, cam_w, target_cam_h)
-
-        # 카메라 영상을 계산된 영역에 꽉 채우기
-        scaled_cam = cam_pixmap.scaled(
-            display_w, display_h,
-            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-            Qt.TransformationMode.SmoothTransformation
+        self.live_view.configure(
+            target_size=(self.video_label.width(), self.video_label.height()),
+            slot=slot_info,
+            canvas_size=geom.canvas_size if geom else get_canvas_size(self.session_data.get('layout_key', 'v2')),
+            frame_path=self.session_data.get('frame_path'),
+            mirror=bool(self.admin_settings.get('mirror_mode')),
         )
-        
-        # 중앙 크롭
-        crop_x = (scaled_cam.width() - display_w) // 2
-        crop_y = (scaled_cam.height() - display_h) // 2
-        painter.drawPixmap(display_x, display_y, scaled_cam, crop_x, crop_y, display_w, display_h)
-        
-        # 🔥 7. 프레임 오버레이 (현재 컷 영역만)
-        frame_path = self.session_data.get('frame_path')
-        if frame_path and os.path.exists(frame_path) and slot_info:
+        # 캡처 스레드에서 표시 크기로 미리 축소
+        if self.cam_thread:
+            self.cam_thread.set_output_size(self.video_label.width(), self.video_label.height())
+
+    def _acquire_preview(self, active=True):
+        """상주 프리뷰 스레드 확보 (새로 만든 경우에만 오류/상태 시그널 연결)"""
+        thread, created = self.preview.acquire(
+            self.admin_settings.get('camera_index', 1),
+            self.admin_settings.get('camera_width', 1920),
+            self.admin_settings.get('camera_height', 1080),
+            failover_index=self.admin_settings.get('camera_failover_index'),
+            active=active,
+            use_process=bool(self.admin_settings.get('preview_process')),
+        )
+        if created:
+            thread.error_signal.connect(self.on_camera_error)
+            thread.health_signal.connect(self.on_camera_health)
+        return thread
+
+    def _release_preview(self):
+        """라이브뷰 연결 해제 후 프리뷰를 대기 모드로 (장치는 닫지 않음)"""
+        if self.cam_thread:
             try:
-                # 프레임 원본 이미지 로드 (2400x3600)
-                frame_full = QPixmap(frame_path)
-                
-                # 현재 컷 영역만 크롭
-                frame_cropped = frame_full.copy(
-                    slot_info['x'], 
-                    slot_info['y'], 
-                    slot_info['w'], 
-                    slot_info['h']
-                )
-                
-                # 계산된 영역에 맞게 스케일
-                frame_scaled = frame_cropped.scaled(
-                    display_w, display_h,
-                    Qt.AspectRatioMode.IgnoreAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                
-                # 🔥 완전 불투명 (1.0)
-                painter.setOpacity(1.0)
-                painter.drawPixmap(display_x, display_y, frame_scaled)
-                
-            except Exception as e:
-                print(f"프레임 오버레이 오류: {e}")
-            
-        painter.end()
-        self.video_label.setPixmap(final_pixmap)
+                self.cam_thread.frame_available.disconnect(self.live_view.on_frame_available)
+            except TypeError:
+                pass
+        self.preview.idle()
+        self.cam_thread = None
+
+    def _on_live_view_ready(self):
+        """라이브뷰 워커의 최신 합성 결과만 표시"""
+        item = self.live_view.take_output()
+        if item is not None:
+            self.update_image(*item)
+
+    def _set_live_view_connected(self, connected):
+        """라이브뷰 표시 연결/해제 (중복 연결 방지)"""
+        if connected == self._live_view_connected:
+            return
+        if connected:
+            # 연결 해제 중 쌓인 결과는 버림 (비워야 다음 결과에서 다시 알림이 옴)
+            self.live_view.output.clear()
+            self.live_view.frame_ready.connect(self._on_live_view_ready)
+        else:
+            try:
+                self.live_view.frame_ready.disconnect(self._on_live_view_ready)
+            except (TypeError, RuntimeError):
+                pass
+        self._live_view_connected = connected
 
     def show_page(self, idx):
          # 🔥 페이지 전환 시 크기 강제 설정
@@ -2329,19 +2263,17 @@ class KioskMain(QMainWindow):
         if idx==1: self.load_frame_options() 
         elif idx==2: self.load_payment_page()
         elif idx==3:
-            # 카메라 프리뷰 시작 (캡처보드)
-            camera_index = self.admin_settings.get('camera_index', 1)
-            camera_w = self.admin_settings.get('camera_width', 1920)
-            camera_h = self.admin_settings.get('camera_height', 1080)
-            
-            self.cam_thread = VideoThread(
-                camera_index=camera_index,
-                target_width=camera_w,
-                target_height=camera_h
-            )
-            self.cam_thread.change_pixmap_signal.connect(self.update_image)
-            self.cam_thread.error_signal.connect(self.on_camera_error)
-            self.cam_thread.start()
+            # 카메라 프리뷰 전체 속도로 재개 (캡처보드, 장치는 대기 중에도 열려 있음)
+            self.cam_thread = self._acquire_preview(active=True)
+            self._configure_live_view()
+            self._set_live_view_connected(True)
+            self.live_view.set_source(self.cam_thread.mailbox)
+            try:
+                self.cam_thread.frame_available.disconnect(self.live_view.on_frame_available)
+            except TypeError:
+                pass
+            self.cam_thread.mailbox.clear()  # 대기 모드에서 남은 프레임 비움 (비어 있어야 알림이 옴)
+            self.cam_thread.frame_available.connect(self.live_view.on_frame_available)
             
             # 페이지 진입 즉시 자동 촬영 시작
             QTimer.singleShot(500, self.start_shooting)
@@ -2350,16 +2282,10 @@ class KioskMain(QMainWindow):
             print("[DEBUG] 사진 선택 페이지 진입")
             print(f"[DEBUG] session_data: {self.session_data}")
             
-            # 카메라 스레드 확인 및 종료
+            # 카메라 프리뷰 대기 모드로
             if self.cam_thread:
-                print("[DEBUG] 잔여 카메라 스레드 발견 - 종료")
-                try:
-                    self.cam_thread.change_pixmap_signal.disconnect()
-                except:
-                    pass
-                self.cam_thread.stop()
-                self.cam_thread.wait(1000)
-                self.cam_thread = None
+                print("[DEBUG] 잔여 카메라 프리뷰 발견 - 대기 모드")
+                self._release_preview()
             
             # 🔥 페이지를 매번 재생성 (session_data 반영)
             old_widget = self.stack.widget(4)
@@ -2381,34 +2307,19 @@ class KioskMain(QMainWindow):
         elif idx==5: 
             # 🔥 좌우반전 상태 초기화 (ON으로 시작)
             self.is_mirrored = True
-            
-            # 원본 프레임 합성
-            sp = [self.captured_files[i] for i in self.selected_indices if i is not None]
-            fp = self.session_data.get('frame_path')
-            l_key = self.session_data.get('layout_key')
-            fk = f"{self.session_data['paper_type']}_{l_key}"
-            
-            # 🔥 초기에 좌우반전 적용된 상태로 합성
-            mirrored_photos = []
-            for photo_path in sp:
-                img = QPixmap(photo_path)
-                img = img.toImage().mirrored(True, False)
-                img = QPixmap.fromImage(img)
-                temp_path = photo_path.replace('.jpg', '_temp_mirror.jpg')
-                img.save(temp_path)
-                mirrored_photos.append(temp_path)
-            
-            self.final_image_path = merge_4cut_vertical(mirrored_photos, fp, fk)
-            self.final_print_path = self.final_image_path
             self.current_filter_mode = "original"
             
-            self.result_label.setPixmap(QPixmap(self.final_image_path).scaled(
-                self.s(600), self.s(600), 
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            ))
+            if not getattr(self, 'preview_compositor', None):
+                sp = [self.captured_files[i] for i in self.selected_indices if i is not None]
+                fk = f"{self.session_data['paper_type']}_{self.session_data.get('layout_key')}"
+                self._create_compositors(sp, self.session_data.get('frame_path'), fk)
+            
+            # 🔥 초기에 좌우반전 적용된 상태로 미리보기 합성
+            self.preview_compositor.set_mirror(True)
+            self.preview_compositor.set_filter("original")
+            self._update_filter_result()
         elif idx==6:
-            if hasattr(self, 'final_print_path') and os.path.exists(self.final_print_path):
+            if getattr(self, 'final_print_path', None) and os.path.exists(self.final_print_path):
                 pix = QPixmap(self.final_print_path); self.lbl_print_preview.setPixmap(pix.scaled(self.lbl_print_preview.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
         self.timer.stop()
         t = 0
@@ -2439,10 +2350,9 @@ class KioskMain(QMainWindow):
             self.shoot_timer.stop()
             self.shoot_timer = None
 
-        # 카메라 스레드도 종료(프리뷰만 쓰는 구조로 갈 때)
+        # 카메라 프리뷰는 대기 모드로
         if hasattr(self, "cam_thread") and self.cam_thread:
-            self.cam_thread.stop()
-            self.cam_thread = None
+            self._release_preview()
 
         self.saved_photos = [photo_path]
         self.show_page(4)
@@ -2465,8 +2375,7 @@ class KioskMain(QMainWindow):
             self.shoot_timer = None
 
         if hasattr(self, "cam_thread") and self.cam_thread:
-            self.cam_thread.stop()
-            self.cam_thread = None
+            self._release_preview()
 
         # ✅ 핵심: 선택 페이지가 쓰는 리스트를 테더 결과로 갱신
         self.captured_files = list(photo_paths)
@@ -2476,99 +2385,81 @@ class KioskMain(QMainWindow):
 
     # 🔥 여기에 추가!
     def run_external_camera_manager(self):
-        import subprocess
-        import json
-        
-        result_path = 'camera_result.json'
-        if os.path.exists(result_path):
-            os.remove(result_path)
-        
-        python_exe = sys.executable
-        script_path = os.path.join(self.base_path, 'camera_manager.py')
-        
-        print(f"[외부 촬영] {script_path} 실행 중...")
-        
-        try:
-            process = subprocess.Popen(
-                [python_exe, script_path, '--standalone'],
-                cwd=self.base_path
-            )
-            
-            # self.hide() 제거 - 두 창이 동시에 보임
-            self.wait_for_camera_result(process, result_path)
-            
-        except Exception as e:
-            print(f"[외부 촬영] 오류: {e}")
-            QMessageBox.critical(self, "촬영 오류", f"촬영 프로그램 실행 실패:\n{e}")
-            # self.show() 제거 - hide() 안 했으므로 불필요
+        """상주 촬영 서버(capture_server.py)로 촬영 - 컷마다 키오스크가 셔터를 요청하고 결과를 바로 받음"""
+        from capture_client import CaptureClient
+
+        backend = self.admin_settings.get('shutter_backend', 'eos')
+        if self.capture_client is None:
+            self.capture_client = CaptureClient(self.base_path, shutter_backend=backend)
+            self.capture_client.shot_ready.connect(self._on_external_shot)
+            self.capture_client.shot_failed.connect(self._on_external_failed)
+            self.capture_client.session_done.connect(self._on_external_done)
+            self.capture_client.connection_lost.connect(self._on_external_lost)
+            QApplication.instance().aboutToQuit.connect(self.capture_client.shutdown)
+            self.capture_client.start()
+        elif self.capture_client.shutter_backend != backend:
+            # 관리자 설정에서 백엔드가 바뀌었으면 떠 있는 서버에도 반영
+            self.capture_client.configure(backend)
+
+        self.captured_files = []
+        self.external_session_active = True
+        self.external_total = self.admin_settings.get('total_shoot_count', 8)
+        self.external_attempts = 0
+        print(f"[외부 촬영] 촬영 서버에 {self.external_total}컷 세션 요청")
+        self.capture_client.start_session(total=self.external_total)
+        self._schedule_external_shot(1)
+
+    def _schedule_external_shot(self, shot_idx):
+        """촬영 타이머(shot_countdown) 뒤에 shot_idx 컷 셔터 요청 (실패 컷 재시도 포함 total*2 회까지)"""
+        if self.external_attempts >= self.external_total * 2:
+            print("[외부 촬영] ❌ 재시도 한도 초과 - 세션 중단")
+            self.capture_client.cancel()
+            return
+        self.external_attempts += 1
+        delay_ms = int(self.admin_settings.get('shot_countdown', 3) * 1000)
+
+        def shoot():
+            if self.external_session_active and self.capture_client is not None:
+                print(f"[외부 촬영] {shot_idx}컷 셔터 요청")
+                self.capture_client.shoot(shot_idx)
+        QTimer.singleShot(delay_ms, shoot)
+
+    def _on_external_shot(self, path, shot_idx, latency_ms):
+        self.captured_files.append(path)
+        print(f"[외부 촬영] {shot_idx}컷 수신 ({latency_ms:.0f}ms): {path}")
+        if shot_idx < self.external_total:
+            self._schedule_external_shot(shot_idx + 1)
+
+    def _on_external_failed(self, shot_idx, reason):
+        print(f"[외부 촬영] ❌ {shot_idx}컷 실패: {reason}")
+        if self.external_session_active:
+            self._schedule_external_shot(shot_idx)
+
+    def _on_external_done(self, files, cancelled):
+        self.external_session_active = False
+        self.captured_files = list(files)
+        print(f"[외부 촬영] ✅ 세션 완료: {len(files)}개 파일 (중단: {cancelled})")
+        if files:
+            self.show_page(4)
+        else:
+            QMessageBox.warning(self, "촬영 실패", "촬영이 완료되지 않았습니다.")
             self.show_page(0)
 
-    def wait_for_camera_result(self, process, result_path):
-        import json
-        import os  # 🔥 여기로 올리기
-        
-        check_timer = QTimer(self)
-        check_count = 0
-        max_checks = 300
-        
-        def check_result():
-            nonlocal check_count
-            check_count += 1
-            
-            # 🔥 디버깅: 주기적 상태 출력
-            if check_count % 10 == 0:
-                print(f"[대기] {check_count}초 경과, 프로세스 상태: {process.poll()}")
-            
-            if process.poll() is not None:
-                check_timer.stop()
-                print(f"[외부 촬영] 프로세스 종료 감지!")
-                
-                if os.path.exists(result_path):
-                    print(f"[외부 촬영] 결과 파일 발견: {result_path}")
-                    try:
-                        with open(result_path, 'r', encoding='utf-8') as f:
-                            result = json.load(f)
-                        
-                        print(f"[외부 촬영] JSON 로드 성공: {result}")
-                        
-                        if result.get('success'):
-                            self.captured_files = result['files']
-                            print(f"[외부 촬영] ✅ 성공: {len(self.captured_files)}개 파일")
-                            print(f"[외부 촬영] 파일 목록: {self.captured_files}")
-                            
-                            # 🔥 페이지 전환
-                            print(f"[외부 촬영] 사진 선택 페이지(4)로 이동 중...")
-                            self.show_page(4)
-                            print(f"[외부 촬영] 페이지 전환 완료!")
-                        else:
-                            print(f"[외부 촬영] ❌ result.success = False")
-                            QMessageBox.warning(self, "촬영 실패", "촬영이 완료되지 않았습니다.")
-                            self.show_page(0)
-                    
-                    except Exception as e:
-                        print(f"[외부 촬영] ❌ JSON 로드 오류: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        self.show_page(0)
-                else:
-                    print(f"[외부 촬영] ❌ 결과 파일 없음: {result_path}")
-                    # 🔥 파일 존재 여부 재확인
-                    print(f"[외부 촬영] 현재 디렉토리 파일 목록:")
-                    for f in os.listdir('.'):
-                        if 'camera' in f.lower() or 'result' in f.lower():
-                            print(f"  - {f}")
-                    self.show_page(0)
-            
-            elif check_count >= max_checks:
-                check_timer.stop()
-                process.terminate()
-                print(f"[외부 촬영] ❌ 타임아웃 (5분)")
-                QMessageBox.warning(self, "촬영 시간 초과", "촬영 시간이 초과되었습니다.")
-                self.show_page(0)
-        
-        check_timer.timeout.connect(check_result)
-        check_timer.start(1000)
-        print(f"[외부 촬영] 결과 대기 시작 (타이머 1초)")
+    def _on_external_lost(self, files):
+        """서버 연결 끊김 - 저널에서 복구한 컷이 있으면 그것으로 진행"""
+        self.capture_client = None
+        if not self.external_session_active:
+            # 손님 사이에 서버가 종료됨 - 다음 촬영 때 다시 실행
+            print("[외부 촬영] 촬영 서버 연결 끊김 (진행 중인 세션 없음)")
+            return
+        self.external_session_active = False
+        if files:
+            print(f"[외부 촬영] ⚠️ 서버 중단 - 저널에서 {len(files)}컷 복구")
+            self.captured_files = list(files)
+            self.show_page(4)
+        else:
+            QMessageBox.critical(self, "촬영 오류", "촬영 서버에 연결할 수 없습니다.")
+            self.show_page(0)
     
     # -----------------------------------------------------------
     # [Shooting Logic] - 구현 완료된 촬영 로직
@@ -2580,9 +2471,16 @@ class KioskMain(QMainWindow):
         # 변수 초기화
         self.current_shot_idx = 1
         self.captured_files = []
+        photo_cache.clear()  # 새 세션: 이전 손님 사진 디코딩 캐시 비우기
+        self.preview_compositor = None
         self.total_shots = self.admin_settings.get('total_shoot_count', 8)
         self.current_countdown_display = 0
         
+        # 테더링 수신 서비스 미리 시작 (첫 셔터 전에 감시 준비) + 촬영 세션 폴더 생성
+        from tether_service import get_ingest
+        get_ingest()
+        self.capture_worker.start_session()
+        
         # 미리보기창 동적 생성
         # 기존 위젯 제거
         for lbl in self.left_previews + self.right_previews:
@@ -2591,15 +2489,11 @@ class KioskMain(QMainWindow):
         self.right_previews.clear()
         
         # 🔥 프레임 구멍 비율 계산
-        paper = self.session_data.get('paper_type', 'full')
-        layout = self.session_data.get('layout_key', 'v2')
-        key = f"{paper}_{layout}"
-        layout_list = FRAME_LAYOUTS.get(key, [])
+        geom = self.current_layout()
         
-        if layout_list:
-            first_slot = layout_list[0]
-            hole_ratio = first_slot['w'] / first_slot['h']
-            print(f"[DEBUG] 프레임 구멍 비율: {hole_ratio:.3f} ({first_slot['w']}x{first_slot['h']})")
+        if geom and geom.slots:
+            hole_ratio = geom.hole_ratio
+            print(f"[DEBUG] 프레임 구멍 비율: {hole_ratio:.3f} ({geom.slots[0]['w']}x{geom.slots[0]['h']})")
         else:
             hole_ratio = 3 / 4  # 기본 비율
             print(f"[DEBUG] 기본 비율 사용: {hole_ratio:.3f}")
@@ -2695,6 +2589,7 @@ class KioskMain(QMainWindow):
         # 목표 컷수를 다 채웠으면 선택 페이지로 이동
         if self.current_shot_idx > self.total_shots:
             print("[DEBUG] 촬영 완료 - 정리 시작")
+            capture_metrics.end_session()  # 구간별 p50/p95/p99 요약 기록
             
             # 🔥 1. 타이머 정리
             if hasattr(self, 'shooting_timer') and self.shooting_timer:
@@ -2702,15 +2597,10 @@ class KioskMain(QMainWindow):
                 self.shooting_timer.deleteLater()
                 self.shooting_timer = None
             
-            # 🔥 2. 카메라 스레드 완전 종료
+            # 🔥 2. 카메라 프리뷰 대기 모드 (장치는 다음 세션을 위해 열어 둠)
             if self.cam_thread:
-                print("[DEBUG] 카메라 스레드 종료 중...")
-                self.cam_thread.change_pixmap_signal.disconnect()  # 시그널 연결 해제
-                self.cam_thread.stop()
-                self.cam_thread.wait(2000)  # 최대 2초 대기
-                self.cam_thread.deleteLater()
-                self.cam_thread = None
-                print("[DEBUG] 카메라 스레드 종료 완료")
+                self._release_preview()
+                print("[DEBUG] 카메라 프리뷰 대기 모드 전환")
             
             # 🔥 3. 비디오 라벨 정리
             if hasattr(self, 'video_label'):
@@ -2730,6 +2620,9 @@ class KioskMain(QMainWindow):
         if hasattr(self, 'lbl_shot_count'):
             self.lbl_shot_count.setText(f"{self.current_shot_idx}/{self.total_shots}")
         
+        # 라이브뷰 워커에 현재 컷 슬롯 반영
+        self._configure_live_view()
+        
         # 카운트다운 타이머 생성 및 시작
         self.shooting_timer = QTimer(self)
         self.shooting_timer.timeout.connect(self.process_countdown)
@@ -2742,16 +2635,23 @@ class KioskMain(QMainWindow):
         """관리자 페이지에서 카메라 연결 테스트"""
         camera_index = self.admin_settings.get('camera_index', 0)
         
+        # 상주 프리뷰가 장치를 열고 있으면 DirectShow 가 두 번째 열기를 거부하므로
+        # 테스트 동안 닫았다가 끝나면 대기 모드로 다시 연다 (새 스레드가 갱신된 모드를 읽음)
+        health = dict(self.camera_health) if self.camera_health else None
+        self.preview.stop()
+        self.cam_thread = None
+        try:
+            self._run_camera_test(camera_index, health)
+        finally:
+            self._acquire_preview(active=False)
+
+    def _run_camera_test(self, camera_index, health):
+        """카메라 연결 테스트 본체 (프리뷰가 닫힌 상태에서 호출)"""
         import cv2
-        import platform
+        from camera_caps import open_capture, get_camera_caps, pick_mode
         
         # 플랫폼별 백엔드로 카메라 열기
-        if platform.system() == 'Darwin':  # macOS
-            cap = cv2.VideoCapture(camera_index, cv2.CAP_AVFOUNDATION)
-        elif platform.system() == 'Windows':
-            cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-        else:
-            cap = cv2.VideoCapture(camera_index)
+        cap = open_capture(camera_index)
         
         if cap.isOpened():
             width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -2767,6 +2667,18 @@ class KioskMain(QMainWindow):
             msg += f"FPS: {fps:.1f}\n"
             msg += f"Backend: {backend}\n"
             msg += f"프레임 읽기: {'성공' if ret else '실패'}"
+            cap.release()
+            
+            # 지원 모드 재탐색 후 캐시 갱신 (해상도/FOURCC/실측 FPS)
+            modes = get_camera_caps(camera_index, refresh=True)
+            if modes:
+                msg += "\n\n지원 모드 (실측):\n"
+                msg += "\n".join(f"{m['width']}x{m['height']} {m['fourcc']} {m['fps']}fps" for m in modes)
+                best = pick_mode(modes, self.admin_settings.get('camera_width', 1920), self.admin_settings.get('camera_height', 1080))
+                msg += f"\n\n프리뷰 선택 모드: {best['width']}x{best['height']} {best['fourcc']}"
+            if health:
+                msg += (f"\n\n프리뷰 상태: 재연결 {health['reconnects']}회 / 예비 전환 {health['failovers']}회 / "
+                        f"최대 복구 {health['max_recovery_ms']:.0f}ms")
             
             QMessageBox.information(
                 self,
@@ -2774,7 +2686,6 @@ class KioskMain(QMainWindow):
                 msg,
                 QMessageBox.StandardButton.Ok
             )
-            cap.release()
         else:
             msg = f"❌ 카메라 #{camera_index} 연결 실패!\n\n"
             msg += "해결방법:\n"
@@ -2793,6 +2704,9 @@ class KioskMain(QMainWindow):
     def on_camera_error(self, error_message):
         """카메라 오류 발생 시 처리 (선택사항)"""
         print(f"[CAMERA ERROR] {error_message}")
+        if self.stack.currentIndex() != 3:
+            # 대기 중 프리뷰 오류 - 다음 촬영 페이지 진입 시 다시 연다
+            return
         
         QMessageBox.critical(
             self,
@@ -2804,6 +2718,15 @@ class KioskMain(QMainWindow):
         # 메인 화면으로 복귀
         self.show_page(0)
 
+    def on_camera_health(self, health):
+        """캡처보드 상태 갱신 (복구 중에도 마지막 프레임은 화면에 그대로 둠)"""
+        previous = self.camera_health.get('state') if self.camera_health else None
+        self.camera_health = health
+        if health.get('state') != previous:
+            print(f"[Camera] 상태 {previous} → {health.get('state')} "
+                  f"(#{health.get('index')}, 재연결 {health.get('reconnects')}회, "
+                  f"최근 복구 {health.get('last_recovery_ms')}ms)")
+
 
     def process_countdown(self):
         """1초마다 호출: 숫자 감소 -> 촬영"""
@@ -2822,65 +2745,39 @@ class KioskMain(QMainWindow):
             self.countdown_val -= 1
 
     def take_photo(self):
-        """EOS Utility 셔터 트리거 → tether_service 파일 감지 → 저장"""
-        import threading, shutil
-        from shutter_trigger import EOSRemoteShutter
-        from tether_service import capture_one_photo_blocking
-
-        def _fallback():
-            """EOS 실패 시 캡처보드 프레임으로 대체 저장"""
-            if hasattr(self, 'current_frame_data') and self.current_frame_data:
-                save_dir = os.path.join("data", "original")
-                os.makedirs(save_dir, exist_ok=True)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filepath = os.path.join(save_dir, f"shot_{timestamp}_{self.current_shot_idx}.jpg")
-                self.current_frame_data.save(filepath, quality=95)
-                print(f"[Save] 폴백(캡처보드): {filepath}")
-                self._photo_ready_signal.emit(filepath) 
-
-        def _shoot():
-            # 0. 셔터 전 스냅샷 미리 찍기
-            from pathlib import Path
-            watch_dir = Path("incoming_photos")
-            pre_snapshot = {f.name for f in watch_dir.iterdir() if f.is_file()} if watch_dir.exists() else set()
-            print(f"[take_photo] 사전 스냅샷: {len(pre_snapshot)}개")
-
-            # 1. EOS 셔터 트리거
-            shutter = EOSRemoteShutter()
-            if not shutter.trigger(wait_after=0.3):
-                print("⚠️ EOS 셔터 실패 - 폴백")
-                _fallback()
-                return
-
-            # 2. EOS가 저장한 파일 감지 (최대 10초)
-            result = capture_one_photo_blocking(capture_window_sec=10, pre_snapshot=pre_snapshot)
-            if result is None:
-                print("⚠️ EOS 파일 감지 실패 - 폴백")
-                _fallback()
-                return
-
-            # 3. data/original 로 복사
+        """EOS Utility 셔터 트리거 → tether_service 파일 감지 → 저장 (상주 촬영 워커)"""
+        self.capture_worker.shoot(self.current_shot_idx)
+
+    def _on_shot_ready(self, filepath, shot_idx, latency_ms):
+        """촬영 워커 완료 (메인 스레드)"""
+        print(f"[Save] EOS 고화질: {filepath} (셔터→파일 {latency_ms:.0f}ms)")
+        self._photo_ready_signal.emit(filepath)
+
+    def _on_shot_failed(self, shot_idx, reason):
+        """EOS 실패 시 캡처보드 프레임으로 대체 저장 (메인 스레드)"""
+        print(f"⚠️ {reason} - 폴백")
+        # 라이브뷰 프레임은 표시 크기로 축소돼 있으므로 원본 해상도 프레임 우선
+        full = self.cam_thread.grab_full_frame() if self.cam_thread else None
+        if full is not None:
+            if self.admin_settings.get('mirror_mode'):
+                full = full.mirrored(True, False)
+            self.current_frame_data = full
+        if hasattr(self, 'current_frame_data') and self.current_frame_data:
             save_dir = os.path.join("data", "original")
             os.makedirs(save_dir, exist_ok=True)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filepath = os.path.join(save_dir, f"shot_{timestamp}_{self.current_shot_idx}.jpg")
-            shutil.copy2(str(result), filepath)
-            print(f"[Save] EOS 고화질: {filepath}")
+            filepath = os.path.join(save_dir, f"shot_{timestamp}_{shot_idx}.jpg")
+            self.current_frame_data.save(filepath, quality=95)
+            print(f"[Save] 폴백(캡처보드): {filepath}")
             self._photo_ready_signal.emit(filepath)
 
-        threading.Thread(target=_shoot, daemon=True).start()
-
     def _on_photo_saved(self, filepath):
         """파일 저장 완료 후 미리보기 업데이트 및 다음 컷 진행 (메인 스레드)"""
         self.captured_files.append(filepath)
 
-        # 현재 컷의 프레임 구멍 비율 가져오기
-        paper = self.session_data.get('paper_type', 'full')
-        layout = self.session_data.get('layout_key', 'v2')
-        key = f"{paper}_{layout}"
-        layout_list = FRAME_LAYOUTS.get(key, [])
-        slot_idx = (self.current_shot_idx - 1) % len(layout_list) if layout_list else 0
-        slot_info = layout_list[slot_idx] if layout_list else None
+        # 현재 컷의 프레임 구멍 비율
+        geom = self.current_layout()
+        hole_ratio = geom.ratio_for_shot(self.current_shot_idx) if geom else None
 
         # 사이드바 미리보기 업데이트
         all_previews = self.left_previews + self.right_previews
@@ -2890,21 +2787,8 @@ class KioskMain(QMainWindow):
             lbl = all_previews[preview_idx]
             pix = QPixmap(filepath)
 
-            if slot_info and not pix.isNull():
-                hole_ratio = slot_info['w'] / slot_info['h']
-                img_w, img_h = pix.width(), pix.height()
-                img_ratio = img_w / img_h
-                if img_ratio > hole_ratio:
-                    crop_h = img_h
-                    crop_w = int(crop_h * hole_ratio)
-                    crop_x = (img_w - crop_w) // 2
-                    crop_y = 0
-                else:
-                    crop_w = img_w
-                    crop_h = int(crop_w / hole_ratio)
-                    crop_x = 0
-                    crop_y = (img_h - crop_h) // 2
-                cropped_pix = pix.copy(crop_x, crop_y, crop_w, crop_h)
+            if hole_ratio and not pix.isNull():
+                cropped_pix = pix.copy(*crop_box(pix.width(), pix.height(), hole_ratio))
                 lbl.setScaledContents(False)
                 scaled = cropped_pix.scaled(lbl.width(), lbl.height(),
                     Qt.AspectRatioMode.KeepAspectRatioByExpanding,
@@ -2939,10 +2823,7 @@ class KioskMain(QMainWindow):
         if not hasattr(self, 'current_frame_data') or not self.current_frame_data:
             return
 
-        try:
-            self.cam_thread.change_pixmap_signal.disconnect(self.update_image)
-        except:
-            pass
+        self._set_live_view_connected(False)
 
         # 라이브뷰 숨김 → 배경 노출 (크기 고정 후 clear)
         vw = self.video_label.width()
@@ -3009,12 +2890,6 @@ class KioskMain(QMainWindow):
         self._update_anim_geometry()
 
     def _finish_shutter_animation(self):
-        if hasattr(self, '_anim_label') and self._anim_label:
-            try:
-                self.cam_thread.change_pixmap_signal.connect(self.update_image)
-            except:
-              pass
-        
         # 사진 저장이 이미 완료된 경우 즉시 다음 컷 진행
         self._anim_finished = True
 
@@ -3029,24 +2904,16 @@ class KioskMain(QMainWindow):
         self.video_label.setMinimumSize(0, 0)
         self.video_label.setMaximumSize(16777215, 16777215)
 
-        try:
-            self.cam_thread.change_pixmap_signal.connect(self.update_image)
-        except:
-            pass
+        self._configure_live_view()
+        self._set_live_view_connected(True)
 
     def _on_photo_saved(self, filepath):
         """파일 저장 완료 후 미리보기 업데이트 및 다음 컷 진행 (메인 스레드)"""
         self.captured_files.append(filepath)
         
-        # 🔥 3. 현재 컷의 프레임 구멍 비율 가져오기
-        paper = self.session_data.get('paper_type', 'full')
-        layout = self.session_data.get('layout_key', 'v2')
-        key = f"{paper}_{layout}"
-        layout_list = FRAME_LAYOUTS.get(key, [])
-        
-        # 현재 촬영 컷의 구멍 정보
-        slot_idx = (self.current_shot_idx - 1) % len(layout_list) if layout_list else 0
-        slot_info = layout_list[slot_idx] if layout_list else None
+        # 🔥 3. 현재 촬영 컷의 프레임 구멍 비율
+        geom = self.current_layout()
+        hole_ratio = geom.ratio_for_shot(self.current_shot_idx) if geom else None
         
         # 🔥 4. 사이드바 미리보기 업데이트 (최대 크기로)
         all_previews = self.left_previews + self.right_previews
@@ -3054,26 +2921,10 @@ class KioskMain(QMainWindow):
         
         if preview_idx < len(all_previews):
             lbl = all_previews[preview_idx]
-            pix = QPixmap(filepath)
+            pix = self.load_thumb_pixmap(filepath, lbl.width(), lbl.height())
             
-            if slot_info and not pix.isNull():
-                hole_ratio = slot_info['w'] / slot_info['h']
-                img_w = pix.width()
-                img_h = pix.height()
-                img_ratio = img_w / img_h
-                
-                if img_ratio > hole_ratio:
-                    crop_h = img_h
-                    crop_w = int(crop_h * hole_ratio)
-                    crop_x = (img_w - crop_w) // 2
-                    crop_y = 0
-                else:
-                    crop_w = img_w
-                    crop_h = int(crop_w / hole_ratio)
-                    crop_x = 0
-                    crop_y = (img_h - crop_h) // 2
-                
-                cropped_pix = pix.copy(crop_x, crop_y, crop_w, crop_h)
+            if hole_ratio and not pix.isNull():
+                cropped_pix = pix.copy(*crop_box(pix.width(), pix.height(), hole_ratio))
                 lbl.setScaledContents(False)
                 scaled = cropped_pix.scaled(
                     lbl.width(), lbl.height(),
@@ -3100,6 +2951,10 @@ class KioskMain(QMainWindow):
                 else:
                     lbl.setPixmap(scaled)
 
+        # 촬영 구간 기록: 미리보기 표시까지
+        capture_metrics.mark(self.current_shot_idx, "thumbnail_shown")
+        capture_metrics.end_shot(self.current_shot_idx)
+
         # 5. 다음 컷으로 진행 (애니메이션 완료 후)
         self.current_shot_idx += 1
         self.current_countdown_display = 0
@@ -3113,6 +2968,9 @@ class KioskMain(QMainWindow):
         _wait_for_anim_then_next()
 
 if __name__ == "__main__":
+    # 별도 프로세스 프리뷰(shm_frames)용 - exe 빌드에서도 자식 프로세스가 키오스크를 다시 띄우지 않도록
+    multiprocessing.freeze_support()
+    
     # 🔥 PyQt6용 DPI 스케일링 정책 (윈도우 대응)
     if hasattr(Qt, 'HighDpiScaleFactorRoundingPolicy'):
         QApplication.setHighDpiScaleFactorRoundingPolicy(
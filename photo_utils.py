@@ -1,7 +1,11 @@
 import os
+import numpy as np
 from PIL import Image, ImageOps, ImageFilter
 import qrcode
 from datetime import datetime
+from image_cache import photo_cache
+from frame_assets import frame_assets
+from layout_registry import canvas_size_for, get_layout
 
 # =========================================================
 # [프레임 레이아웃 좌표 설정] (Canvas: 2400 x 3600 px 기준)
@@ -128,88 +132,304 @@ FRAME_LAYOUTS = {
     ]
 }
 
-def merge_4cut_vertical(image_paths, frame_path=None, layout_key="full_4cut"):
+def load_photo(image_path):
     """
-    layout_key (예: 'full_v4a', 'half_v3')에 따라 사진을 배치하고 프레임을 합성
+    원본 사진을 디코딩해서 반환 (세션 캐시 공유)
+    반환된 이미지는 캐시와 공유되므로 직접 수정하지 말고 copy/fit 결과를 사용할 것
     """
-    # 가로형 레이아웃은 캔버스를 가로로 생성
-    horizontal_layouts = ['h2', 'h3', 'h4', 'h5', 'h10']
-    is_horizontal = any(layout_key.endswith(h) for h in horizontal_layouts)
-    
-    if is_horizontal:
-        CANVAS_W, CANVAS_H = 3600, 2400
+    def _decode():
+        img = Image.open(image_path)
+        img.load()
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        return img
+    return photo_cache.get_or_load(photo_cache.file_key("pil", image_path), _decode)
+
+def load_thumbnail(image_path, min_size):
+    """
+    미리보기/썸네일용 저해상도 디코딩
+    JPEG은 libjpeg DCT 스케일링(Image.draft)으로 1/2~1/8 크기로 바로 디코딩한다.
+    결과 이미지는 min_size(w, h)를 덮는 가장 작은 배율로 만들어진다.
+    """
+    min_w, min_h = (max(1, int(v)) for v in min_size)
+    with Image.open(image_path) as probe:   # 헤더만 읽음
+        src_w, src_h = probe.size
+
+    scale = 1
+    for s in (8, 4, 2):
+        if src_w // s >= min_w and src_h // s >= min_h:
+            scale = s
+            break
+
+    def _decode():
+        img = Image.open(image_path)
+        target = (max(1, src_w // scale), max(1, src_h // scale))
+        img.draft("RGB", target)
+        img.load()
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        # PNG 등 draft 미지원 포맷은 직접 축소
+        if img.width > target[0] * 1.5:
+            img.thumbnail(target, Image.Resampling.BILINEAR)
+        return img
+
+    return photo_cache.get_or_load(photo_cache.file_key("thumb", image_path, scale), _decode)
+
+def pil_to_qimage(img):
+    """PIL Image → QImage (데이터 복사본, 원본 수명과 무관)"""
+    from PyQt6.QtGui import QImage
+    if img.mode == "RGBA":
+        data = img.tobytes("raw", "RGBA")
+        fmt = QImage.Format.Format_RGBA8888
+        bpl = img.width * 4
     else:
-        CANVAS_W, CANVAS_H = 2400, 3600
-    
-    print(f"[photo_utils] 캔버스: {CANVAS_W}x{CANVAS_H} ({'가로형' if is_horizontal else '세로형'})")
-    canvas = Image.new("RGB", (CANVAS_W, CANVAS_H), "white")
-    
-    # 레이아웃 정보 가져오기
-    layout_data = FRAME_LAYOUTS.get(layout_key)
-    if not layout_data:
-        print(f"⚠️ 레이아웃 정보 없음 ({layout_key}). 기본 full_v4a 사용.")
-        layout_data = FRAME_LAYOUTS["full_v4a"]
-
-    # --- 1. 사진 배치 ---
-    for idx, coords in enumerate(layout_data):
-        # 슬롯 수만큼 이미지가 있으면 1:1 배치, 부족하면 반복
-        img_index = idx % len(image_paths)
-        
-        if img_index < len(image_paths):
-            img_path = image_paths[img_index]
-            x, y, w, h = coords['x'], coords['y'], coords['w'], coords['h']
-            
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        data = img.tobytes("raw", "RGB")
+        fmt = QImage.Format.Format_RGB888
+        bpl = img.width * 3
+    return QImage(data, img.width, img.height, bpl, fmt).copy()
+
+def get_canvas_size(layout_key):
+    """레이아웃 키에 맞는 캔버스 크기 (가로형 3600x2400 / 세로형 2400x3600)"""
+    return canvas_size_for(layout_key)
+
+def _rects_overlap(slots):
+    """슬롯 영역끼리 겹치는지 (겹치면 부분 갱신 불가)"""
+    for i, a in enumerate(slots):
+        for b in slots[i + 1:]:
+            if (a['x'] < b['x'] + b['w'] and b['x'] < a['x'] + a['w'] and
+                    a['y'] < b['y'] + b['h'] and b['y'] < a['y'] + a['h']):
+                return True
+    return False
+
+
+class PhotoCompositor:
+    """
+    세션 단위 증분 합성기
+
+    - 슬롯별로 fit 된 원본 타일과 합성 캔버스를 보관
+    - 사진/필터/좌우반전이 바뀌면 해당 슬롯 타일만 다시 만들고,
+      그 슬롯 영역에만 프레임을 다시 덮어씌운다
+    - 프레임 오버레이는 frame_assets 캐시에서 가져옴 (프로세스당 1회 로드)
+    - scale < 1 이면 화면 표시용 프록시 캔버스로 동작 (슬롯/프레임 축소,
+      사진은 load_thumbnail 저해상도 디코딩 사용)
+
+    사용법:
+        comp = PhotoCompositor("full_v4a", frame_path)            # 출력용
+        preview = PhotoCompositor("full_v4a", frame_path, 0.17)   # 미리보기용
+        comp.set_photos(paths)
+        comp.set_mirror(True)
+        comp.set_filter("warm")
+        path = comp.save()
+    """
+
+    def __init__(self, layout_key, frame_path=None, scale=1.0):
+        self.layout_key = layout_key
+        self.frame_path = frame_path
+        self.scale = scale
+        canvas_w, canvas_h = get_canvas_size(layout_key)
+        self.canvas_size = (max(1, round(canvas_w * scale)), max(1, round(canvas_h * scale)))
+
+        geom = get_layout(layout_key)
+        if geom is None or not geom.slots:
+            print(f"⚠️ 레이아웃 정보 없음 ({layout_key}). 기본 full_v4a 사용.")
+            geom = get_layout("full_v4a")
+        slots = geom.scaled_slots(scale)
+        self.slots = slots
+
+        self.mirror = False
+        self.filter_mode = "original"
+
+        self._paths = [None] * len(slots)
+        self._fitted = {}     # idx -> fit 된 원본 타일
+        self._tiles = {}      # idx -> ((mirror, filter), 최종 타일)
+        self._canvas = None
+        self._frame = None
+        self._frame_loaded = False
+        self._dirty = set(range(len(slots)))
+        self._overlap = _rects_overlap(slots)
+
+    # --- 상태 변경 ---
+    def set_photos(self, image_paths):
+        """슬롯 수만큼 이미지가 있으면 1:1 배치, 부족하면 반복"""
+        for idx in range(len(self.slots)):
+            path = image_paths[idx % len(image_paths)] if image_paths else None
+            if path != self._paths[idx]:
+                self._paths[idx] = path
+                self._fitted.pop(idx, None)
+                self._tiles.pop(idx, None)
+                self._dirty.add(idx)
+
+    def set_mirror(self, is_on):
+        is_on = bool(is_on)
+        if is_on != self.mirror:
+            self.mirror = is_on
+            self._dirty.update(range(len(self.slots)))
+
+    def set_filter(self, mode):
+        mode = mode or "original"
+        if mode != self.filter_mode:
+            self.filter_mode = mode
+            self._dirty.update(range(len(self.slots)))
+
+    # --- 렌더링 ---
+    def _load_frame(self):
+        if self._frame_loaded:
+            return self._frame
+        self._frame_loaded = True
+        if self.frame_path and os.path.exists(self.frame_path):
             try:
-                img = Image.open(img_path)
-                img = ImageOps.fit(img, (w, h), centering=(0.5, 0.5))
-                canvas.paste(img, (x, y))
-                
-                pass  # 하프컷도 풀컷과 동일하게 처리
-                    
+                self._frame = frame_assets.canvas_overlay(self.frame_path, self.canvas_size)
             except Exception as e:
-                print(f"이미지 배치 오류 ({img_path}): {e}")
+                print(f"프레임 합성 오류: {e}")
+        return self._frame
 
-    # --- 2. 프레임 합성 ---
-    if frame_path and os.path.exists(frame_path):
+    def _fitted_tile(self, idx):
+        if idx in self._fitted:
+            return self._fitted[idx]
+        path = self._paths[idx]
+        if path is None:
+            return None
+        coords = self.slots[idx]
+        size = (coords['w'], coords['h'])
         try:
-            frame_img = Image.open(frame_path).convert("RGBA")
-            frame_img = frame_img.resize((CANVAS_W, CANVAS_H), Image.Resampling.LANCZOS)
-            canvas.paste(frame_img, (0, 0), mask=frame_img)
+            src = load_photo(path) if self.scale >= 1.0 else load_thumbnail(path, size)
+            img = ImageOps.fit(src, size, centering=(0.5, 0.5))
         except Exception as e:
-            print(f"프레임 합성 오류: {e}")
+            print(f"이미지 배치 오류 ({path}): {e}")
+            img = None
+        self._fitted[idx] = img
+        return img
 
-    # --- 3. 저장 ---
-    save_dir = os.path.join("data", "results")
-    os.makedirs(save_dir, exist_ok=True)
-    filename = f"print_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-    full_path = os.path.join(save_dir, filename)
-    canvas.save(full_path, quality=95)
-    
-    return full_path
+    def _tile(self, idx):
+        state = (self.mirror, self.filter_mode)
+        cached = self._tiles.get(idx)
+        if cached and cached[0] == state:
+            return cached[1]
+        tile = self._fitted_tile(idx)
+        if tile is not None:
+            if self.mirror:
+                tile = ImageOps.mirror(tile)
+            tile = filter_image(tile, self.filter_mode)
+        self._tiles[idx] = (state, tile)
+        return tile
+
+    def render(self):
+        """
+        바뀐 슬롯만 다시 그린 캔버스를 반환
+        반환된 캔버스는 합성기가 계속 사용하므로 수정하지 말 것
+        """
+        frame = self._load_frame()
+        full = self._canvas is None or self._overlap
+        if full:
+            if self.scale >= 1.0:
+                print(f"[photo_utils] 캔버스: {self.canvas_size[0]}x{self.canvas_size[1]}")
+            self._canvas = Image.new("RGB", self.canvas_size, "white")
+            dirty = range(len(self.slots))
+        else:
+            dirty = sorted(self._dirty)
+
+        for idx in dirty:
+            coords = self.slots[idx]
+            box = (coords['x'], coords['y'], coords['x'] + coords['w'], coords['y'] + coords['h'])
+            tile = self._tile(idx)
+            if tile is not None:
+                self._canvas.paste(tile, box[:2])
+            elif not full:
+                self._canvas.paste((255, 255, 255), box)
+            # 부분 갱신: 해당 슬롯 영역에만 프레임 재합성
+            if frame is not None and not full:
+                frame_part = frame.crop(box)
+                self._canvas.paste(frame_part, box[:2], mask=frame_part)
+
+        if frame is not None and full:
+            self._canvas.paste(frame, (0, 0), mask=frame)
+
+        self._dirty.clear()
+        return self._canvas
+
+    def save(self, save_path=None):
+        canvas = self.render()
+        if save_path is None:
+            save_dir = os.path.join("data", "results")
+            os.makedirs(save_dir, exist_ok=True)
+            filename = f"print_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
+            save_path = os.path.join(save_dir, filename)
+        canvas.save(save_path, quality=95)
+        return save_path
+
+
+def merge_4cut_vertical(image_paths, frame_path=None, layout_key="full_4cut"):
+    """
+    layout_key (예: 'full_v4a', 'half_v3')에 따라 사진을 배치하고 프레임을 합성
+    """
+    compositor = PhotoCompositor(layout_key, frame_path)
+    compositor.set_photos(image_paths)
+    return compositor.save()
+
+# =========================================================
+# [필터 엔진] 필터별 채널 LUT(3 x 256)를 미리 계산해두고
+# 캔버스 배열에 한 번의 벡터 연산으로 적용
+# =========================================================
+def _build_filter_luts():
+    x = np.arange(256, dtype=np.float32)
+
+    def ch(scale):
+        return np.clip(x * scale, 0, 255).astype(np.uint8)
+
+    return {
+        'warm':   np.stack([ch(1.1), ch(1.0), ch(1.0)]),
+        'cool':   np.stack([ch(1.0), ch(1.0), ch(1.1)]),
+        'bright': np.stack([ch(1.2), ch(1.2), ch(1.2)]),
+        'dark':   np.stack([ch(0.8), ch(0.8), ch(0.8)]),
+    }
+
+FILTER_LUTS = _build_filter_luts()
+FILTER_MODES = ('original', 'warm', 'cool', 'bright', 'dark', 'beauty', 'gray')
+_CHANNELS = np.arange(3)
+
+def _apply_lut(img, lut):
+    arr = np.asarray(img if img.mode == 'RGB' else img.convert('RGB'))
+    # lut[c, arr[..., c]] 를 채널 전체에 한 번에 적용
+    return Image.fromarray(lut[_CHANNELS, arr], 'RGB')
+
+def filter_image(img, mode):
+    """메모리 상의 이미지에 필터 적용 (새 이미지 반환, 원본 유지)"""
+    if not mode or mode == 'original':
+        return img
+    lut = FILTER_LUTS.get(mode)
+    if lut is not None:
+        return _apply_lut(img, lut)
+    if mode == 'gray':
+        return img.convert('L').convert('RGB')
+    if mode == 'beauty':
+        return img.filter(ImageFilter.SMOOTH_MORE)
+    print(f"[photo_utils] 알 수 없는 필터: {mode}")
+    return img
 
 def apply_filter(image_path, mode):
+    """파일 기반 필터 (filter_image 래퍼). UI는 PhotoCompositor.set_filter 사용"""
     if mode == 'original': return image_path
     try:
-        img = Image.open(image_path)
-        if mode == 'gray': img = img.convert('L')
-        elif mode == 'beauty': img = img.filter(ImageFilter.SMOOTH_MORE)
-        elif mode == 'warm':
-            r, g, b = img.split(); r = r.point(lambda i: i * 1.1); img = Image.merge('RGB', (r, g, b))
-        elif mode == 'cool':
-            r, g, b = img.split(); b = b.point(lambda i: i * 1.1); img = Image.merge('RGB', (r, g, b))
-        elif mode == 'bright': img = img.point(lambda i: i * 1.2)
+        img = filter_image(Image.open(image_path), mode)
         save_path = image_path.replace(".jpg", f"_{mode}.jpg")
         img.save(save_path)
         return save_path
     except: return image_path
 
+def add_qr(img, url="https://example.com"):
+    """메모리 상의 이미지 우하단에 QR 코드 삽입 (img 직접 수정)"""
+    qr = qrcode.make(url)
+    qr_size = int(img.width * 0.08)
+    qr = qr.resize((qr_size, qr_size))
+    img.paste(qr, (img.width - qr_size - 50, img.height - qr_size - 50))
+    return img
+
 def add_qr_to_image(image_path, url="https://example.com"):
     try:
         img = Image.open(image_path)
-        qr = qrcode.make(url)
-        qr_size = int(img.width * 0.08)
-        qr = qr.resize((qr_size, qr_size))
-        img.paste(qr, (img.width - qr_size - 50, img.height - qr_size - 50))
+        add_qr(img, url)
         img.save(image_path)
     except: pass
 
@@ -226,16 +446,16 @@ def merge_half_cut(image_paths, frame_path=None, layout_key="half_v4"):
     full_img = Image.open(full_path)
     
     # 가로형 여부 판단
-    horizontal_layouts = ['h2', 'h3', 'h4', 'h5', 'h10']
-    is_horizontal = any(layout_key.endswith(h) for h in horizontal_layouts)
+    canvas_w, canvas_h = get_canvas_size(layout_key)
+    is_horizontal = canvas_w > canvas_h
     
     if is_horizontal:
         # 가로형: 상하 커팅 (3600x2400 → 3600x1200 두 장)
-        top_img = full_img.crop((0, 0, 3600, 1200))
+        top_img = full_img.crop((0, 0, canvas_w, canvas_h // 2))
         top_path = os.path.join(save_dir, f"half_top_{timestamp}.jpg")
         top_img.save(top_path, quality=95)
         
-        bottom_img = full_img.crop((0, 1200, 3600, 2400))
+        bottom_img = full_img.crop((0, canvas_h // 2, canvas_w, canvas_h))
         bottom_path = os.path.join(save_dir, f"half_bottom_{timestamp}.jpg")
         bottom_img.save(bottom_path, quality=95)
         
@@ -244,11 +464,11 @@ def merge_half_cut(image_paths, frame_path=None, layout_key="half_v4"):
         return top_path, bottom_path
     else:
         # 세로형: 좌우 커팅 (2400x3600 → 1200x3600 두 장)
-        left_img = full_img.crop((0, 0, 1200, 3600))
+        left_img = full_img.crop((0, 0, canvas_w // 2, canvas_h))
         left_path = os.path.join(save_dir, f"half_left_{timestamp}.jpg")
         left_img.save(left_path, quality=95)
         
-        right_img = full_img.crop((1200, 0, 2400, 3600))
+        right_img = full_img.crop((canvas_w // 2, 0, canvas_w, canvas_h))
         right_path = os.path.join(save_dir, f"half_right_{timestamp}.jpg")
         right_img.save(right_path, quality=95)
         
@@ -0,0 +1,73 @@
+"""
+preview_service.py
+상주 캡처보드 프리뷰 (세션 사이에도 장치를 연 채로 대기)
+
+DirectShow 장치를 여는 데 1~3초가 걸리므로 촬영 페이지마다 VideoThread 를
+새로 만들지 않고, 한 번 연 스레드를 계속 쓴다. 촬영 페이지에서는 전체 속도로
+전달하고, 페이지를 떠나면 VideoThread.IDLE_FPS 대기 모드로 낮춘다.
+설정(인덱스/해상도/예비 인덱스)이 바뀌었거나 스레드가 오류로 끝난 경우에만 다시 연다.
+use_process=True 면 캡처를 별도 프로세스에서 돌리고 공유 메모리로 받는다 (shm_frames).
+
+사용법:
+    preview = PreviewService()
+    thread, created = preview.acquire(1, 1920, 1080)   # 전체 속도
+    if created:
+        thread.error_signal.connect(on_error)
+    ...
+    preview.idle()                                     # 세션 종료 → 대기 모드
+    preview.stop()                                     # 프로그램 종료
+"""
+
+from camera_thread import VideoThread
+
+
+class PreviewService:
+    """VideoThread 하나를 세션 간에 재사용"""
+
+    def __init__(self):
+        self.thread = None
+        self._config = None
+
+    def acquire(self, camera_index, width, height, failover_index=None, active=True, use_process=False):
+        """
+        프리뷰 스레드 확보 → (VideoThread, 새로 만들었는지)
+        이미 같은 설정으로 실행 중이면 전달 속도만 바꿔서 돌려준다.
+        """
+        config = (camera_index, width, height, failover_index, use_process)
+        if self.thread is not None and self._config == config and self.thread.isRunning():
+            self.thread.set_active(active)
+            print(f"[preview_service] 기존 프리뷰 재사용 ({'전체 속도' if active else '대기'})")
+            return self.thread, False
+
+        self.stop()
+        if use_process:
+            from shm_frames import ShmPreview
+            thread_class = ShmPreview
+        else:
+            thread_class = VideoThread
+        self.thread = thread_class(
+            camera_index=camera_index,
+            target_width=width,
+            target_height=height,
+            failover_index=failover_index,
+        )
+        self.thread.set_active(active)
+        self._config = config
+        self.thread.start()
+        print(f"[preview_service] 프리뷰 시작: #{camera_index} {width}x{height} "
+              f"({'전체 속도' if active else '대기'}{', 별도 프로세스' if use_process else ''})")
+        return self.thread, True
+
+    def idle(self):
+        """대기 모드로 전환 (장치는 열어 둠)"""
+        if self.thread is not None and self.thread.isRunning():
+            self.thread.set_active(False)
+
+    def stop(self):
+        """장치까지 닫기"""
+        if self.thread is None:
+            return
+        self.thread.stop()
+        self.thread.deleteLater()
+        self.thread = None
+        self._config = None
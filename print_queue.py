@@ -0,0 +1,267 @@
+"""
+print_queue.py
+비동기 출력 큐 (작업 상태 저장 + 전용 스풀 스레드)
+
+'출력하기'를 누르면 작업만 큐에 넣고 바로 다음 화면으로 넘어간다.
+렌더링 대기와 스풀링은 백그라운드에서 진행되며, 이전 고객의 작업이
+스풀링 중이어도 다음 고객이 세션을 시작할 수 있다.
+
+작업 상태: rendering → queued → spooling → done / failed
+작업 목록은 data/print_queue.json 에 저장되어, 재시작 시 대기 중이던 작업을 이어서 출력한다.
+
+사용법:
+    queue = PrintQueue(create_printer_backend())
+    queue.job_changed.connect(on_job_changed)   # (job_id, state, message)
+    queue.start()
+
+    queue.submit(printer_name, copies, render=lambda: pipeline.result_for(choice, fallback=True))
+"""
+
+import os
+import sys
+import json
+import queue
+import threading
+import uuid
+from datetime import datetime
+from PIL import Image
+from PyQt6.QtCore import QThread, pyqtSignal
+from print_service import get_printer_page_size, prepare_print_bitmap, spool_bitmap
+
+QUEUE_FILE = os.path.join("data", "print_queue.json")
+FAKE_PRINTER_DIR = os.path.join("data", "print_spool")
+
+# 파일에 남겨 둘 완료/실패 작업 수
+KEEP_FINISHED_JOBS = 50
+
+STATES = ("rendering", "queued", "spooling", "done", "failed")
+
+
+class Win32PrinterBackend:
+    """윈도우 프린터 스풀러 (win32ui)"""
+
+    name = "win32"
+
+    def page_size(self, printer_name):
+        return get_printer_page_size(printer_name)
+
+    def spool(self, printer_name, bitmap, copies, doc_name):
+        try:
+            spool_bitmap(printer_name, bitmap, copies, doc_name)
+        except ImportError as e:
+            # 작업을 실패로 남겨 화면에 오류가 보이도록
+            raise RuntimeError(f"프린터 모듈(win32ui)을 불러올 수 없습니다: {e}")
+
+
+class FolderPrinterBackend:
+    """
+    테스트용 가짜 프린터
+    스풀러 대신 비트맵을 폴더에 매수만큼 저장한다 (win32ui 없는 맥/리눅스용).
+    """
+
+    name = "folder"
+
+    def __init__(self, out_dir=FAKE_PRINTER_DIR, page_size=None):
+        self.out_dir = out_dir
+        self._page_size = page_size
+
+    def page_size(self, printer_name):
+        return self._page_size
+
+    def spool(self, printer_name, bitmap, copies, doc_name):
+        os.makedirs(self.out_dir, exist_ok=True)
+        for i in range(max(1, int(copies))):
+            path = os.path.join(self.out_dir, f"{doc_name}_{printer_name}_{i+1}.bmp")
+            bitmap.save(path)
+            print(f"[print_queue] 가짜 프린터 출력: {path}")
+
+
+def create_printer_backend(name=None):
+    """
+    'win32' / 'folder' / None(자동)
+    자동 선택 시 윈도우가 아니면 폴더 백엔드를 사용한다. 윈도우에서는 win32ui 를
+    불러올 수 없어도 폴더로 바꾸지 않는다 (출력 안 된 작업이 완료로 표시되지 않도록
+    작업을 실패로 남김).
+    """
+    if name == "folder":
+        return FolderPrinterBackend()
+    if name == "win32":
+        return Win32PrinterBackend()
+    if sys.platform != "win32":
+        print("[print_queue] 윈도우가 아님 → 폴더 프린터 백엔드 사용")
+        return FolderPrinterBackend()
+    try:
+        import win32ui  # noqa: F401
+    except ImportError as e:
+        print(f"[print_queue] ❌ win32ui 불러오기 실패 ({e}) - 출력 작업은 실패로 표시됩니다")
+    return Win32PrinterBackend()
+
+
+class PrintQueue(QThread):
+    """
+    출력 작업 큐
+
+    스풀링은 이 스레드에서 순서대로 처리하고, 렌더링 대기(render 콜백)는
+    작업마다 보조 스레드에서 처리한다. 출력용 합성기는 세션마다 교체되므로
+    렌더링 결과는 제출 직후에 확보해 둔다.
+    """
+
+    job_changed = pyqtSignal(str, str, str)   # job_id, state, message
+
+    def __init__(self, backend=None, queue_file=QUEUE_FILE, parent=None):
+        super().__init__(parent)
+        self.backend = backend or create_printer_backend()
+        self.queue_file = queue_file
+        self._lock = threading.Lock()
+        self._jobs = []              # 저장되는 작업 정보 (dict)
+        self._bitmaps = {}           # job_id -> 프린터용 비트맵 (메모리 전용)
+        self._spool_q = queue.Queue()
+        self._running = True
+        self._load()
+
+    # --- 저장/복구 ---
+    def _load(self):
+        if not os.path.exists(self.queue_file):
+            return
+        try:
+            with open(self.queue_file, "r", encoding="utf-8") as f:
+                self._jobs = json.load(f)
+        except Exception as e:
+            print(f"[print_queue] 작업 목록 로드 실패: {e}")
+            self._jobs = []
+            return
+
+        for job in self._jobs:
+            if job["state"] == "rendering":
+                # 렌더링 결과가 없으므로 복구 불가
+                job["state"] = "failed"
+                job["error"] = "렌더링 중 종료됨"
+            elif job["state"] == "spooling":
+                # 일부 매수가 이미 출력됐을 수 있어 중복 출력 방지
+                job["state"] = "failed"
+                job["error"] = "스풀링 중 종료됨"
+            elif job["state"] == "queued":
+                print(f"[print_queue] 대기 작업 복구: {job['id']}")
+                self._spool_q.put(job["id"])
+        self._save()
+
+    def _save(self):
+        with self._lock:
+            active = [j for j in self._jobs if j["state"] not in ("done", "failed")]
+            finished = [j for j in self._jobs if j["state"] in ("done", "failed")]
+            self._jobs = finished[-KEEP_FINISHED_JOBS:] + active
+            data = [dict(j) for j in self._jobs]
+        try:
+            os.makedirs(os.path.dirname(self.queue_file) or ".", exist_ok=True)
+            tmp = self.queue_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.queue_file)
+        except Exception as e:
+            print(f"[print_queue] 작업 목록 저장 실패: {e}")
+
+    def _find(self, job_id):
+        with self._lock:
+            for job in self._jobs:
+                if job["id"] == job_id:
+                    return job
+        return None
+
+    def _set_state(self, job_id, state, message=""):
+        job = self._find(job_id)
+        if job is None:
+            return
+        with self._lock:
+            job["state"] = state
+            job["updated"] = datetime.now().isoformat(timespec="seconds")
+            if state == "failed":
+                job["error"] = message
+        self._save()
+        print(f"[print_queue] {job_id}: {state} {message}".rstrip())
+        self.job_changed.emit(job_id, state, message)
+
+    # --- GUI 스레드 API ---
+    def submit(self, printer_name, copies, render):
+        """
+        출력 작업 등록 후 job_id 반환 (즉시 리턴)
+        render() 는 {'path', 'bitmap', 'page_size'} 또는 None 을 반환해야 한다.
+        """
+        job_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        job = {
+            "id": job_id,
+            "printer": printer_name,
+            "copies": int(copies),
+            "path": None,
+            "state": "rendering",
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "updated": None,
+            "error": "",
+        }
+        with self._lock:
+            self._jobs.append(job)
+        self._save()
+        self.job_changed.emit(job_id, "rendering", "")
+
+        threading.Thread(target=self._render_job, args=(job_id, render), daemon=True).start()
+        return job_id
+
+    def jobs(self):
+        """작업 목록 사본 (관리자 화면/디버그용)"""
+        with self._lock:
+            return [dict(j) for j in self._jobs]
+
+    def pending_count(self):
+        with self._lock:
+            return sum(1 for j in self._jobs if j["state"] not in ("done", "failed"))
+
+    def stop(self):
+        self._running = False
+        self._spool_q.put(None)
+        self.wait(3000)
+
+    # --- 렌더링 (보조 스레드) ---
+    def _render_job(self, job_id, render):
+        try:
+            result = render()
+        except Exception as e:
+            result = None
+            print(f"[print_queue] 렌더링 오류: {e}")
+        if result is None:
+            self._set_state(job_id, "failed", "출력 이미지 렌더링 실패")
+            return
+
+        job = self._find(job_id)
+        with self._lock:
+            job["path"] = result["path"]
+            self._bitmaps[job_id] = (result["bitmap"], result.get("page_size"))
+        self._set_state(job_id, "queued")
+        self._spool_q.put(job_id)
+
+    # --- 스풀링 (워커 스레드) ---
+    def _bitmap_for(self, job):
+        """렌더링된 비트맵 (재시작 후 복구된 작업은 저장된 JPEG 에서 다시 생성)"""
+        with self._lock:
+            cached = self._bitmaps.pop(job["id"], None)
+        page_size = self.backend.page_size(job["printer"])
+        if cached is not None and cached[1] == page_size:
+            return cached[0]
+        with Image.open(job["path"]) as img:
+            return prepare_print_bitmap(img.convert("RGB"), page_size)
+
+    def run(self):
+        while self._running:
+            job_id = self._spool_q.get()
+            if job_id is None or not self._running:
+                break
+            job = self._find(job_id)
+            if job is None or job["state"] != "queued":
+                continue
+
+            self._set_state(job_id, "spooling")
+            try:
+                bitmap = self._bitmap_for(job)
+                self.backend.spool(job["printer"], bitmap, job["copies"], f"Kiosk_{job_id}")
+            except Exception as e:
+                self._set_state(job_id, "failed", str(e))
+                continue
+            self._set_state(job_id, "done", f"{job['copies']}장")
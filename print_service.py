@@ -0,0 +1,246 @@
+"""
+print_service.py
+출력 이미지 사전 렌더링 + 프린터 스풀링
+
+고객이 필터 페이지에서 옵션을 고르는 동안, 현재 선택(필터/좌우반전)에 맞는
+프린터용 비트맵(원본 해상도 합성 → QR → 회전 → 프린터 해상도 리사이즈)을
+워커 스레드에서 미리 만들어 둔다. 선택이 바뀌면 진행 중인 결과는 버리고,
+'출력하기'를 누르면 준비된 비트맵을 바로 스풀러에 넘긴다.
+
+사용법:
+    pipeline = PrintPipeline()
+    pipeline.start()
+
+    pipeline.set_session(layout_key, frame_path, photo_paths)
+    pipeline.request(choice)                 # 옵션 변경 시 (디바운스 후)
+    job = pipeline.result_for(choice)        # 출력하기 클릭 시
+    spool_bitmap(printer_name, job['bitmap'], copies)
+"""
+
+import os
+import threading
+from datetime import datetime
+from PIL import Image
+from PyQt6.QtCore import QThread, pyqtSignal
+from photo_utils import PhotoCompositor, add_qr
+
+# 프린터별 인쇄 가능 영역 캐시 (DC 생성 비용 절감)
+_page_size_cache = {}
+
+
+def get_printer_page_size(printer_name):
+    """
+    프린터 인쇄 가능 영역 (HORZRES, VERTRES)
+    win32ui 가 없는 환경(맥/리눅스)에서는 None
+    """
+    if printer_name in _page_size_cache:
+        return _page_size_cache[printer_name]
+    try:
+        import win32ui
+    except ImportError:
+        return None
+    try:
+        pdc = win32ui.CreateDC()
+        pdc.CreatePrinterDC(printer_name)
+        size = (pdc.GetDeviceCaps(110), pdc.GetDeviceCaps(111))
+        pdc.DeleteDC()
+    except Exception as e:
+        print(f"[print_service] 프린터 영역 조회 실패 ({printer_name}): {e}")
+        return None
+    _page_size_cache[printer_name] = size
+    return size
+
+
+def prepare_print_bitmap(img, page_size):
+    """가로형 이미지는 90도 회전 후 프린터 해상도로 리사이즈"""
+    if img.width > img.height:
+        img = img.rotate(90, expand=True)
+    if page_size and img.size != tuple(page_size):
+        img = img.resize(page_size, Image.Resampling.LANCZOS)
+    return img
+
+
+def spool_bitmap(printer_name, bitmap, copies=1, doc_name=None):
+    """
+    프린터용 비트맵을 한 번의 스풀 작업으로 copies 장 출력
+    DC 생성 / DIB 변환은 작업당 1회, 매수만큼 페이지만 반복한다.
+    """
+    import win32ui
+    from PIL import ImageWin
+
+    copies = max(1, int(copies))
+    if doc_name is None:
+        doc_name = f"Kiosk_{datetime.now().strftime('%H%M%S')}_x{copies}"
+
+    pdc = win32ui.CreateDC()
+    pdc.CreatePrinterDC(printer_name)
+    try:
+        pw = pdc.GetDeviceCaps(110)
+        ph = pdc.GetDeviceCaps(111)
+        print(f"[인쇄] 프린터 영역: {pw}x{ph}, 비트맵: {bitmap.width}x{bitmap.height}")
+        if bitmap.size != (pw, ph):
+            # 사전 렌더링 시점과 프린터 설정이 달라진 경우에만 다시 맞춤
+            bitmap = prepare_print_bitmap(bitmap, (pw, ph))
+        dib = ImageWin.Dib(bitmap)
+
+        pdc.StartDoc(doc_name)
+        try:
+            for i in range(copies):
+                pdc.StartPage()
+                dib.draw(pdc.GetHandleOutput(), (0, 0, pw, ph))
+                pdc.EndPage()
+                print(f"[인쇄] 페이지 {i+1}/{copies} 전송")
+        finally:
+            pdc.EndDoc()
+    finally:
+        pdc.DeleteDC()
+
+
+class PrintPipeline(QThread):
+    """
+    출력 이미지 사전 렌더링 워커 (최신 요청만 처리)
+
+    choice 는 (mirror, filter_mode, use_qr, printer_name) 튜플.
+    세션이 바뀌거나 더 새로운 choice 가 요청되면 진행 중인 렌더링 결과는 폐기된다.
+    """
+
+    rendered = pyqtSignal(object)   # 완료된 choice
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cond = threading.Condition()
+        self._running = True
+        self._generation = 0      # 세션이 바뀔 때마다 증가
+        self._compositor = None
+        self._pending = None      # (generation, choice)
+        self._current = None      # 렌더링 중인 (generation, choice)
+        self._result = None       # {'key', 'path', 'bitmap', 'page_size'}
+        self._failed = None       # 렌더링 중 예외가 난 (generation, choice)
+        self._render_lock = threading.Lock()   # 합성기는 한 번에 하나의 렌더링만
+
+    # --- GUI 스레드 API ---
+    def set_session(self, layout_key, frame_path, photo_paths):
+        """새 세션 사진으로 출력용 합성기 교체 (이전 결과 폐기)"""
+        compositor = PhotoCompositor(layout_key, frame_path)
+        compositor.set_photos(photo_paths)
+        with self._cond:
+            self._generation += 1
+            self._compositor = compositor
+            self._pending = None
+            self._result = None
+            self._failed = None
+            self._cond.notify_all()
+
+    def request(self, choice):
+        """choice 에 대한 사전 렌더링 예약 (이미 완료/진행 중이면 무시)"""
+        with self._cond:
+            key = (self._generation, choice)
+            if self._compositor is None:
+                return
+            if (self._result and self._result['key'] == key) or self._current == key:
+                return
+            if self._failed == key:
+                self._failed = None   # 다시 요청하면 재시도
+            self._pending = key
+            self._cond.notify_all()
+
+    def result_for(self, choice, timeout=60.0, fallback=False):
+        """
+        choice 에 맞는 렌더링 결과 반환 (필요하면 요청 후 완료까지 대기)
+        렌더링이 예외로 실패하면 timeout 까지 기다리지 않고 바로 돌아온다.
+        fallback=True 면 그때 호출한 스레드에서 같은 세션으로 다시 렌더링한다.
+        """
+        self.request(choice)
+        with self._cond:
+            key = (self._generation, choice)
+            self._cond.wait_for(
+                lambda: (self._result is not None and self._result['key'] == key)
+                or self._failed == key or not self._running,
+                timeout=timeout
+            )
+            if self._result is not None and self._result['key'] == key:
+                return self._result
+            if not (fallback and self._failed == key):
+                return None
+            compositor = self._compositor
+
+        print(f"[print_service] 사전 렌더링 실패 → 동기 렌더링: {choice}")
+        result = self._render(key, compositor, is_stale=lambda k: False)
+        with self._cond:
+            if key[0] == self._generation:
+                self._result = result
+                self._failed = None
+            self._cond.notify_all()
+        return result
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self.wait(3000)
+
+    # --- 워커 스레드 ---
+    def _is_stale(self, key):
+        with self._cond:
+            return not self._running or key[0] != self._generation or (
+                self._pending is not None and self._pending != key
+            )
+
+    def run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self._running)
+                if not self._running:
+                    return
+                key = self._pending
+                self._pending = None
+                self._current = key
+                compositor = self._compositor
+
+            failed = False
+            try:
+                result = self._render(key, compositor)
+            except Exception as e:
+                print(f"[print_service] 사전 렌더링 오류: {e}")
+                result = None
+                failed = True
+
+            with self._cond:
+                self._current = None
+                if result is not None and key[0] == self._generation:
+                    self._result = result
+                elif failed:
+                    self._failed = key   # 기다리는 result_for 를 바로 깨움
+                self._cond.notify_all()
+
+            if result is not None:
+                print(f"[print_service] 사전 렌더링 완료: {key[1]}")
+                self.rendered.emit(key[1])
+
+    def _render(self, key, compositor, is_stale=None):
+        with self._render_lock:
+            return self._render_locked(key, compositor, is_stale or self._is_stale)
+
+    def _render_locked(self, key, compositor, is_stale):
+        mirror, filter_mode, use_qr, printer_name = key[1]
+
+        compositor.set_mirror(mirror)
+        compositor.set_filter(filter_mode)
+        img = compositor.render().copy()
+        if is_stale(key):
+            return None
+
+        if use_qr:
+            add_qr(img)
+        save_dir = os.path.join("data", "results")
+        os.makedirs(save_dir, exist_ok=True)
+        # 선택별 파일명 분리 (폐기된 렌더링이 완료된 결과 파일을 덮어쓰지 않도록)
+        suffix = f"{filter_mode}{'_mirror' if mirror else ''}"
+        path = os.path.join(save_dir, f"print_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{suffix}.jpg")
+        img.save(path, quality=95)
+        if is_stale(key):
+            return None
+
+        page_size = get_printer_page_size(printer_name)
+        bitmap = prepare_print_bitmap(img, page_size)
+        return {'key': key, 'path': path, 'bitmap': bitmap, 'page_size': page_size}
@@ -0,0 +1,446 @@
+"""
+shm_frames.py
+별도 프로세스 캡처 + 공유 메모리 프레임 전달 (선택 모드)
+
+VideoThread 를 자식 프로세스에서 돌리고, 축소된 BGR 프레임을
+multiprocessing.shared_memory 링 버퍼(SLOTS 칸)에 시퀀스 번호와 함께 쓴다.
+키오스크 프로세스는 최신 칸을 한 번 복사해서 QImage 로 감싸 라이브뷰에 넘긴다.
+캡처보드 MJPG 디코딩이 다른 코어(다른 GIL)에서 돌므로 UI 그리기와 경쟁하지 않는다.
+
+메모리 구조:
+  제어 블록 (ShmControl, 키오스크 소유) magic, out_w, out_h, active, 프레임 링 이름
+  프레임 링 (ShmFrameRing)
+    [헤더 64B] magic, slots, max_w, max_h, latest_seq
+    [칸 0] 칸 헤더 32B (seq, w, h, 캡처 시각) + max_w*max_h*3 BGR
+    [칸 1] ...
+    [스냅샷 칸] 같은 크기, 원본 해상도 프레임 (SNAPSHOT_INTERVAL 마다, grab_full_frame 용)
+seq 번째 프레임은 seq % slots 칸에 들어간다. 쓰는 동안 칸 seq 는 0 이고,
+읽는 쪽은 복사 전후로 칸 seq 를 확인해서 복사 중에 덮어쓰인 프레임은 버린다.
+
+프레임 링 크기는 목표 해상도가 아니라 카메라가 실제로 보내는 원본 프레임 크기로 정한다.
+자식 프로세스는 원본 크기가 링과 다르면(시작 직후, 재연결 후 모드 변경) 'size' 이벤트를
+보내고 링이 올 때까지 프레임을 건너뛴다. 키오스크가 그 크기로 링을 새로 만들어 제어 블록에
+이름을 적으면 자식이 붙어서 이어 쓴다 (이전 링은 키오스크가 unlink).
+자식 프로세스의 오류/재연결/상태 시그널은 알림 파이프로 넘겨 ShmPreview 가 다시 보낸다.
+
+사용법:
+    preview = ShmPreview(camera_index=1, target_width=1920, target_height=1080)
+    live_view.set_source(preview.mailbox)
+    preview.frame_available.connect(live_view.on_frame_available)
+    preview.start()           # 자식 프로세스 + 수신 스레드
+    ...
+    preview.stop()
+"""
+
+import pickle
+import struct
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QImage
+from camera_thread import FrameMailbox
+
+MAGIC = b"PKFR"
+SLOTS = 4
+HEADER = struct.Struct("<4sIIIQ")            # magic, slots, max_w, max_h, latest_seq
+HEADER_SIZE = 64
+SLOT_HEADER = struct.Struct("<QIId")          # seq, w, h, 캡처 시각
+SLOT_HEADER_SIZE = 32
+LATEST_OFFSET = HEADER.size - 8              # latest_seq (캡처 프로세스만 씀)
+CONTROL_MAGIC = b"PKCT"
+CONTROL = struct.Struct("<4sIII64s")         # magic, out_w, out_h, active, 프레임 링 이름 (키오스크만 씀)
+
+# 자식 프로세스 제어값(표시 크기/대기 모드) 확인 간격(초)
+CONTROL_INTERVAL = 0.05
+# 원본 해상도 스냅샷 갱신 간격(초)
+SNAPSHOT_INTERVAL = 0.1
+# 스냅샷 복사 중 덮어쓰였을 때 재시도 횟수
+SNAPSHOT_RETRY = 3
+
+
+class ShmFrameRing:
+    """공유 메모리 프레임 링 (생성한 쪽이 unlink 책임)"""
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        magic, self.slots, self.max_w, self.max_h, _ = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"shm_frames: 잘못된 공유 메모리 ({shm.name})")
+        self.slot_bytes = self.max_w * self.max_h * 3
+
+    @classmethod
+    def create(cls, max_w, max_h, slots=SLOTS):
+        # 마지막 칸은 원본 해상도 스냅샷 전용
+        size = HEADER_SIZE + (slots + 1) * (SLOT_HEADER_SIZE + max_w * max_h * 3)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shm.buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+        HEADER.pack_into(shm.buf, 0, MAGIC, slots, max_w, max_h, 0)
+        for i in range(slots + 1):
+            SLOT_HEADER.pack_into(shm.buf, HEADER_SIZE + i * (SLOT_HEADER_SIZE + max_w * max_h * 3), 0, 0, 0, 0.0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _slot_offset(self, seq):
+        return HEADER_SIZE + (seq % self.slots) * (SLOT_HEADER_SIZE + self.slot_bytes)
+
+    def _snapshot_offset(self):
+        return HEADER_SIZE + self.slots * (SLOT_HEADER_SIZE + self.slot_bytes)
+
+    def matches(self, frame):
+        """원본 프레임 크기가 이 링 크기와 같은지 (표시 프레임은 원본보다 작거나 같음)"""
+        h, w = frame.shape[:2]
+        return w == self.max_w and h == self.max_h
+
+    def _write_slot(self, offset, seq, frame, captured_at):
+        h, w = frame.shape[:2]
+        SLOT_HEADER.pack_into(self.shm.buf, offset, 0, w, h, captured_at)   # 쓰는 중
+        view = np.ndarray((h, w, 3), dtype=np.uint8, buffer=self.shm.buf, offset=offset + SLOT_HEADER_SIZE)
+        np.copyto(view, frame)
+        del view
+        SLOT_HEADER.pack_into(self.shm.buf, offset, seq, w, h, captured_at)
+
+    def _copy_slot(self, offset, seq=None):
+        """칸 내용 복사 → (BGR numpy, seq, 캡처 시각), 비었거나 복사 중 덮어쓰였으면 None"""
+        slot_seq, w, h, captured_at = SLOT_HEADER.unpack_from(self.shm.buf, offset)
+        if slot_seq == 0 or (seq is not None and slot_seq != seq):
+            return None
+        view = np.ndarray((h, w, 3), dtype=np.uint8, buffer=self.shm.buf, offset=offset + SLOT_HEADER_SIZE)
+        frame = view.copy()
+        del view
+        if SLOT_HEADER.unpack_from(self.shm.buf, offset)[0] != slot_seq:
+            return None
+        return frame, slot_seq, captured_at
+
+    def latest_seq(self):
+        return struct.unpack_from("<Q", self.shm.buf, LATEST_OFFSET)[0]
+
+    # --- 쓰기 (캡처 프로세스) ---
+    def write(self, frame, captured_at):
+        seq = self.latest_seq() + 1
+        self._write_slot(self._slot_offset(seq), seq, frame, captured_at)
+        struct.pack_into("<Q", self.shm.buf, LATEST_OFFSET, seq)
+
+    def write_snapshot(self, frame, captured_at):
+        """원본 해상도 프레임을 스냅샷 칸에 기록"""
+        offset = self._snapshot_offset()
+        seq = SLOT_HEADER.unpack_from(self.shm.buf, offset)[0] + 1   # 쓰는 쪽은 1개뿐
+        self._write_slot(offset, seq, frame, captured_at)
+
+    # --- 읽기 (키오스크) ---
+    def read(self, seq):
+        """seq 번째 프레임 사본 → (QImage, 캡처 시각, numpy), 덮어쓰였으면 None"""
+        copied = self._copy_slot(self._slot_offset(seq), seq)
+        if copied is None:
+            return None
+        frame, _, captured_at = copied
+        h, w = frame.shape[:2]
+        image = QImage(frame.data, w, h, w * 3, QImage.Format.Format_BGR888)
+        return image, captured_at, frame
+
+    def read_snapshot(self):
+        """스냅샷 칸 사본 (BGR numpy, 없으면 None)"""
+        for _ in range(SNAPSHOT_RETRY):
+            copied = self._copy_slot(self._snapshot_offset())
+            if copied is not None:
+                return copied[0]
+        return None
+
+    def close(self):
+        try:
+            self.shm.close()
+        except BufferError:
+            # 아직 살아 있는 numpy 뷰가 메모리를 가리킴 - 매핑은 GC 때 해제
+            print("[shm_frames] ⚠️ 공유 메모리 참조가 남아 있음")
+        if self.owner:
+            self.shm.unlink()
+            self.owner = False
+
+
+class ShmControl:
+    """키오스크 → 캡처 프로세스 제어값 (표시 크기, 대기 모드, 현재 프레임 링 이름)"""
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self._lock = threading.Lock()   # set() 은 GUI 스레드와 수신 스레드에서 호출됨
+        if CONTROL.unpack_from(shm.buf, 0)[0] != CONTROL_MAGIC:
+            raise ValueError(f"shm_frames: 잘못된 제어 블록 ({shm.name})")
+
+    @classmethod
+    def create(cls):
+        shm = shared_memory.SharedMemory(create=True, size=CONTROL.size)
+        CONTROL.pack_into(shm.buf, 0, CONTROL_MAGIC, 0, 0, 1, b"")
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def set(self, out_size=None, active=None, ring_name=None):
+        with self._lock:
+            _, out_w, out_h, cur_active, cur_ring = CONTROL.unpack_from(self.shm.buf, 0)
+            if out_size is not None:
+                out_w, out_h = out_size
+            if active is not None:
+                cur_active = int(bool(active))
+            if ring_name is not None:
+                cur_ring = ring_name.encode()
+            CONTROL.pack_into(self.shm.buf, 0, CONTROL_MAGIC, out_w, out_h, cur_active, cur_ring)
+
+    def read(self):
+        """((out_w, out_h), active, 링 이름 또는 None)"""
+        _, out_w, out_h, active, ring = CONTROL.unpack_from(self.shm.buf, 0)
+        ring = ring.rstrip(b"\0").decode(errors="replace") or None
+        return (out_w, out_h), bool(active), ring
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            self.owner = False
+
+
+def capture_process_main(name, camera_index, target_width, target_height, max_fps,
+                         failover_index, notify, stop_event):
+    """자식 프로세스: VideoThread.run() 을 이 프로세스 메인 스레드에서 실행 (name: 제어 블록)"""
+    from camera_thread import VideoThread
+
+    control = ShmControl.attach(name)
+    ring = [None]           # 지금 쓰는 프레임 링 (캡처 스레드만 바꿈)
+    arrived = []            # watch_controls 가 새로 붙은 링을 넣어 둠
+    requested = [None]      # 마지막으로 요청한 (w, h)
+    thread = VideoThread(camera_index=camera_index, target_width=target_width,
+                         target_height=target_height, max_fps=max_fps,
+                         failover_index=failover_index)
+
+    last_snapshot = [0.0]
+
+    def post(data):
+        try:
+            notify.send_bytes(data)
+        except (OSError, EOFError):
+            thread.stop()   # 키오스크 쪽이 닫힘
+
+    def sink(frame, captured_at, full):
+        while arrived:
+            if ring[0] is not None:
+                ring[0].close()
+            ring[0] = arrived.pop(0)
+        current = ring[0]
+        if current is None or not current.matches(full):
+            # 링이 없거나 원본 크기가 바뀜 → 그 크기로 새 링 요청, 올 때까지 건너뜀
+            h, w = full.shape[:2]
+            if requested[0] != (w, h):
+                requested[0] = (w, h)
+                post(pickle.dumps(('size', (w, h))))
+            return
+        current.write(frame, captured_at)
+        if captured_at - last_snapshot[0] >= SNAPSHOT_INTERVAL:
+            current.write_snapshot(full, captured_at)
+            last_snapshot[0] = captured_at
+        post(b"")
+
+    def forward(kind):
+        # 시그널은 모두 thread.run() 안(이 프로세스 메인 스레드)에서 나오므로 직접 호출됨
+        return lambda payload: post(pickle.dumps((kind, payload)))
+
+    def watch_controls():
+        applied = None
+        attached = None
+        while not stop_event.wait(CONTROL_INTERVAL):
+            out_size, active, ring_name = control.read()
+            if (out_size, active) != applied:
+                thread.set_output_size(*out_size)
+                thread.set_active(active)
+                applied = (out_size, active)
+            if ring_name is not None and ring_name != attached:
+                try:
+                    arrived.append(ShmFrameRing.attach(ring_name))
+                    attached = ring_name
+                except (OSError, ValueError) as e:
+                    # 그사이 다시 교체됐거나 이름을 쓰는 중 - 다음 확인에서 재시도
+                    print(f"[shm_frames] 프레임 링 연결 재시도: {e}")
+        thread.stop()
+
+    out_size, active, _ = control.read()
+    thread.set_output_size(*out_size)
+    thread.set_active(active)
+    thread.frame_sink = sink
+    thread.error_signal.connect(forward('error'))
+    thread.reconnect_signal.connect(forward('reconnect'))
+    thread.health_signal.connect(forward('health'))
+    threading.Thread(target=watch_controls, name="ShmControl", daemon=True).start()
+    try:
+        thread.run()
+    finally:
+        notify.close()
+        for r in [ring[0]] + arrived:
+            if r is not None:
+                r.close()
+        control.close()
+
+
+class ShmPreview(QThread):
+    """
+    키오스크 쪽 수신 스레드 (VideoThread 와 같은 인터페이스)
+    자식 프로세스가 알려 줄 때마다 최신 seq 프레임만 복사해서 mailbox 에 넣고,
+    파이프로 넘어온 오류/재연결/상태 이벤트는 같은 이름의 시그널로 다시 보낸다.
+    프레임 링은 자식이 알려 준 원본 프레임 크기로 만들고, 크기가 바뀌면 새로 만들어 교체한다.
+    """
+
+    frame_available = pyqtSignal()
+    error_signal = pyqtSignal(str)
+    reconnect_signal = pyqtSignal(str)
+    health_signal = pyqtSignal(dict)
+
+    def __init__(self, camera_index=0, target_width=1920, target_height=1080, max_fps=30,
+                 failover_index=None):
+        super().__init__()
+        self.camera_index = camera_index
+        self.target_width = target_width
+        self.target_height = target_height
+        self.max_fps = max_fps
+        self.failover_index = failover_index
+        self.mailbox = FrameMailbox()
+        self.control = ShmControl.create()
+        self.ring = None            # 첫 'size' 이벤트 때 생성
+        self._ring_lock = threading.Lock()   # ring 교체 ↔ grab_full_frame (GUI 스레드)
+        self._last_seq = 0
+        self._process = None
+        self._stop_event = None
+        self._notify = None
+        self._child_error = False   # 자식이 error_signal 을 이미 보냈는지
+        self._run_flag = True
+
+    # --- VideoThread 호환 API ---
+    def set_output_size(self, width, height):
+        self.control.set(out_size=(max(0, int(width)), max(0, int(height))))
+
+    def set_active(self, active):
+        self.control.set(active=active)
+
+    @property
+    def active(self):
+        return self.control.read()[1]
+
+    def grab_full_frame(self):
+        """최근 원본 해상도 스냅샷 사본 (RGB QImage, 없으면 None)"""
+        with self._ring_lock:
+            frame = self.ring.read_snapshot() if self.ring is not None else None
+        if frame is None:
+            return None
+        h, w = frame.shape[:2]
+        return QImage(frame.data, w, h, w * 3, QImage.Format.Format_BGR888).convertToFormat(
+            QImage.Format.Format_RGB888)
+
+    def start(self):
+        ctx = mp.get_context("spawn")
+        receiver, sender = ctx.Pipe(duplex=False)
+        self._stop_event = ctx.Event()
+        self._process = ctx.Process(
+            target=capture_process_main,
+            args=(self.control.name, self.camera_index, self.target_width, self.target_height,
+                  self.max_fps, self.failover_index, sender, self._stop_event),
+            name="PhotoKioskCapture",
+            daemon=True,
+        )
+        self._process.start()
+        sender.close()
+        self._notify = receiver
+        print(f"[shm_frames] 캡처 프로세스 시작 (pid {self._process.pid}, {self.control.name})")
+        super().start()
+
+    def _dispatch(self, kind, payload):
+        """자식 프로세스 VideoThread 시그널 재전송"""
+        if kind == 'error':
+            self._child_error = True
+            self.error_signal.emit(payload)
+        elif kind == 'reconnect':
+            self.reconnect_signal.emit(payload)
+        elif kind == 'health':
+            self.health_signal.emit(payload)
+        elif kind == 'size':
+            self._resize_ring(*payload)
+
+    def _resize_ring(self, width, height):
+        """원본 프레임 크기에 맞는 새 링을 만들어 교체 (수신 스레드)"""
+        try:
+            ring = ShmFrameRing.create(width, height)
+        except OSError as e:
+            print(f"[shm_frames] ❌ 프레임 링 생성 실패 ({width}x{height}): {e}")
+            return
+        with self._ring_lock:
+            old, self.ring = self.ring, ring
+            self._last_seq = 0
+        self.control.set(ring_name=ring.name)
+        if old is not None:
+            old.close()
+        print(f"[shm_frames] 프레임 링 {width}x{height} ({ring.name})")
+
+    def run(self):
+        while self._run_flag:
+            fresh = False
+            try:
+                if not self._notify.poll(0.5):
+                    continue
+                # 밀린 프레임 알림은 모두 비우고 최신 프레임만 (이벤트는 하나씩 처리)
+                while self._notify.poll(0):
+                    data = self._notify.recv_bytes()
+                    if data:
+                        self._dispatch(*pickle.loads(data))
+                    else:
+                        fresh = True
+            except (EOFError, OSError):
+                if self._run_flag and not self._child_error:
+                    print("[shm_frames] ❌ 캡처 프로세스 종료됨")
+                    self.error_signal.emit("카메라 연결 실패\n캡처보드와 카메라 연결을 확인해주세요.")
+                break
+            if not fresh:
+                continue
+            ring = self.ring
+            if ring is None:
+                continue
+            seq = ring.latest_seq()
+            if seq == self._last_seq:
+                continue
+            self._last_seq = seq
+            item = ring.read(seq)
+            if item is None:
+                continue
+            if self.mailbox.put(item):
+                self.frame_available.emit()
+
+    def stop(self):
+        print("[shm_frames] 종료 요청됨")
+        self._run_flag = False
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._process is not None:
+            self._process.join(3)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        self.wait()
+        if self._notify is not None:
+            self._notify.close()
+            self._notify = None
+        self.mailbox.clear()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        self.control.close()
+        print("[shm_frames] 종료 완료")
@@ -1,27 +1,57 @@
 """
-EOS Utility 원격 촬영 자동 트리거
-Canon EOS R100 + EOS Utility 전용
+셔터 트리거 백엔드
+- eos: EOS Utility 원격 촬영 창 제어 (Canon EOS R100, 윈도우 전용)
+- gphoto2: gphoto2 CLI 로 촬영 후 incoming_photos 로 다운로드 (리눅스/맥)
+- simulated: 실제 카메라 없이 incoming_photos 에 JPEG 를 써 주는 가상 카메라 (헤드리스 테스트/벤치마크)
+
+win32gui / pyautogui 는 EOS 백엔드를 만들 때만 불러오므로 리눅스에서도 이 모듈을 import 할 수 있다.
 
 사용법:
-    from shutter_trigger import EOSRemoteShutter
+    from shutter_trigger import create_shutter
     
-    shutter = EOSRemoteShutter()
+    shutter = create_shutter("eos")          # 또는 "gphoto2", "simulated"
     if shutter.trigger():
         print("촬영 성공!")
 """
 
+import os
+import abc
 import time
-import win32gui
-import win32con
-import pyautogui
+import random
+import shutil
+import struct
+import subprocess
+import threading
+from datetime import datetime
 from typing import Optional
 
+# tether_service.WATCH_DIR 와 같은 폴더
+WATCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "incoming_photos")
+
 
-class EOSRemoteShutter:
+class ShutterBackend(abc.ABC):
+    """
+    셔터 백엔드 공통 인터페이스
+    trigger() 는 셔터만 누르고 바로 리턴한다. 결과 파일은 incoming_photos 로 들어온다.
+    """
+    
+    name = "base"
+    
+    @abc.abstractmethod
+    def trigger(self, wait_after: float = 0.5, auto_activate: bool = True) -> bool:
+        """셔터 누르기 (성공 여부)"""
+    
+    def check_connection(self) -> bool:
+        return True
+
+
+class EOSRemoteShutter(ShutterBackend):
     """
     EOS Utility 원격 촬영 창을 제어하여 자동 촬영
     """
     
+    name = "eos"
+    
     # EOS Utility 창 제목 (버전/언어에 따라 다를 수 있음)
     WINDOW_TITLES = [
         " EOS R100",          # 메인 창 (앞에 공백 있음)
@@ -31,8 +61,24 @@ class EOSRemoteShutter:
     ]
     
     def __init__(self):
+        # 윈도우 전용 모듈 (없으면 ImportError)
+        import win32gui
+        import win32con
+        import pyautogui
+        self._win32gui = win32gui
+        self._win32con = win32con
+        self._pyautogui = pyautogui
         self.last_window_handle = None
         
+    def get_window(self) -> Optional[int]:
+        """
+        캐시된 창 핸들 재사용 (창이 닫혔을 때만 다시 검색)
+        """
+        hwnd = self.last_window_handle
+        if hwnd and self._win32gui.IsWindow(hwnd) and self._win32gui.IsWindowVisible(hwnd):
+            return hwnd
+        return self.find_eos_window()
+    
     def find_eos_window(self) -> Optional[int]:
         """
         EOS Utility 관련 창 찾기
@@ -41,8 +87,8 @@ class EOSRemoteShutter:
             창 핸들 (hwnd) 또는 None
         """
         for title in self.WINDOW_TITLES:
-            hwnd = win32gui.FindWindow(None, title)
-            if hwnd and win32gui.IsWindowVisible(hwnd):
+            hwnd = self._win32gui.FindWindow(None, title)
+            if hwnd and self._win32gui.IsWindowVisible(hwnd):
                 print(f"[EOS] 창 발견: {title}")
                 self.last_window_handle = hwnd
                 return hwnd
@@ -65,12 +111,12 @@ class EOSRemoteShutter:
         """
         try:
             # 최소화된 창이면 복원
-            if win32gui.IsIconic(hwnd):
-                win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            if self._win32gui.IsIconic(hwnd):
+                self._win32gui.ShowWindow(hwnd, self._win32con.SW_RESTORE)
                 time.sleep(0.1)
             
             # 창을 맨 앞으로
-            win32gui.SetForegroundWindow(hwnd)
+            self._win32gui.SetForegroundWindow(hwnd)
             time.sleep(0.1)
             
             return True
@@ -79,10 +125,9 @@ class EOSRemoteShutter:
             return False
     
     def trigger(self, wait_after: float = 0.5, auto_activate: bool = True) -> bool:
-        if auto_activate:
-            hwnd = self.find_eos_window()
-            if hwnd is None:
-                return False
+        hwnd = self.get_window() if auto_activate else self.last_window_handle
+        if hwnd is None:
+            return False
 
         print("[EOS] 📸 셔터 트리거!")
         
@@ -92,16 +137,17 @@ class EOSRemoteShutter:
         WM_KEYUP = 0x0101
         
         try:
-            win32gui.PostMessage(hwnd, WM_KEYDOWN, VK_SPACE, 0)
+            self._win32gui.PostMessage(hwnd, WM_KEYDOWN, VK_SPACE, 0)
             time.sleep(0.05)
-            win32gui.PostMessage(hwnd, WM_KEYUP, VK_SPACE, 0)
+            self._win32gui.PostMessage(hwnd, WM_KEYUP, VK_SPACE, 0)
         except Exception as e:
             print(f"[EOS] 백그라운드 키 전송 실패: {e}")
             # 폴백: 기존 방식
             self.activate_window(hwnd)
-            pyautogui.press('space')
+            self._pyautogui.press('space')
 
-        time.sleep(wait_after)
+        if wait_after > 0:
+            time.sleep(wait_after)
         return True
     
     def check_connection(self) -> bool:
@@ -115,6 +161,155 @@ class EOSRemoteShutter:
         return hwnd is not None
 
 
+class GPhoto2Shutter(ShutterBackend):
+    """
+    gphoto2 CLI 백엔드 (USB 연결 카메라)
+    촬영 + 다운로드를 백그라운드 프로세스로 실행하고 바로 리턴한다.
+    """
+    
+    name = "gphoto2"
+    
+    def __init__(self, watch_dir: str = WATCH_DIR, binary: str = "gphoto2"):
+        self.watch_dir = watch_dir
+        self.binary = binary
+        self._proc = None
+    
+    def trigger(self, wait_after: float = 0.5, auto_activate: bool = True) -> bool:
+        if shutil.which(self.binary) is None:
+            print(f"[gphoto2] ❌ {self.binary} 실행 파일을 찾을 수 없습니다.")
+            return False
+        if self._proc is not None and self._proc.poll() is None:
+            print("[gphoto2] ⚠️ 이전 촬영이 아직 진행 중입니다.")
+            return False
+        
+        os.makedirs(self.watch_dir, exist_ok=True)
+        pattern = os.path.join(self.watch_dir, "%Y%m%d_%H%M%S_%n.%C")
+        print("[gphoto2] 📸 셔터 트리거!")
+        try:
+            self._proc = subprocess.Popen(
+                [self.binary, "--capture-image-and-download", "--force-overwrite", "--filename", pattern],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            print(f"[gphoto2] 실행 실패: {e}")
+            return False
+        
+        if wait_after > 0:
+            time.sleep(wait_after)
+        return True
+    
+    def check_connection(self) -> bool:
+        if shutil.which(self.binary) is None:
+            return False
+        try:
+            out = subprocess.run([self.binary, "--auto-detect"], capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        # 헤더 2줄 이후에 카메라 목록
+        return len(out.strip().splitlines()) > 2
+
+
+class SimulatedCamera(ShutterBackend):
+    """
+    가상 카메라
+    셔터 후 latency ± jitter 초 뒤에 실제 카메라 크기의 JPEG 를 incoming_photos 에
+    여러 조각으로 나눠 써서, 카메라 소프트웨어가 저장하는 과정을 흉내낸다.
+    인코딩은 1번만 하고, 컷마다 JPEG 주석(COM) 세그먼트에 컷 번호/시각을 넣어
+    파일 내용이 매번 다르게 한다 (같은 파일명 재사용/파일 전달 경로 확인용).
+    """
+    
+    name = "simulated"
+    
+    def __init__(self, watch_dir: str = WATCH_DIR, latency: float = 0.8, jitter: float = 0.2,
+                 size: tuple = (6000, 4000), quality: int = 90, chunks: int = 8, chunk_delay: float = 0.02):
+        self.watch_dir = watch_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.size = size
+        self.quality = quality
+        self.chunks = max(1, chunks)
+        self.chunk_delay = chunk_delay
+        self._jpeg = None
+        self._lock = threading.Lock()
+        self._count = 0
+        self.last_trigger_at = None   # time.perf_counter() 기준
+    
+    def _jpeg_bytes(self) -> bytes:
+        """노이즈가 섞인 그라데이션 JPEG (실제 사진과 비슷한 용량), 1회만 인코딩"""
+        with self._lock:
+            if self._jpeg is None:
+                import io
+                from PIL import Image
+                w, h = self.size
+                grad = Image.linear_gradient("L")
+                img = Image.merge("RGB", (
+                    grad.resize((w, h)),
+                    grad.rotate(90).resize((w, h)),
+                    Image.effect_noise((w, h), 48),
+                ))
+                buf = io.BytesIO()
+                img.save(buf, format="JPEG", quality=self.quality)
+                self._jpeg = buf.getvalue()
+            return self._jpeg
+    
+    def _shot_bytes(self, count: int) -> bytes:
+        """공통 JPEG 의 SOI 바로 뒤에 컷별 주석 세그먼트 삽입"""
+        data = self._jpeg_bytes()
+        comment = f"simulated shot {count} {datetime.now().isoformat()}".encode("ascii")
+        return data[:2] + b"\xff\xfe" + struct.pack(">H", len(comment) + 2) + comment + data[2:]
+    
+    def _write_shot(self, path: str, delay: float, count: int):
+        time.sleep(delay)
+        data = self._shot_bytes(count)
+        step = -(-len(data) // self.chunks)
+        with open(path, "wb") as f:
+            for i in range(0, len(data), step):
+                f.write(data[i:i + step])
+                f.flush()
+                if self.chunk_delay > 0:
+                    time.sleep(self.chunk_delay)
+        print(f"[simulated] 저장 완료: {path} ({len(data)} bytes)")
+    
+    def trigger(self, wait_after: float = 0.5, auto_activate: bool = True) -> bool:
+        os.makedirs(self.watch_dir, exist_ok=True)
+        with self._lock:
+            self._count += 1
+            count = self._count
+            name = f"SIM_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{count:04d}.jpg"
+        delay = max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+        self.last_trigger_at = time.perf_counter()
+        print(f"[simulated] 📸 셔터 트리거! ({delay:.2f}초 후 {name})")
+        threading.Thread(
+            target=self._write_shot, args=(os.path.join(self.watch_dir, name), delay, count), daemon=True
+        ).start()
+        
+        if wait_after > 0:
+            time.sleep(wait_after)
+        return True
+
+
+SHUTTER_BACKENDS = {
+    "eos": EOSRemoteShutter,
+    "gphoto2": GPhoto2Shutter,
+    "simulated": SimulatedCamera,
+}
+
+
+def create_shutter(name: str = "eos", **kwargs) -> ShutterBackend:
+    """
+    이름으로 셔터 백엔드 생성
+    
+    Raises:
+        ValueError: 알 수 없는 백엔드 이름
+        ImportError: eos 백엔드인데 win32 모듈이 없을 때
+    """
+    try:
+        cls = SHUTTER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 셔터 백엔드: {name} (가능: {', '.join(SHUTTER_BACKENDS)})")
+    return cls(**kwargs)
+
+
 # ============================================================
 # 테스트 코드
 # ============================================================
@@ -144,6 +339,35 @@ def test_single_shot():
         print("❌ 촬영 실패")
 
 
+def benchmark_simulated(count: int = 10):
+    """가상 카메라로 셔터→파일 완료 지연 측정 (헤드리스)"""
+    from tether_service import get_ingest
+    
+    print("\n" + "="*60)
+    print(f"가상 카메라 촬영 파이프라인 벤치마크 ({count}장)")
+    print("="*60)
+    
+    ingest = get_ingest()
+    shutter = SimulatedCamera(watch_dir=str(ingest.watch_dir))
+    latencies = []
+    
+    for i in range(count):
+        token = ingest.snapshot()
+        t0 = time.perf_counter()
+        shutter.trigger(wait_after=0)
+        files = ingest.wait_for_files(since=token, count=1, timeout=10)
+        if files:
+            latencies.append((time.perf_counter() - t0) * 1000)
+            print(f"  [{i+1}/{count}] {latencies[-1]:.0f}ms")
+        else:
+            print(f"  [{i+1}/{count}] ❌ 타임아웃")
+    
+    if latencies:
+        latencies.sort()
+        print(f"\n평균 {sum(latencies)/len(latencies):.0f}ms / 최소 {latencies[0]:.0f}ms / 최대 {latencies[-1]:.0f}ms")
+        print(f"가상 카메라 자체 지연: {shutter.latency*1000:.0f}±{shutter.jitter*1000:.0f}ms")
+
+
 def test_multiple_shots(count: int = 4):
     """연속 촬영 테스트"""
     print("\n" + "="*60)
@@ -190,8 +414,9 @@ if __name__ == "__main__":
     print("  1) 단일 촬영 테스트 (1장)")
     print("  2) 연속 촬영 테스트 (4장)")
     print("  3) 연속 촬영 테스트 (8장)")
+    print("  4) 가상 카메라 벤치마크 (10장, 카메라 불필요)")
     
-    choice = input("\n선택 (1-3): ").strip()
+    choice = input("\n선택 (1-4): ").strip()
     
     if choice == "1":
         test_single_shot()
@@ -199,5 +424,7 @@ if __name__ == "__main__":
         test_multiple_shots(4)
     elif choice == "3":
         test_multiple_shots(8)
+    elif choice == "4":
+        benchmark_simulated(10)
     else:
         print("❌ 잘못된 선택")
\ No newline at end of file
@@ -0,0 +1,364 @@
+"""
+tether_ingest.py
+테더링 폴더 수신 서비스 (파일시스템 알림 기반, 폴링 폴백)
+
+EOS Utility 등이 incoming_photos 에 저장하는 파일을 watchdog 알림(리눅스 inotify,
+윈도우 ReadDirectoryChangesW)으로 감지하고, 쓰기가 끝난 파일만 '완료' 이벤트로
+모든 소비자에게 전달한다. 폴더 전체를 주기적으로 다시 나열/정렬하지 않으므로
+셔터→미리보기 지연이 폴링 간격이나 폴더 크기에 좌우되지 않는다.
+watchdog 을 불러올 수 없으면 폴더 폴링으로 동작한다.
+
+사용법:
+    from tether_service import get_ingest
+
+    ingest = get_ingest()
+    token = ingest.snapshot()          # O(1) 기준점 (시퀀스 번호)
+    ... 셔터 ...
+    files = ingest.wait_for_files(since=token, count=1, timeout=10)
+
+    ingest.add_listener(lambda path: print("완료:", path))
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# 크기 변화가 없으면 쓰기 완료로 판단하는 시간(초)
+SETTLE_SEC = 0.3
+# 쓰기 중인 파일 크기 확인 간격(초)
+CHECK_INTERVAL = 0.05
+# watchdog 이 없을 때 폴더 폴링 간격(초)
+POLL_INTERVAL = 0.2
+# 완료 기록 보관 개수 (폴더 색인은 별도로 전체 유지)
+HISTORY_SIZE = 1000
+
+
+class TetherIngest:
+    """
+    감시 폴더의 새 파일 '완료' 이벤트 발행자
+
+    is_complete(path, size, stable_sec, closed=, write_gap=) 를 넘기면 쓰기 완료
+    판단을 바꿀 수 있다 (tether_service.is_file_complete 참고).
+    closed 는 close-write 알림 수신 여부, write_gap 은 지금까지 관측된 가장 긴 쓰기 간격(초).
+    기본값은 크기가 0보다 크고 SETTLE_SEC 동안 변하지 않았는지 확인한다.
+
+    폴더 색인은 시작 시 한 번만 나열하고 이후 알림으로만 갱신한다.
+    파일이 나타나거나 완료될 때마다 시퀀스 번호가 증가하며, snapshot() 은
+    이 번호를 기준점 토큰으로 돌려준다. 기준점 이후의 새 파일 조회는
+    기준점 이후에 완료된 파일만 훑으므로 O(새 파일 수) 이다.
+    같은 이름이라도 크기/수정시각이 바뀌면(카메라 번호 재사용 등) 새 파일로 취급한다.
+    """
+
+    def __init__(self, watch_dir, extensions=(".jpg", ".jpeg", ".png"), is_complete=None):
+        self.watch_dir = Path(os.path.abspath(watch_dir))
+        self.extensions = {e.lower() for e in extensions}
+        self.is_complete = is_complete or self._default_is_complete
+
+        self._cond = threading.Condition()
+        self._pending = {}               # name -> [size, 마지막 변화 시각, 최대 쓰기 간격, closed]
+        self._completed = OrderedDict()  # name -> Path (완료 순서)
+        self._index = {}                 # name -> [size, mtime_ns, 등장 seq, 완료 seq(쓰기 중이면 None), 등장 시각, 완료 시각]
+        self._gone_timing = OrderedDict()  # 옮겨지거나 지워진 파일의 (등장 시각, 완료 시각)
+        self._seq = 0
+        self._listeners = []
+        self._observer = None
+        self._running = False
+        self.backend = None              # 'watchdog' / 'polling'
+
+    @staticmethod
+    def _default_is_complete(path, size, stable_sec, closed=False, write_gap=0.0):
+        return size > 0 and stable_sec >= SETTLE_SEC
+
+    def _accepts(self, path):
+        p = Path(os.path.abspath(path))
+        return p.parent == self.watch_dir and p.suffix.lower() in self.extensions
+
+    # --- 시작/종료 ---
+    def start(self):
+        if self._running:
+            return self
+        self.watch_dir.mkdir(parents=True, exist_ok=True)
+        self._running = True
+
+        # 시작 시점에 이미 있는 파일은 '기존 파일'로 색인 (전체 나열은 이때 1회)
+        index = {}
+        for e in os.scandir(self.watch_dir):
+            if not self._accepts(e.path):
+                continue
+            try:
+                st = e.stat()
+            except FileNotFoundError:
+                continue
+            index[e.name] = [st.st_size, st.st_mtime_ns, 0, 0, None, None]
+        with self._cond:
+            self._index = index
+
+        try:
+            self._start_watchdog()
+            self.backend = "watchdog"
+        except Exception as e:
+            print(f"[tether_ingest] watchdog 사용 불가 ({e}) → 폴링 모드")
+            threading.Thread(target=self._poll_loop, name="TetherIngestPoll", daemon=True).start()
+            self.backend = "polling"
+
+        threading.Thread(target=self._settle_loop, name="TetherIngestSettle", daemon=True).start()
+        print(f"[tether_ingest] 감시 시작 ({self.backend}): {self.watch_dir}")
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+        with self._cond:
+            self._cond.notify_all()
+
+    def _start_watchdog(self):
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+
+        ingest = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    ingest._touch(event.src_path)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    ingest._touch(event.src_path)
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    ingest._remove(event.src_path)
+                    ingest._touch(event.dest_path)
+
+            def on_deleted(self, event):
+                if not event.is_directory:
+                    ingest._remove(event.src_path)
+
+            def on_closed(self, event):
+                # inotify IN_CLOSE_WRITE (리눅스 전용, watchdog 2.1+)
+                if not event.is_directory:
+                    ingest._closed(event.src_path)
+
+        observer = Observer()
+        observer.schedule(_Handler(), str(self.watch_dir), recursive=False)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+
+    # --- 이벤트 처리 ---
+    def _touch(self, path):
+        """생성/수정 알림 → 쓰기 완료 대기 목록에 등록"""
+        if not self._accepts(path):
+            return
+        name = Path(path).name
+        with self._cond:
+            if name in self._pending:
+                return
+            entry = self._index.get(name)
+            if entry is not None and entry[3] is not None:
+                # 이미 완료된 파일의 수정 알림: 내용이 바뀐 경우만 새 파일로 취급
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    return
+                if (st.st_size, st.st_mtime_ns) == (entry[0], entry[1]):
+                    return
+                self._completed.pop(name, None)
+            self._seq += 1
+            now = time.monotonic()
+            self._index[name] = [-1, 0, self._seq, None, now, None]
+            self._pending[name] = [-1, now, 0.0, False]
+            self._cond.notify_all()
+
+    def _closed(self, path):
+        """close-write 알림 → 다음 확인에서 바로 완료 판정"""
+        if not self._accepts(path):
+            return
+        self._touch(path)
+        with self._cond:
+            entry = self._pending.get(Path(path).name)
+            if entry is not None:
+                entry[3] = True
+            self._cond.notify_all()
+
+    def _remove(self, path):
+        name = Path(path).name
+        with self._cond:
+            entry = self._index.pop(name, None)
+            if entry is not None and entry[4] is not None:
+                # 세션 폴더로 옮긴 직후에도 timing() 으로 조회할 수 있도록
+                self._gone_timing.pop(name, None)
+                self._gone_timing[name] = (entry[4], entry[5])
+                while len(self._gone_timing) > HISTORY_SIZE:
+                    self._gone_timing.popitem(last=False)
+            self._pending.pop(name, None)
+            self._completed.pop(name, None)
+
+    def _poll_loop(self):
+        """watchdog 폴백: scandir 로 (크기, 수정 시각)을 비교 (정렬 없음)
+
+        새 이름과 사라진 이름 외에, 같은 이름으로 다시 쓰인 완료 파일도 잡는다.
+        바뀐 항목은 watchdog 수정 알림과 같은 _touch 경로로 넘긴다.
+        """
+        while self._running:
+            stats = {}
+            try:
+                for e in os.scandir(self.watch_dir):
+                    if not self._accepts(e.path):
+                        continue
+                    try:
+                        st = e.stat()
+                    except FileNotFoundError:
+                        continue
+                    stats[e.name] = (st.st_size, st.st_mtime_ns)
+            except FileNotFoundError:
+                pass
+            with self._cond:
+                known = self._index.keys()
+                added = stats.keys() - known
+                removed = known - stats.keys()
+                changed = [
+                    name for name, entry in self._index.items()
+                    if entry[3] is not None and name in stats
+                    and stats[name] != (entry[0], entry[1])
+                ]
+            for name in removed:
+                self._remove(self.watch_dir / name)
+            for name in added:
+                self._touch(self.watch_dir / name)
+            for name in changed:
+                self._touch(self.watch_dir / name)
+            time.sleep(POLL_INTERVAL)
+
+    def _settle_loop(self):
+        """쓰기 중인 파일만 크기 확인 → 완료 판정"""
+        while self._running:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or not self._running)
+                if not self._running:
+                    return
+                pending = {name: list(entry) for name, entry in self._pending.items()}
+
+            done = []
+            now = time.monotonic()
+            for name, (last_size, changed_at, write_gap, closed) in pending.items():
+                path = self.watch_dir / name
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    self._remove(path)
+                    continue
+                size = st.st_size
+                if size != last_size:
+                    if last_size >= 0:
+                        write_gap = max(write_gap, now - changed_at)
+                    changed_at = now
+                    with self._cond:
+                        entry = self._pending.get(name)
+                        if entry is not None:
+                            entry[0], entry[1], entry[2] = size, now, write_gap
+                    if not closed:
+                        continue
+                if self.is_complete(path, size, now - changed_at, closed=closed, write_gap=write_gap):
+                    done.append((path, st))
+
+            for path, st in done:
+                self._complete(path, st)
+            time.sleep(CHECK_INTERVAL)
+
+    def _complete(self, path, st):
+        with self._cond:
+            if self._pending.pop(path.name, None) is None:
+                return
+            self._seq += 1
+            entry = self._index.get(path.name)
+            if entry is not None:
+                entry[0], entry[1], entry[3] = st.st_size, st.st_mtime_ns, self._seq
+                entry[5] = time.monotonic()
+            self._completed.pop(path.name, None)
+            self._completed[path.name] = path
+            while len(self._completed) > HISTORY_SIZE:
+                self._completed.popitem(last=False)
+            listeners = list(self._listeners)
+            self._cond.notify_all()
+
+        print(f"[tether_ingest] 새 파일 완료: {path.name}")
+        for fn in listeners:
+            try:
+                fn(path)
+            except Exception as e:
+                print(f"[tether_ingest] 리스너 오류: {e}")
+
+    # --- 소비자 API ---
+    def add_listener(self, fn):
+        """완료 이벤트 콜백 등록 (감시 스레드에서 호출됨)"""
+        with self._cond:
+            self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        with self._cond:
+            if fn in self._listeners:
+                self._listeners.remove(fn)
+
+    def snapshot(self) -> int:
+        """셔터 직전 기준점 토큰 (O(1), wait_for_files 의 since 로 전달)"""
+        with self._cond:
+            return self._seq
+
+    def known_count(self) -> int:
+        """색인된 파일 수"""
+        with self._cond:
+            return len(self._index)
+
+    def timing(self, name):
+        """(처음 감지 시각, 쓰기 완료 시각) - time.monotonic() 기준, 모르면 None (옮겨진 파일 포함)"""
+        with self._cond:
+            entry = self._index.get(name)
+            if entry is None:
+                return self._gone_timing.get(name, (None, None))
+            return entry[4], entry[5]
+
+    def _new_since_locked(self, since, exclude):
+        if isinstance(since, int):
+            # 완료 순서 역순으로 기준점 이전 완료분에 닿을 때까지만 확인
+            found = []
+            for name, path in reversed(self._completed.items()):
+                entry = self._index.get(name)
+                if entry is None or entry[3] is None:
+                    continue
+                if entry[3] <= since:
+                    break
+                if entry[2] > since and name not in exclude:
+                    found.append(path)
+            found.reverse()
+            return found
+        # 파일명 집합 기준점 (이전 방식 호환)
+        return [p for n, p in self._completed.items() if n not in since and n not in exclude]
+
+    def wait_for_files(self, since=None, count=1, timeout=10.0, exclude=None) -> list[Path]:
+        """
+        기준점(since) 이후 새로 생긴 완료 파일이 count 개 모이거나 timeout 이 지날 때까지 대기
+        완료된 순서대로 반환한다.
+
+        Args:
+            since: snapshot() 토큰 또는 파일명 집합 (None 이면 호출 시점)
+            exclude: 추가로 제외할 파일명 (이미 처리한 파일 등)
+        """
+        exclude = exclude or set()
+        end_time = time.monotonic() + timeout
+
+        with self._cond:
+            if since is None:
+                since = self._seq
+            while True:
+                found = self._new_since_locked(since, exclude)
+                remaining = end_time - time.monotonic()
+                if len(found) >= count or remaining <= 0 or not self._running:
+                    return found[:count]
+                self._cond.wait(remaining)
@@ -1,7 +1,9 @@
 import time
-import shutil
+import threading
 from pathlib import Path
 from datetime import datetime
+from tether_ingest import TetherIngest
+from file_handoff import handoff
 
 print("[tether_service] LOADED from:", __file__)
 BASE_DIR = Path(__file__).resolve().parent
@@ -10,54 +12,90 @@ SESSIONS_DIR = BASE_DIR / "sessions"
 
 SUPPORTED_EXT = {".jpg", ".jpeg", ".png"}
 
+# 크기 안정화 대기 시간 범위(초) - 관측된 쓰기 간격의 2배를 이 범위로 제한
+MIN_SETTLE_SEC = 0.1
+MAX_SETTLE_SEC = 1.0
+
+# 파일 끝 마커 (JPEG EOI / PNG IEND 청크 + CRC)
+_END_MARKERS = {
+    ".jpg": b"\xff\xd9",
+    ".jpeg": b"\xff\xd9",
+    ".png": b"IEND\xaeB`\x82",
+}
+
+def _has_end_marker(path: Path, size: int) -> bool:
+    marker = _END_MARKERS.get(path.suffix.lower())
+    if marker is None or size < len(marker):
+        return False
+    try:
+        with open(path, "rb") as f:
+            f.seek(size - len(marker))
+            return f.read(len(marker)) == marker
+    except OSError:
+        return False
+
+def is_file_complete(path, size: int, stable_sec: float, closed: bool = False, write_gap: float = 0.0) -> bool:
+    """
+    카메라가 저장 중인 파일의 쓰기 완료 판정 (고정 sleep 없음)
+
+    1. close-write 알림을 받았으면 완료
+    2. JPEG EOI(FFD9) / PNG IEND 마커로 끝나면 완료
+    3. 그 외에는 관측된 쓰기 간격에 맞춘 짧은 크기 안정화 시간 경과 시 완료
+
+    Args:
+        size: 현재 파일 크기
+        stable_sec: 마지막 크기 변화 이후 경과 시간(초)
+        closed: close-write 알림 수신 여부 (리눅스 inotify)
+        write_gap: 지금까지 관측된 가장 긴 쓰기 간격(초)
+    """
+    if size <= 0:
+        return False
+    if closed:
+        return True
+    if _has_end_marker(Path(path), size):
+        return True
+    window = min(MAX_SETTLE_SEC, max(MIN_SETTLE_SEC, write_gap * 2))
+    return stable_sec >= window
+
 def _list_media_files(folder: Path):
     return sorted(
         [f for f in folder.iterdir() if f.is_file() and f.suffix.lower() in SUPPORTED_EXT],
         key=lambda x: x.name.lower()
     )
 
-def _wait_for_new_files_by_name(window_sec: int, pre_snapshot: set = None):
-    before = pre_snapshot if pre_snapshot is not None else {f.name for f in _list_media_files(WATCH_DIR)}
-    print(f"[tether_service] 감시 시작 - 기존 파일 {len(before)}개: {sorted(before)[-3:] if before else '없음'}")
-    end_time = time.time() + window_sec
-    collected = []
-    seen = set()
+_ingest = None
+_ingest_lock = threading.Lock()
 
-    while time.time() < end_time:
-        for f in _list_media_files(WATCH_DIR):
-            if f.name in before or f.name in seen:
-                continue
-            try:
-                size1 = f.stat().st_size
-            except FileNotFoundError:
-                continue
-            if size1 <= 0:
-                continue
-
-            time.sleep(1)
-            try:
-                size2 = f.stat().st_size
-            except FileNotFoundError:
-                continue
-
-            if size2 == size1 and size2 > 0:
-                collected.append(f)
-                seen.add(f.name)
-                print(f"[tether_service] 새 파일 감지: {f.name}")
-                return collected  # 1장 감지 즉시 반환
-
-        time.sleep(0.2)
+def get_ingest() -> TetherIngest:
+    """WATCH_DIR 수신 서비스 (프로세스당 1개, 첫 호출 시 시작)"""
+    global _ingest
+    with _ingest_lock:
+        if _ingest is None:
+            _ingest = TetherIngest(WATCH_DIR, SUPPORTED_EXT, is_complete=is_file_complete).start()
+        return _ingest
 
-    return collected
+def _wait_for_new_files_by_name(window_sec: int, pre_snapshot: int | set = None):
+    ingest = get_ingest()
+    before = pre_snapshot if pre_snapshot is not None else ingest.snapshot()
+    print(f"[tether_service] 감시 시작 - 색인 파일 {ingest.known_count()}개, 기준점: {before if isinstance(before, int) else f'{len(before)}개 이름'}")
+
+    collected = ingest.wait_for_files(since=before, count=1, timeout=window_sec)
+    for f in collected:
+        print(f"[tether_service] 새 파일 감지: {f.name}")
+    return collected  # 1장 감지 즉시 반환
 
 def _pick_best_one(files):
     if not files:
         return None
     return max(files, key=lambda f: f.stat().st_size)
 
-def capture_one_photo_blocking(capture_window_sec: int = 15, pre_snapshot: set = None) -> Path | None:
+def capture_one_photo_blocking(capture_window_sec: int = 15, pre_snapshot: int | set = None,
+                               dest_path: str | Path = None, session_path: Path = None) -> Path | None:
     """
     pre_snapshot 기준으로 새로 생긴 파일 1장을 감지해서 반환.
+    pre_snapshot 은 get_ingest().snapshot() 토큰 또는 (이전 방식) 파일명 집합.
+    dest_path 를 주면 세션 폴더 대신 그 경로가 이 촬영의 유일한 저장 위치가 된다.
+    session_path 를 주면 그 세션 폴더를 재사용한다 (없으면 호출마다 새로 생성).
     """
     print("[tether_service] capture_one_photo_blocking START, window=", capture_window_sec)
     print("[tether_service] WATCH_DIR =", WATCH_DIR)
@@ -66,8 +104,9 @@ def capture_one_photo_blocking(capture_window_sec: int = 15, pre_snapshot: set =
     WATCH_DIR.mkdir(exist_ok=True)
     SESSIONS_DIR.mkdir(exist_ok=True)
 
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    session_path = SESSIONS_DIR / f"session_{ts}"
+    if session_path is None:
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        session_path = SESSIONS_DIR / f"session_{ts}"
     session_path.mkdir(parents=True, exist_ok=True)
 
     new_files = _wait_for_new_files_by_name(capture_window_sec, pre_snapshot=pre_snapshot)
@@ -76,8 +115,8 @@ def capture_one_photo_blocking(capture_window_sec: int = 15, pre_snapshot: set =
         print("[tether_service] ⚠️ 새 파일 없음 - 타임아웃")
         return None
 
-    dest = session_path / best.name
-    dest.write_bytes(best.read_bytes())
+    # 수신 완료된 파일은 키오스크 소유 → 감시 폴더에서 옮김 (같은 볼륨이면 rename, 복사 없음)
+    dest = Path(handoff(best, dest_path or session_path / best.name, move=True))
     (session_path / "latest.txt").write_text(str(dest.resolve()), encoding="utf-8")
     print(f"[tether_service] 저장 완료: {dest}")
     return dest
@@ -93,41 +132,22 @@ def capture_many_photos_blocking(expected_count: int = 12, timeout_sec: int = 60
     session_path = SESSIONS_DIR / f"session_{ts}"
     session_path.mkdir(parents=True, exist_ok=True)
 
-    before = {f.name for f in _list_media_files(WATCH_DIR)}
+    ingest = get_ingest()
+    before = ingest.snapshot()
     collected: list[Path] = []
     seen = set()
 
     end_time = time.time() + timeout_sec
 
     while time.time() < end_time and len(collected) < expected_count:
-        for f in _list_media_files(WATCH_DIR):
-            if f.name in before or f.name in seen:
-                continue
-
-            try:
-                size1 = f.stat().st_size
-            except FileNotFoundError:
-                continue
-            if size1 <= 0:
-                continue
-
-            time.sleep(0.3)
-            try:
-                size2 = f.stat().st_size
-            except FileNotFoundError:
-                continue
-
-            if size2 == size1 and size2 > 0:
-                seen.add(f.name)
-                dest = session_path / f"{len(collected)+1:02d}_{f.name}"
-                shutil.copy2(f, dest)
-                collected.append(dest)
-                print(f"[tether_service] +{len(collected)}/{expected_count} -> {dest.name}")
-
-                if len(collected) >= expected_count:
-                    break
-
-        time.sleep(0.1)
+        # 완료 이벤트가 올 때마다 1장씩 처리
+        new_files = ingest.wait_for_files(since=before, exclude=seen, count=1, timeout=end_time - time.time())
+        for f in new_files:
+            seen.add(f.name)
+            dest = session_path / f"{len(collected)+1:02d}_{f.name}"
+            handoff(f, dest, move=True)
+            collected.append(dest)
+            print(f"[tether_service] +{len(collected)}/{expected_count} -> {dest.name}")
 
     if collected:
         (session_path / "latest.txt").write_text(str(collected[-1].resolve()), encoding="utf-8")
@@ -1,7 +1,9 @@
 import time
-import shutil
 from pathlib import Path
 from datetime import datetime
+from tether_ingest import TetherIngest
+from tether_service import is_file_complete
+from file_handoff import handoff
 
 def pick_best_one(files):
     """후보들 중 '가장 용량이 큰 파일' 1개만 선택"""
@@ -37,44 +39,22 @@ def make_session_folder() -> Path:
     session_path.mkdir(parents=True, exist_ok=True)
     return session_path
 
-def wait_for_new_files_by_name(window_sec: int):
+def wait_for_new_files_by_name(ingest: TetherIngest, window_sec: int):
     """
     세션 시작 직전의 파일 목록을 스냅샷으로 저장해두고,
     window_sec 동안 '새로 나타난 파일 이름'만 감지한다.
+    (쓰기 완료 판정은 수신 서비스가 담당)
     """
-    before = {f.name for f in list_media_files(WATCH_DIR)}
+    before = ingest.snapshot()
     collected = []
     seen = set()
     end_time = time.time() + window_sec
 
     while time.time() < end_time:
-        now_files = list_media_files(WATCH_DIR)
-        for f in now_files:
-            if f.name in before:
-                continue
-            if f.name in seen:
-                continue
-
-            # 파일이 저장 중일 수 있으니, size가 안정적인지 확인
-            try:
-                size1 = f.stat().st_size
-            except FileNotFoundError:
-                continue
-            if size1 <= 0:
-                continue
-
-            time.sleep(0.3)
-            try:
-                size2 = f.stat().st_size
-            except FileNotFoundError:
-                continue
-
-            if size2 == size1 and size2 > 0:
-                collected.append(f)
-                seen.add(f.name)
-                print(f"[session] detected: {f.name} ({size2} bytes)")
-
-        time.sleep(0.2)
+        for f in ingest.wait_for_files(since=before, exclude=seen, count=1, timeout=end_time - time.time()):
+            collected.append(f)
+            seen.add(f.name)
+            print(f"[session] detected: {f.name} ({f.stat().st_size} bytes)")
 
     # 파일명 기준 정렬
     collected.sort(key=lambda x: x.name.lower())
@@ -86,12 +66,12 @@ def copy_files_to_session(files, session_path: Path):
         dest = session_path / f.name
         if dest.exists():
             dest = session_path / f"{f.stem}_{int(time.time())}{f.suffix}"
-        shutil.copy2(f, dest)
-        moved.append(dest)
+        moved.append(Path(handoff(f, dest)))
     return moved
 
 def main():
     WATCH_DIR.mkdir(exist_ok=True)
+    ingest = TetherIngest(WATCH_DIR, SUPPORTED_EXT, is_complete=is_file_complete).start()
     print(f"[session] watch: {WATCH_DIR.resolve()}")
     print("[session] Press ENTER to start a capture session (simulate shutter).")
 
@@ -100,7 +80,7 @@ def main():
         session_path = make_session_folder()
         print(f"[session] START -> {session_path.name} (window={CAPTURE_WINDOW_SEC}s)")
 
-        files = wait_for_new_files_by_name(CAPTURE_WINDOW_SEC)
+        files = wait_for_new_files_by_name(ingest, CAPTURE_WINDOW_SEC)
 
         if not files:
             print("[session] No new files captured.")